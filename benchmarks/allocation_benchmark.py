@@ -0,0 +1,80 @@
+from typing import (
+    List,
+    Tuple
+)
+
+import lpp.object as runtime
+import lpp.tiering as tiering
+from benchmarks.utils import (
+    allocations,
+    best_of
+)
+from lpp.ast import (
+    ExpressionStatement,
+    Expression,
+    Program
+)
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+
+
+_EXPRESSIONS: List[Tuple[str, str]] = [
+    ('literal entero', '7'),
+    ('literal de texto', '"lpp"'),
+    ('suma en la caché', '500 + 500'),
+    ('suma fuera de la caché', '5000 + 5000'),
+    ('negativo en la caché', '-5'),
+]
+
+_SOURCE = '''
+variable cuenta = procedimiento(n, total) {{
+    si (n == 0) {{
+        regresa total;
+    }}
+    cuenta(n - 1, total + n / 100 + 1)
+}};
+cuenta({n}, 0);
+'''
+
+
+def _parse(source: str) -> Program:
+    return Parser(Lexer(source)).parse_program()
+
+
+def _expression(source: str) -> Expression:
+    statement = _parse(source).statements[0]
+    assert type(statement) is ExpressionStatement and statement.expression is not None
+
+    return statement.expression
+
+
+def main() -> None:
+    minimum = runtime.SMALL_INTEGERS_MINIMUM
+    maximum = runtime.SMALL_INTEGERS_MAXIMUM
+    env = Environment()
+
+    print('bloques de memoria por evaluación')
+    for name, source in _EXPRESSIONS:
+        expression = _expression(source)
+        print(f'    {name:<24} {source:<12} {allocations(lambda: evaluate(expression, env)):5.2f}')
+
+    n = 1000
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        print(f'cuenta({n})')
+        for name, cached in [('sin caché', (0, -1)), (f'caché {minimum}..{maximum}', (minimum, maximum))]:
+            runtime.cache_small_integers(*cached)
+            program = _parse(_SOURCE.format(n=n))
+            seconds = best_of(lambda: evaluate(program, Environment()))
+            print(f'    {name:<18} {seconds * 1000:7.2f} ms')
+    finally:
+        tiering.THRESHOLD = threshold
+        runtime.cache_small_integers(minimum, maximum)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop
+)
+from typing import (
+    Any,
+    List
+)
+
+from benchmarks.utils import generate_program
+from lpp.ast import (
+    ASTNode,
+    Program
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+def _count_nodes(program: Program) -> int:
+    count = 0
+    pending: List[Any] = [program]
+
+    while pending:
+        item = pending.pop()
+
+        if isinstance(item, list):
+            pending.extend(item)
+        elif isinstance(item, ASTNode):
+            count += 1
+            for name in dir(item):
+                if not name.startswith('_') and name != 'token':
+                    value = getattr(item, name)
+                    if isinstance(value, (ASTNode, list)):
+                        pending.append(value)
+
+    return count
+
+
+def main() -> None:
+    for size in [64 * 1024, 512 * 1024]:
+        source = generate_program(size)
+        tokens = Lexer(source).tokenize()
+
+        start()
+        program = Parser(tokens).parse_program()
+        allocated, _ = get_traced_memory()
+        stop()
+
+        nodes = _count_nodes(program)
+        kilobytes = len(source.encode('utf-8')) / 1024
+
+        print(f'{kilobytes:.0f} KB de fuente, {nodes} nodos')
+        print(f'    memoria del AST:  {allocated / (1024 * 1024):8.2f} MB')
+        print(f'    bytes por nodo:   {allocated / nodes:8.1f}')
+        print(f'    bytes por KB:     {allocated / kilobytes:8.1f}')
+
+
+if __name__ == '__main__':
+    main()
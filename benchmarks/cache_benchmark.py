@@ -0,0 +1,34 @@
+import os
+from tempfile import TemporaryDirectory
+
+from benchmarks.utils import (
+    best_of,
+    generate_program
+)
+from lpp.cache import (
+    cache_path,
+    load_program
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+def main() -> None:
+    with TemporaryDirectory() as directory:
+        for size in [64 * 1024, 1024 * 1024]:
+            path = os.path.join(directory, 'programa.lpp')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(generate_program(size))
+
+            parse = best_of(lambda: Parser(Lexer.from_file(path)).parse_program(), repeat=3)
+
+            load_program(path)
+            cached = best_of(lambda: load_program(path), repeat=3)
+
+            print(f'{size // 1024} KB de fuente, caché de {os.path.getsize(cache_path(path)) // 1024} KB')
+            print(f'    lexer + parser: {parse * 1000:10.2f} ms')
+            print(f'    desde .lppc:    {cached * 1000:10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+from typing import (
+    List,
+    Tuple
+)
+
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+# Calls to a global procedimiento, to builtins, and to procedimientos passed
+# as arguments, whose call site sees a few different ones.
+_CASES: List[Tuple[str, str]] = [
+    ('fibonacci(20)', '''
+        variable fibonacci = procedimiento(n) {
+            si (n < 2) {
+                regresa n;
+            }
+            fibonacci(n - 1) + fibonacci(n - 2)
+        };
+        fibonacci(20);
+    '''),
+    ('6000 llamadas a longitud', '''
+        variable cuenta = procedimiento(n, total) {
+            si (n == 0) {
+                regresa total;
+            }
+            cuenta(n - 1, total + longitud("abc") + longitud("de"))
+        };
+        cuenta(3000, 0);
+    '''),
+    ('3000 llamadas de orden superior', '''
+        variable doble = procedimiento(x) { variable y = x * 2; y };
+        variable siguiente = procedimiento(x) { x + 1 };
+        variable aplica = procedimiento(f, g, n, total) {
+            si (n == 0) {
+                regresa total;
+            }
+            aplica(g, f, n - 1, total + f(n) + g(n))
+        };
+        aplica(doble, siguiente, 1500, 0);
+    '''),
+]
+
+
+def main() -> None:
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        for name, source in _CASES:
+            program = resolve(Parser(Lexer(source)).parse_program())
+            seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+            print(f'{name:<32} {seconds * 1000:8.2f} ms')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import tracemalloc
+from typing import (
+    cast,
+    List
+)
+
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.ast import Program
+from lpp.evaluator import (
+    _extend_function_environment,
+    evaluate
+)
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Function,
+    Integer,
+    Object
+)
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+_FUNCTION = 'variable suma = procedimiento(a, b) { variable c = a + b; c };'
+
+_CALLS = '''
+variable cuenta = procedimiento(n, total) {{
+    si (n == 0) {{
+        regresa total;
+    }}
+    cuenta(n - 1, suma(total, 1))
+}};
+cuenta({n}, 0);
+'''
+
+_FRAMES = 10_000
+
+
+def _program(source: str) -> Program:
+    return resolve(Parser(Lexer(source)).parse_program())
+
+
+def _bytes_per_frame(fn: Function) -> float:
+    args: List[Object] = [Integer(1), Integer(2)]
+    frames: List[Environment] = []
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(_FRAMES):
+        frame = _extend_function_environment(fn, args)
+        # The variable of the body, like a call would store it.
+        frame['c'] = args[0]
+        frames.append(frame)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (after - before) / _FRAMES
+
+
+def main() -> None:
+    env = Environment()
+    evaluate(_program(_FUNCTION), env)
+    fn = cast(Function, env['suma'])
+
+    print('memoria por marco de una llamada con dos parámetros y una variable')
+    print(f'    {_bytes_per_frame(fn):6.0f} bytes')
+
+    n = 20_000
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+    try:
+        program = _program(_FUNCTION + _CALLS.format(n=n))
+        seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+    finally:
+        tiering.THRESHOLD = threshold
+
+    print(f'tiempo por llamada ({2 * n} llamadas)')
+    print(f'    {seconds / (2 * n) * 1e6:6.2f} µs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+from typing import (
+    Callable,
+    cast,
+    List,
+    Tuple
+)
+
+import lpp.ast as ast
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+
+
+_SETUP = '''
+    variable a = 5;
+    variable f = procedimiento(x) { x };
+'''
+
+_ITERATIONS = 100_000
+
+
+def _program(source: str) -> ast.Program:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert not parser.errors, parser.errors
+
+    return program
+
+
+def _expression(source: str) -> ast.ASTNode:
+    statement = _program(source).statements[0]
+    return cast(ast.Expression, cast(ast.ExpressionStatement, statement).expression)
+
+
+def _statement(source: str) -> ast.ASTNode:
+    return _program(source).statements[0]
+
+
+def _nodes() -> List[Tuple[str, ast.ASTNode]]:
+    if_expression = cast(ast.If, _expression('si (verdadero) { 1 }'))
+    assert if_expression.consequence is not None
+
+    return [
+        ('Integer', _expression('5')),
+        ('Boolean', _expression('verdadero')),
+        ('StringLiteral', _expression('"hola"')),
+        ('Identifier', _expression('a')),
+        ('Prefix', _expression('-a')),
+        ('Infix', _expression('a + 1')),
+        ('If', if_expression),
+        ('Block', if_expression.consequence),
+        ('Function', _expression('procedimiento(x) { x }')),
+        ('Call', _expression('f(1)')),
+        ('ExpressionStatement', _statement('a;')),
+        ('LetStatement', _statement('variable b = 1;')),
+        ('ReturnStatement', _statement('regresa 1;')),
+        ('Program', _program('a; 1;')),
+    ]
+
+
+def _evaluate_repeatedly(node: ast.ASTNode, env: Environment) -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(_ITERATIONS):
+            evaluate(node, env)
+
+    return run
+
+
+def main() -> None:
+    env = Environment()
+    evaluate(_program(_SETUP), env)
+
+    print('tiempo por evaluación de cada tipo de nodo')
+    for name, node in _nodes():
+        seconds = best_of(_evaluate_repeatedly(node, env))
+        print(f'    {name:<20} {seconds / _ITERATIONS * 1e9:8.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
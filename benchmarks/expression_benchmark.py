@@ -0,0 +1,50 @@
+from sys import getrecursionlimit
+from typing import (
+    Callable,
+    List,
+    Tuple
+)
+
+from benchmarks.utils import best_of
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+_EXPRESSIONS: List[Tuple[str, Callable[[int], str]]] = [
+    ('suma ancha 1 + 1 + ...', lambda n: ' + '.join(['1'] * n)),
+    ('mezcla ancha 1 * 2 - 3 < ...', lambda n: ' * 2 - 3 < '.join(['1'] * n)),
+    ('paréntesis ((...))', lambda n: '(' * n + '1' + ')' * n),
+    ('anidada 1 + (1 + (...))', lambda n: '1 + (' * n + '1' + ')' * n),
+    ('llamadas f(f(...))', lambda n: 'f(' * n + '1' + ')' * n),
+]
+
+
+def _parse(source: str, iterative: bool) -> None:
+    parser = Parser(Lexer(source).tokenize(), iterative=iterative)
+    parser.parse_program()
+    assert not parser.errors
+
+
+def _time(source: str, iterative: bool) -> str:
+    try:
+        elapsed = best_of(lambda: _parse(source, iterative), repeat=3)
+    except RecursionError:
+        return '    RecursionError'
+
+    return f'{elapsed * 1000:15.2f} ms'
+
+
+def main() -> None:
+    print(f'Límite de recursión de Python: {getrecursionlimit()}')
+
+    for name, make_source in _EXPRESSIONS:
+        print(name)
+
+        for size in [100, 1000, 100000]:
+            source = make_source(size)
+            print(f'    n = {size:6d}: recursivo {_time(source, False)}, '
+                  f'iterativo {_time(source, True)}')
+
+
+if __name__ == '__main__':
+    main()
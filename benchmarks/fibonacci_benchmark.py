@@ -0,0 +1,67 @@
+from typing import (
+    Callable,
+    List,
+    Tuple
+)
+
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.ast import Program
+from lpp.closures import compile_program
+from lpp.compiler import compile_program as compile_to_bytecode
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.stackless import evaluate as evaluate_stackless
+from lpp.vm import execute
+
+
+_SOURCE = '''
+variable fibonacci = procedimiento(n) {{
+    si (n < 2) {{
+        regresa n;
+    }}
+    regresa fibonacci(n - 1) + fibonacci(n - 2);
+}};
+fibonacci({n});
+'''
+
+
+def _without_tiering(program: Program) -> object:
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+    try:
+        return evaluate(program, Environment())
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+def _engines(program: Program) -> List[Tuple[str, Callable[[], object]]]:
+    compiled = compile_program(program)
+    bytecode = compile_to_bytecode(program)
+
+    return [
+        ('evaluador', lambda: _without_tiering(program)),
+        ('niveles', lambda: evaluate(program, Environment())),
+        ('closures', lambda: compiled(Environment())),
+        ('vm', lambda: execute(bytecode, Environment())),
+        ('pila', lambda: evaluate_stackless(program, Environment())),
+    ]
+
+
+def main() -> None:
+    for n in [15, 20]:
+        program = Parser(Lexer(_SOURCE.format(n=n))).parse_program()
+
+        print(f'fibonacci({n})')
+        baseline = None
+        for name, run in _engines(program):
+            seconds = best_of(run, repeat=3)
+            baseline = baseline or seconds
+
+            print(f'    {name:<10} {seconds * 1000:9.1f} ms  ({baseline / seconds:4.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.inference import TypeInference
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+_CASES = [
+    ('fibonacci(20)', '''
+        variable fibonacci = procedimiento(n) {
+            si (n < 2) {
+                regresa n;
+            }
+            fibonacci(n - 1) + fibonacci(n - 2)
+        };
+        fibonacci(20);
+    '''),
+    ('suma de cuadrados', '''
+        variable suma = procedimiento(n, total) {
+            si (n == 0) {
+                regresa total;
+            }
+            suma(n - 1, total + n * n - n / 2)
+        };
+        suma(5000, 0);
+    '''),
+    ('cadenas', '''
+        variable repite = procedimiento(n, texto) {
+            si (n <= 0) {
+                regresa texto;
+            }
+            repite(n - 1, texto + "a")
+        };
+        repite(3000, "") == "";
+    '''),
+]
+
+
+def main() -> None:
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        for name, source in _CASES:
+            print(name)
+            for specialize in (False, True):
+                program = resolve(Parser(Lexer(source)).parse_program())
+                inference = TypeInference()
+                if specialize:
+                    inference.specialize(program)
+
+                seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+                label = 'especializado' if specialize else 'genérico'
+                print(f'    {label:<16} {seconds * 1000:9.2f} ms')
+                if specialize:
+                    print(f'        {inference.statistics}')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop
+)
+from typing import List
+
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+
+
+_HELPER = '''
+variable ayudante_{n} = procedimiento(x, y) {{
+    variable doble = procedimiento(z) {{ regresa z * 2; }};
+    si (x <= y) {{
+        regresa doble(x) + y * 2 - {n};
+    }} sino {{
+        regresa longitud("cadena número {n}") != 0;
+    }}
+}};
+'''
+
+
+def _generate_library(helpers: int, called: float) -> str:
+    """A library of `helpers` procedimientos of which a `called` fraction is
+    used by the program."""
+    lines: List[str] = [_HELPER.format(n=n) for n in range(helpers)]
+    step = round(1 / called) if called else 0
+    if step:
+        lines.extend(f'ayudante_{n}({n}, 3);\n' for n in range(0, helpers, step))
+
+    return ''.join(lines)
+
+
+def _run(source: str, lazy: bool) -> None:
+    program = Parser(Lexer(source), lazy=lazy).parse_program()
+    evaluate(program, Environment())
+
+
+def _parse_memory(source: str, lazy: bool) -> int:
+    tokens = Lexer(source).tokenize()
+
+    start()
+    program = Parser(tokens, lazy=lazy).parse_program()
+    allocated, _ = get_traced_memory()
+    stop()
+
+    return allocated
+
+
+def main() -> None:
+    helpers = 2000
+
+    for called in [0.0, 0.1, 1.0]:
+        source = _generate_library(helpers, called)
+        kilobytes = len(source.encode('utf-8')) / 1024
+
+        print(f'{kilobytes:.0f} KB de fuente, {called:.0%} de los procedimientos usados')
+        for lazy, name in [(False, 'completo'), (True, 'perezoso')]:
+            seconds = best_of(lambda: _run(source, lazy), repeat=3)
+            memory = _parse_memory(source, lazy)
+
+            print(f'    {name:<9} parseo + evaluación: {seconds * 1000:8.1f} ms, '
+                  f'memoria del AST: {memory / (1024 * 1024):6.2f} MB')
+
+
+if __name__ == '__main__':
+    main()
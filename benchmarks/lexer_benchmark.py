@@ -0,0 +1,243 @@
+import os
+from re import match
+from tempfile import TemporaryDirectory
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop
+)
+from typing import (
+    Callable,
+    List
+)
+
+from benchmarks.utils import (
+    best_of,
+    generate_program
+)
+from lpp.lexer import Lexer
+from lpp.token import (
+    lookup_token_type,
+    Token,
+    TokenType
+)
+
+
+class _RegexLexer:
+    """The per-character `re.match` lexer the scanner replaced, kept as a
+    reference for throughput and token stream comparisons."""
+
+    def __init__(self, source: str) -> None:
+        self._source: str = source
+        self._character: str = ''
+        self._read_position: int = 0
+        self._position: int = 0
+
+        self._read_character()
+
+    def next_token(self) -> Token:
+        self._skip_whitespace()
+
+        if match(r'^=$', self._character):
+            if self._peek_character() == '=':
+                token = self._make_two_character_token(TokenType.EQ)
+            else:
+                token = Token(TokenType.ASSIGN, self._character)
+        
+        elif match(r'^\+$', self._character):
+            token = Token(TokenType.PLUS, self._character)
+        
+        elif match(r'^\-$', self._character):
+            token = Token(TokenType.MINUS, self._character)
+        
+        elif match(r'^/$', self._character):
+            token = Token(TokenType.DIVISION, self._character)
+        
+        elif match(r'^\*$', self._character):
+            token = Token(TokenType.MULTIPLICATION, self._character)
+        
+        elif match(r'^$', self._character):
+            token = Token(TokenType.EOF, self._character)
+        
+        elif match(r'^\($', self._character):
+            token = Token(TokenType.LPAREN, self._character)
+        
+        elif match(r'^\)$', self._character):
+            token = Token(TokenType.RPAREN, self._character)
+        
+        elif match(r'^{$', self._character):
+            token = Token(TokenType.LBRACE, self._character)
+        
+        elif match(r'^}$', self._character):
+            token = Token(TokenType.RBRACE, self._character)
+        
+        elif match(r'^,$', self._character):
+            token = Token(TokenType.COMMA, self._character)
+        
+        elif match(r'^;$', self._character):
+            token = Token(TokenType.SEMICOLON, self._character)
+        
+        elif match(r'^<$', self._character):
+            if self._peek_character() == '=':
+                token = self._make_two_character_token(TokenType.LT_OR_EQ)
+            else:
+                token = Token(TokenType.LT, self._character)
+        
+        elif match(r'^>$', self._character):
+            if self._peek_character() == '=':
+                token = self._make_two_character_token(TokenType.GT_OR_EQ)
+            else:
+                token = Token(TokenType.GT, self._character)
+        
+        elif match(r'^!$', self._character):
+            if self._peek_character() == '=':
+                token = self._make_two_character_token(TokenType.NOT_EQ)
+            else:
+                token = Token(TokenType.NOT, self._character)
+        
+        elif self._is_letter(self._character):
+            literal = self._read_identifier()
+            token_type = lookup_token_type(literal)
+
+            return Token(token_type, literal)
+        
+        elif self._is_number(self._character):
+            literal = self._read_number()
+            return Token(TokenType.INT, literal)
+        
+        elif match(r"^\"|'$", self._character):
+            literal = self._read_string()
+            return Token(TokenType.STRING, literal)
+        
+        else:
+            token = Token(TokenType.ILLEGAL, self._character)
+        
+        self._read_character()
+
+        return token
+    
+    def _is_letter(self, character: str) -> bool:
+        return bool(match(r'^[a-záéíóúA-ZÁÉÍÓÚñÑ_]$', character))
+
+    def _is_number(self, character: str) -> bool:
+        return bool(match(r'^\d$', character))
+    
+    def _make_two_character_token(self, token_type: TokenType) -> Token:
+        prefix = self._character
+        self._read_character()
+        suffix = self._character
+
+        return Token(token_type, f'{prefix}{suffix}')
+    
+    def _read_character(self) -> None:
+        if self._read_position >= len(self._source):
+            self._character = ''
+        else:
+            self._character = self._source[self._read_position]
+        
+        self._position = self._read_position
+        self._read_position += 1
+
+    def _read_identifier(self) -> str:
+        initial_position = self._position
+
+        while self._is_letter(self._character) or self._is_number(self._character):
+            self._read_character()
+        
+        return self._source[initial_position : self._position]
+    
+    def _read_number(self) -> str:
+        initial_position = self._position
+
+        while self._is_number(self._character):
+            self._read_character()
+        
+        return self._source[initial_position : self._position]
+    
+    def _peek_character(self) -> str:
+        if self._read_position >= len(self._source):
+            return ''
+        
+        return self._source[self._read_position]
+    
+    def _skip_whitespace(self) -> None:
+        while match(r'^\s$', self._character):
+            self._read_character()
+    
+    def _read_string(self) -> str:
+        initial_character = self._character
+        self._read_character()
+        initial_position = self._position
+
+        while self._character != initial_character and self._read_position <= len(self._source):
+            self._read_character()
+        
+        string = self._source[initial_position : self._position]
+
+        self._read_character()
+
+        return string
+
+
+def _tokenize(lexer) -> List[Token]:
+    tokens: List[Token] = []
+
+    while (token := lexer.next_token()).token_type is not TokenType.EOF:
+        tokens.append(token)
+
+    return tokens
+
+
+def _peak_memory(make_lexer: Callable[[], Lexer]) -> int:
+    start()
+
+    lexer = make_lexer()
+    while lexer.next_token().token_type is not TokenType.EOF:
+        pass
+
+    _, peak = get_traced_memory()
+    stop()
+
+    return peak
+
+
+def _streaming_memory() -> None:
+    print('Memoria máxima al leer un archivo (KB)')
+
+    with TemporaryDirectory() as directory:
+        for size in [256 * 1024, 1024 * 1024, 4 * 1024 * 1024]:
+            path = os.path.join(directory, 'programa.lpp')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(generate_program(size))
+
+            def read_whole_file() -> Lexer:
+                with open(path, encoding='utf-8') as file:
+                    return Lexer(file.read())
+
+            whole = _peak_memory(read_whole_file)
+            streamed = _peak_memory(lambda: Lexer.from_file(path))
+
+            print(f'    {size // 1024:6d} KB: cadena completa {whole // 1024:8d}, '
+                  f'por bloques {streamed // 1024:6d}')
+
+
+def main() -> None:
+    for size in [64 * 1024, 1024 * 1024]:
+        source = generate_program(size)
+        megabytes = len(source.encode('utf-8')) / (1024 * 1024)
+
+        assert _tokenize(Lexer(source)) == _tokenize(_RegexLexer(source))
+
+        current = best_of(lambda: _tokenize(Lexer(source)), repeat=3)
+        reference = best_of(lambda: _tokenize(_RegexLexer(source)), repeat=1)
+
+        print(f'{megabytes:.2f} MB de fuente')
+        print(f'    re.match por carácter: {megabytes / reference:8.2f} MB/s')
+        print(f'    patrón maestro:        {megabytes / current:8.2f} MB/s')
+        print(f'    aceleración:           {reference / current:8.2f}x')
+
+    _streaming_memory()
+
+
+if __name__ == '__main__':
+    main()
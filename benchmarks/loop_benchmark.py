@@ -0,0 +1,75 @@
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import resolve
+from lpp.runner import ENGINES
+
+
+_RECURSIVE = '''
+variable suma = procedimiento(n, total) {{
+    si (n == 0) {{
+        regresa total;
+    }}
+    suma(n - 1, total + n)
+}};
+variable i = 0;
+variable total = 0;
+mientras (i < {calls}) {{
+    total = total + suma({n}, 0);
+    i = i + 1;
+}}
+total;
+'''
+
+_LOOP = '''
+variable suma = procedimiento(n) {{
+    variable total = 0;
+    mientras (n > 0) {{
+        total = total + n;
+        n = n - 1;
+    }}
+    total
+}};
+variable i = 0;
+variable total = 0;
+mientras (i < {calls}) {{
+    total = total + suma({n});
+    i = i + 1;
+}}
+total;
+'''
+
+# Promotion counts calls, so the loop is only promoted once `suma` was called
+# tiering.THRESHOLD times, while the recursive version gets promoted within
+# its first sum.
+
+
+def main() -> None:
+    calls = 200
+    n = 200
+    threshold = tiering.THRESHOLD
+
+    try:
+        print(f'{calls} sumas de 1 a {n}')
+        for engine_name, engine in ENGINES.items():
+            print(f'    {engine_name}')
+            for name, source in [('recursiva', _RECURSIVE), ('mientras', _LOOP)]:
+                source = source.format(calls=calls, n=n)
+                program = resolve(Parser(Lexer(source)).parse_program())
+
+                tiering.THRESHOLD = 0
+                seconds = best_of(lambda: engine(program, Environment()), repeat=3)
+                print(f'        {name:<20} {seconds * 1000:9.2f} ms')
+
+                if engine_name == 'evaluador':
+                    tiering.THRESHOLD = threshold
+                    seconds = best_of(lambda: engine(program, Environment()), repeat=3)
+                    print(f'        {name + ", escalonada":<20} {seconds * 1000:9.2f} ms')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import gc
+
+import lpp.memoization as memoization
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+_SOURCE = '''
+variable fibonacci = procedimiento(n) {{
+    si (n < 2) {{
+        regresa n;
+    }}
+    fibonacci(n - 1) + fibonacci(n - 2)
+}};
+variable suma = procedimiento(n, total) {{
+    si (n == 0) {{
+        regresa total;
+    }}
+    suma(n - 1, total + fibonacci(n / 30))
+}};
+fibonacci({n}) + suma(300, 0);
+'''
+
+
+def main() -> None:
+    n = 20
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        print(f'fibonacci({n}) y 300 llamadas repetidas')
+        for name, memoize, size in [('sin memorizar', False, 0),
+                                    ('memorizado', True, memoization.SIZE),
+                                    ('memorizado, 8', True, 8)]:
+            program = resolve(Parser(Lexer(_SOURCE.format(n=n))).parse_program())
+            if memoize:
+                memoization.mark_pure(program)
+
+            previous = memoization.SIZE
+            memoization.SIZE = size
+            try:
+                seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+
+                print(f'    {name:<16} {seconds * 1000:9.2f} ms')
+                if memoize:
+                    gc.collect()
+                    env = Environment()
+                    evaluate(program, env)
+                    for statistics in memoization.statistics():
+                        print(f'        {statistics}')
+                    del env
+            finally:
+                memoization.SIZE = previous
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+from typing import Optional
+
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.ast import Program
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.optimizer import Optimizer
+from lpp.parser import Parser
+
+
+# Code like the one generators emit: constant arithmetic and branches on
+# constants inside a procedimiento that is called many times.
+_SOURCE = '''
+variable segundos = procedimiento(horas, n) {{
+    si (n == 0) {{
+        regresa horas;
+    }}
+    si (3 * 4 < 10 + 5) {{
+        segundos(horas + 2 * 60 * 60 - -(-1), n - 1)
+    }} sino {{
+        regresa 0;
+        "inalcanzable";
+    }}
+}};
+segundos(0, {n});
+'''
+
+
+def _program(n: int, optimizer: Optional[Optimizer]) -> Program:
+    program = Parser(Lexer(_SOURCE.format(n=n))).parse_program()
+    if optimizer is not None:
+        optimizer.optimize(program)
+
+    return program
+
+
+def main() -> None:
+    n = 20_000
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        print(f'segundos(0, {n})')
+        for name, optimizer in [('sin optimizar', None), ('optimizado', Optimizer())]:
+            program = _program(n, optimizer)
+            seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+
+            print(f'    {name:<14} {seconds * 1000:8.1f} ms')
+            if optimizer is not None:
+                print(f'    {optimizer.statistics}')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
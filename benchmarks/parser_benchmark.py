@@ -0,0 +1,25 @@
+from benchmarks.utils import (
+    best_of,
+    generate_program
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+def main() -> None:
+    for size in [64 * 1024, 1024 * 1024]:
+        source = generate_program(size)
+        megabytes = len(source.encode('utf-8')) / (1024 * 1024)
+
+        token_by_token = best_of(lambda: Parser(Lexer(source)).parse_program(), repeat=5)
+        buffered = best_of(lambda: Parser(Lexer(source).tokenize()).parse_program(), repeat=5)
+        tokenize = best_of(lambda: Lexer(source).tokenize(), repeat=5)
+
+        print(f'{megabytes:.2f} MB de fuente (lexer + parser)')
+        print(f'    Lexer.next_token:   {megabytes / token_by_token:8.2f} MB/s')
+        print(f'    Lexer.tokenize:     {megabytes / buffered:8.2f} MB/s')
+        print(f'    solo tokenize:      {megabytes / tokenize:8.2f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+from time import perf_counter
+from typing import (
+    Callable,
+    List
+)
+
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.repl import ReplSession
+
+
+def _session_line(n: int) -> str:
+    if n == 0:
+        return 'variable total_0 = 0;'
+
+    return f'variable total_{n} = total_{n - 1} + {n};'
+
+
+class _ReplayingSession:
+    """The REPL before sessions: every input re-lexes, re-parses and
+    re-evaluates the whole history in a new environment. Kept as a
+    reference."""
+
+    def __init__(self) -> None:
+        self._scanned: List[str] = []
+
+    def feed(self, line: str) -> None:
+        self._scanned.append(line)
+        parser = Parser(Lexer(' '.join(self._scanned)))
+        program = parser.parse_program()
+
+        if len(parser.errors) == 0:
+            evaluate(program, Environment())
+
+
+def _line_latencies(feed: Callable[[str], object],
+                    history: int,
+                    checkpoints: List[int]) -> List[float]:
+    """Feeds `history` lines and returns the mean latency of the 10 lines
+    before each checkpoint."""
+    latencies: List[float] = []
+    timings: List[float] = []
+
+    for n in range(history):
+        start = perf_counter()
+        feed(_session_line(n))
+        timings.append(perf_counter() - start)
+
+        if n + 1 in checkpoints:
+            latencies.append(sum(timings[-10:]) / 10)
+
+    return latencies
+
+
+def main() -> None:
+    checkpoints = [10, 100, 500, 1000, 2000]
+    history = checkpoints[-1]
+
+    sessions = [
+        ('incremental', _line_latencies(ReplSession().feed, history, checkpoints)),
+        ('reejecutando', _line_latencies(_ReplayingSession().feed, history, checkpoints)),
+    ]
+
+    print('latencia por línea según el tamaño del historial')
+    for name, latencies in sessions:
+        print(f'    {name}')
+        for lines, latency in zip(checkpoints, latencies):
+            print(f'        {lines:>5} líneas: {latency * 1000:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
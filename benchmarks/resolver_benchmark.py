@@ -0,0 +1,50 @@
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+# A recursive procedimiento three scopes deep that reads its parameters,
+# the variables of the procedimientos around it, a global and a builtin.
+_SOURCE = '''
+variable base = 10;
+variable crear = procedimiento(a, b) {{
+    variable c = a + b;
+    variable medio = procedimiento(d) {{
+        variable suma = procedimiento(n, total) {{
+            si (n == 0) {{
+                regresa total;
+            }}
+            suma(n - 1, total + a + b + c + d + base + longitud("lpp"))
+        }};
+        suma
+    }};
+    medio(4)
+}};
+crear(1, 2)({n}, 0);
+'''
+
+
+def main() -> None:
+    n = 500
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        print(f'suma({n}) con variables de tres ámbitos, globales y builtins')
+        for name, resolved in [('por nombre', False), ('resuelto', True)]:
+            program = Parser(Lexer(_SOURCE.format(n=n))).parse_program()
+            if resolved:
+                resolve(program)
+
+            seconds = best_of(lambda: evaluate(program, Environment()))
+            print(f'    {name:<12} {seconds * 1000:7.2f} ms  ({seconds / n * 1e6:5.1f} µs por llamada)')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+from typing import (
+    List,
+    Tuple
+)
+
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+
+
+# A program of many short statements at the top level.
+_TOP_LEVEL = '''
+variable a_{n} = {n} + 1;
+a_{n} * 2;
+a_{n} < 10;
+'''
+
+# A block of many statements in a si used as a value, and a regresa from
+# nested si in the body of a procedimiento, both run once per call.
+_BODIES = '''
+variable bloque = procedimiento(n) {{
+    variable valor = si (n > 0) {{
+        n + 1; n - 1; n * 2; n / 2; n < 3; n > 3; n == 3; n != 3;
+        n + 1; n - 1; n * 2; n / 2; n < 3; n > 3; n == 3; n != 3;
+        n
+    }};
+    valor
+}};
+variable clasifica = procedimiento(n) {{
+    si (n > 10) {{
+        si (n > 100) {{
+            regresa 3;
+        }}
+        regresa 2;
+    }}
+    regresa 1;
+}};
+variable cuenta = procedimiento(n, total) {{
+    si (n == 0) {{
+        regresa total;
+    }}
+    cuenta(n - 1, total + {call})
+}};
+cuenta({n}, 0);
+'''
+
+
+def _cases(n: int) -> List[Tuple[str, str]]:
+    return [
+        (f'{n} sentencias de programa',
+         ''.join(_TOP_LEVEL.format(n=i) for i in range(n // 3))),
+        (f'{n} bloques de 17 sentencias', _BODIES.format(n=n, call='bloque(n)')),
+        (f'{n} regresa desde si anidados', _BODIES.format(n=n, call='clasifica(n)')),
+    ]
+
+
+def main() -> None:
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        for name, source in _cases(3000):
+            program = Parser(Lexer(source)).parse_program()
+            seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+            print(f'{name:<34} {seconds * 1000:8.2f} ms')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+
+
+_SOURCE = '''
+variable cuenta = procedimiento(n, total) {{
+    si (n == 0) {{
+        regresa total;
+    }}
+    regresa cuenta(n - 1, total + n);
+}};
+cuenta({n}, 0);
+'''
+
+
+def main() -> None:
+    n = 1_000_000
+    program = Parser(Lexer(_SOURCE.format(n=n))).parse_program()
+    threshold = tiering.THRESHOLD
+
+    print(f'cuenta({n}) con llamadas en posición de cola')
+    for name, value in [('evaluador', 0), ('niveles', threshold)]:
+        tiering.THRESHOLD = value
+        try:
+            seconds = best_of(lambda: evaluate(program, Environment()), repeat=3)
+        finally:
+            tiering.THRESHOLD = threshold
+
+        print(f'    {name:<10} {seconds:6.2f} s  ({seconds / n * 1e9:5.0f} ns por iteración)')
+
+
+if __name__ == '__main__':
+    main()
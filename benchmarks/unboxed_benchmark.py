@@ -0,0 +1,85 @@
+from typing import (
+    List,
+    Tuple
+)
+
+import lpp.tiering as tiering
+from benchmarks.utils import best_of
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import resolve
+from lpp.unboxed import evaluate as evaluate_unboxed
+
+
+# Programs that spend their time in integer arithmetic and comparisons,
+# plus one on strings, where values are allocated either way.
+_CASES: List[Tuple[str, str]] = [
+    ('fibonacci(20)', '''
+        variable fibonacci = procedimiento(n) {
+            si (n < 2) {
+                regresa n;
+            }
+            fibonacci(n - 1) + fibonacci(n - 2)
+        };
+        fibonacci(20);
+    '''),
+    ('suma de cuadrados hasta 5000', '''
+        variable cuadrados = procedimiento(n, total) {
+            si (n == 0) {
+                regresa total;
+            }
+            cuadrados(n - 1, total + n * n - (n / 7) * 3 + (n * 2 - 1) / 5)
+        };
+        cuadrados(5000, 0);
+    '''),
+    ('mcd de 2000 pares', '''
+        variable residuo = procedimiento(a, b) { a - (a / b) * b };
+        variable mcd = procedimiento(a, b) {
+            si (b == 0) {
+                regresa a;
+            }
+            mcd(b, residuo(a, b))
+        };
+        variable todos = procedimiento(n, total) {
+            si (n == 0) {
+                regresa total;
+            }
+            todos(n - 1, total + mcd(n * 7919, n * 104729 + 13))
+        };
+        todos(2000, 0);
+    '''),
+    ('3000 concatenaciones', '''
+        variable repite = procedimiento(n, texto) {
+            si (n == 0) {
+                regresa longitud(texto);
+            }
+            si (texto < "m") {
+                repite(n - 1, texto + "a")
+            } sino {
+                repite(n - 1, texto + "b")
+            }
+        };
+        repite(3000, "");
+    '''),
+]
+
+
+def main() -> None:
+    threshold = tiering.THRESHOLD
+    tiering.THRESHOLD = 0
+
+    try:
+        print(f'{"":<30} {"objetos":>10} {"nativos":>10}')
+        for name, source in _CASES:
+            program = resolve(Parser(Lexer(source)).parse_program())
+            boxed = best_of(lambda: evaluate(program, Environment()), repeat=3)
+            unboxed = best_of(lambda: evaluate_unboxed(program, Environment()), repeat=3)
+            print(f'{name:<30} {boxed * 1000:7.2f} ms {unboxed * 1000:7.2f} ms')
+    finally:
+        tiering.THRESHOLD = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import gc
+import tracemalloc
+from time import perf_counter
+from typing import (
+    Callable,
+    List
+)
+
+
+_PROGRAM_CHUNK = '''
+variable suma_{n} = procedimiento(x, y) {{
+    si (x <= y) {{
+        regresa x + y * 2 - {n};
+    }} sino {{
+        regresa longitud("cadena número {n}") != 0;
+    }}
+}};
+variable resultado_{n} = suma_{n}({n}, {n} / 3);
+'''
+
+
+def generate_program(size: int) -> str:
+    """Builds a machine-generated looking lpp program of roughly `size` bytes."""
+    chunks: List[str] = []
+    length = 0
+    n = 0
+
+    while length < size:
+        chunk = _PROGRAM_CHUNK.format(n=n)
+        chunks.append(chunk)
+        length += len(chunk.encode('utf-8'))
+        n += 1
+
+    return ''.join(chunks)
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Returns the fastest wall time, in seconds, of `repeat` runs of `fn`.
+    Like timeit, the garbage collector is disabled while timing."""
+    timings: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = perf_counter()
+            fn()
+            timings.append(perf_counter() - start)
+            gc.collect()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return min(timings)
+
+
+def allocations(fn: Callable[[], object], number: int = 1000) -> float:
+    """Returns the memory blocks, counted by tracemalloc, that each of
+    `number` runs of `fn` leaves allocated, its result included. Blocks
+    freed before a run returns are not counted."""
+    results: List[object] = [None] * number
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.take_snapshot()
+        for index in range(number):
+            results[index] = fn()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # Leaves out the snapshots themselves.
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(filters).compare_to(before.filter_traces(filters),
+                                                          'filename')
+
+    return sum(difference.count_diff for difference in differences) / number
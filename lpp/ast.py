@@ -1,16 +1,26 @@
 from typing import (
+    Any,
+    Dict,
     List,
-    Optional
+    Optional,
+    Tuple,
+    Union
 )
 from abc import (
     ABC,
     abstractmethod
 )
 
-from lpp.token import Token
+from lpp.token import (
+    Token,
+    TokenBuffer,
+    TokenType
+)
 
 
 class ASTNode(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def token_literal(self) -> str:
         pass
@@ -20,26 +30,36 @@ class ASTNode(ABC):
         pass
 
 
-class Statement(ASTNode):
+class TokenNode(ASTNode):
+    # Nodes keep the kind, literal and source offset of their token instead of
+    # the Token itself. Literals are shared: identifiers and keywords are
+    # interned by the lexer.
+    __slots__ = ('token_type', 'literal', 'offset')
+
+    def __init__(self, token: Token, offset: int = -1) -> None:
+        self.token_type: TokenType = token.token_type
+        self.literal: str = token.literal
+        self.offset = offset
 
-    def __init__(self, token: Token) -> None:
-        self.token = token
+    @property
+    def token(self) -> Token:
+        return Token(self.token_type, self.literal)
 
     def token_literal(self) -> str:
-        return self.token.literal
+        return self.literal
 
 
-class Expression(ASTNode):
+class Statement(TokenNode):
+    __slots__ = ()
 
-    def __init__(self, token: Token) -> None:
-        self.token = token
-    
-    def token_literal(self) -> str:
-        return self.token.literal
+
+class Expression(TokenNode):
+    __slots__ = ()
 
 
 class Program(ASTNode):
-    
+    __slots__ = ('statements',)
+
     def __init__(self, statements: List[Statement]) -> None:
         self.statements = statements
     
@@ -54,23 +74,33 @@ class Program(ASTNode):
 
 
 class Identifier(Expression):
+    # The lexical address set by lpp.resolver: how many procedimiento scopes
+    # out the name is declared, and its slot in that scope. Globals and
+    # builtins have the depth of the top level and no slot (-1), and names
+    # that were not resolved have neither.
+    __slots__ = ('value', 'depth', 'slot')
 
     def __init__(self,
                  token: Token,
-                 value: str) -> None:
-        super().__init__(token)
+                 value: str,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.value = value
+        self.depth = -1
+        self.slot = -1
     
     def __str__(self) -> str:
         return self.value
 
 
 class ExpressionStatement(Statement):
-    
+    __slots__ = ('expression',)
+
     def __init__(self,
                  token: Token,
-                 expression: Optional[Expression] = None) -> None:
-        super().__init__(token)
+                 expression: Optional[Expression] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.expression = expression
     
     def __str__(self) -> str:
@@ -78,12 +108,14 @@ class ExpressionStatement(Statement):
 
 
 class LetStatement(Statement):
-    
+    __slots__ = ('name', 'value')
+
     def __init__(self,
                  token: Token,
                  name: Optional[Identifier] = None,
-                 value: Optional[Expression] = None) -> None:
-        super().__init__(token)
+                 value: Optional[Expression] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.name = name
         self.value = value
 
@@ -91,12 +123,31 @@ class LetStatement(Statement):
         return f'{self.token_literal()} {str(self.name)} = {str(self.value)};'
 
 
+class AssignmentStatement(Statement):
+    # Binds a new value to a variable declared before, where it is declared.
+    __slots__ = ('name', 'value')
+
+    def __init__(self,
+                 token: Token,
+                 name: Optional[Identifier] = None,
+                 value: Optional[Expression] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
+        self.name = name
+        self.value = value
+
+    def __str__(self) -> str:
+        return f'{str(self.name)} = {str(self.value)};'
+
+
 class ReturnStatement(Statement):
+    __slots__ = ('return_value',)
 
     def __init__(self,
                  token: Token,
-                 return_value: Optional[Expression] = None) -> None:
-        super().__init__(token)
+                 return_value: Optional[Expression] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.return_value = return_value
 
     def __str__(self) -> str:
@@ -104,54 +155,70 @@ class ReturnStatement(Statement):
 
 
 class Integer(Expression):
-    
+    __slots__ = ('value', 'constant')
+
     def __init__(self,
                  token: Token,
-                 value: Optional[int] = None) -> None:
-        super().__init__(token)
+                 value: Optional[int] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.value = value
+        # The runtime object of the literal, built on its first evaluation
+        # and shared by the later ones.
+        self.constant: Any = None
     
     def __str__(self) -> str:
         return str(self.value)
 
 
 class Prefix(Expression):
+    __slots__ = ('operator', 'right', 'specialization')
 
     def __init__(self,
                  token: Token,
                  operator: str,
-                 right: Optional[Expression] = None) -> None:
-        super().__init__(token)
+                 right: Optional[Expression] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.operator = operator
         self.right = right
+        # The operation of the evaluator for the type inferred for the
+        # operand, set by lpp.inference; None for the generic one.
+        self.specialization: Any = None
 
     def __str__(self) -> str:
         return f'({self.operator}{self.right})'
 
 
 class Infix(Expression):
+    __slots__ = ('left', 'operator', 'right', 'specialization')
 
     def __init__(self,
                  token: Token,
                  left: Expression,
                  operator: str,
-                 right: Optional[Expression] = None) -> None:
-        super().__init__(token)
+                 right: Optional[Expression] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
 
         self.left = left
         self.operator = operator
         self.right = right
+        # Like Prefix.specialization, for the type inferred for both operands.
+        self.specialization: Any = None
 
     def __str__(self) -> str:
         return f'({str(self.left)} {self.operator} {str(self.right)})'
 
 
 class Boolean(Expression):
-    
+    __slots__ = ('value',)
+
     def __init__(self,
                  token: Token,
-                 value: Optional[bool] = None) -> None:
-        super().__init__(token)
+                 value: Optional[bool] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
 
         self.value = value
     
@@ -160,25 +227,59 @@ class Boolean(Expression):
 
 
 class Block(Statement):
+    __slots__ = ('statements',)
 
     def __init__(self,
                  token: Token,
-                 statements: List[Statement]) -> None:
-        super().__init__(token)
+                 statements: List[Statement],
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.statements = statements
     
     def __str__(self) -> str:
         return ''.join([str(statement) for statement in self.statements])
 
 
+class DeferredBlock(Statement):
+    # The body of a procedimiento whose parsing was deferred by a lazy parser:
+    # the tokens from its opening brace at `start` to its closing brace at
+    # `stop`. The block and its errors are filled in when it is first parsed.
+    __slots__ = ('tokens', 'start', 'stop', 'iterative', 'block', 'errors')
+
+    def __init__(self,
+                 token: Token,
+                 tokens: TokenBuffer,
+                 start: int,
+                 stop: int,
+                 iterative: bool = False,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
+        self.tokens = tokens
+        self.start = start
+        self.stop = stop
+        self.iterative = iterative
+        self.block: Optional[Block] = None
+        self.errors: List[str] = []
+
+    def __str__(self) -> str:
+        if self.block is not None:
+            return str(self.block)
+
+        source_start = self.tokens.ends[self.start]
+        source_end = self.tokens.starts[self.stop]
+        return self.tokens.source[source_start:source_end].strip()
+
+
 class If(Expression):
+    __slots__ = ('condition', 'consequence', 'alternative')
 
     def __init__(self,
                  token: Token,
                  condition: Optional[Expression] = None,
                  consequence: Optional[Block] = None,
-                 alternative: Optional[Block] = None) -> None:
-        super().__init__(token)
+                 alternative: Optional[Block] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.condition = condition
         self.consequence = consequence
         self.alternative = alternative
@@ -192,15 +293,39 @@ class If(Expression):
         return out
 
 
+class While(Statement):
+    __slots__ = ('condition', 'body')
+
+    def __init__(self,
+                 token: Token,
+                 condition: Optional[Expression] = None,
+                 body: Optional[Block] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
+        self.condition = condition
+        self.body = body
+
+    def __str__(self) -> str:
+        return f'{self.token_literal()} {str(self.condition)} {str(self.body)}'
+
+
 class Function(Expression):
+    # `scope` maps the parameters and variables of the procedimiento to the
+    # slots of its frames. lpp.resolver sets it; it stays None otherwise.
+    # `dependencies` are the top-level names the results of a pure
+    # procedimiento depend on, set by lpp.memoization.
+    __slots__ = ('parameters', 'body', 'scope', 'dependencies')
 
     def __init__(self,
                  token: Token,
                  parameters: List[Identifier] = [],
-                 body: Optional[Block] = None) -> None:
-        super().__init__(token)
+                 body: Optional[Union[Block, DeferredBlock]] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.parameters = parameters
         self.body = body
+        self.scope: Optional[Dict[str, int]] = None
+        self.dependencies: Optional[Tuple[str, ...]] = None
     
     def __str__(self) -> str:
         param_list: List[str] = [str(parameter) for parameter in self.parameters]
@@ -210,14 +335,18 @@ class Function(Expression):
 
 
 class Call(Expression):
-    
+    __slots__ = ('function', 'arguments', 'cache')
+
     def __init__(self,
                  token,
                  function: Expression,
-                 arguments: Optional[List[Expression]] = None) -> None:
-        super().__init__(token)
+                 arguments: Optional[List[Expression]] = None,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.function = function
         self.arguments = arguments
+        # The inline cache of the evaluator at this call site.
+        self.cache: Any = None
     
     def __str__(self) -> str:
         assert self.arguments is not None
@@ -227,12 +356,16 @@ class Call(Expression):
 
 
 class StringLiteral(Expression):
+    __slots__ = ('value', 'constant')
 
     def __init__(self,
                  token: Token,
-                 value: str) -> None:
-        super().__init__(token)
+                 value: str,
+                 offset: int = -1) -> None:
+        super().__init__(token, offset)
         self.value = value
+        # The runtime object of the literal, like Integer.constant.
+        self.constant: Any = None
     
     def __str__(self) -> str:
-        return super().__str__()
+        return self.value
@@ -1,12 +1,13 @@
 from typing import (
     cast,
     Dict,
+    FrozenSet
 )
 
 from lpp.object import (
     Builtin,
     Error,
-    Integer,
+    new_integer,
     Object,
     String,
 )
@@ -20,7 +21,7 @@ def longitud(*args: Object) -> Object:
         return Error(_WRONG_NUMBER_OF_ARGS.format(len(args), 1))
     elif type(args[0]) == String:
         argument = cast(String, args[0])
-        return Integer(len(argument.value))
+        return new_integer(len(argument.value))
     else:
         return Error(_UNSUPPORTED_ARGUMENT_TYPE.format(args[0].type().name))
 
@@ -28,3 +29,9 @@ def longitud(*args: Object) -> Object:
 BUILTINS: Dict[str, Builtin] = {
     'longitud': Builtin(fn=longitud),
 }
+
+# The builtins whose results depend only on their arguments, which memoized
+# procedimientos may call.
+PURE_BUILTINS: FrozenSet[str] = frozenset([
+    'longitud',
+])
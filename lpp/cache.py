@@ -0,0 +1,335 @@
+import marshal
+import os
+from hashlib import blake2b
+from sys import implementation
+from tempfile import NamedTemporaryFile
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type
+)
+
+import lpp.ast as ast
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.token import (
+    TOKEN_TYPES,
+    lookup_symbol,
+    Token,
+    TokenType
+)
+
+
+CACHE_DIRECTORY = '__lppcache__'
+CACHE_SUFFIX = '.lppc'
+
+# Bumped whenever the layout of the entries or of the serialized AST changes.
+FORMAT_VERSION = 4
+
+_MAGIC = b'LPPC'
+# marshal's format may change between interpreters, so it is part of the key.
+_CACHE_TAG = implementation.cache_tag or 'python'
+
+# Constructor arguments of each node class after its token, in order, and
+# whether each one holds nodes (a node, a list of nodes or None) or a plain
+# value stored inline.
+_NODE_FIELDS: Dict[Type[ast.ASTNode], Tuple[Tuple[str, bool], ...]] = {
+    ast.AssignmentStatement: (('name', True), ('value', True)),
+    ast.Block: (('statements', True),),
+    ast.Boolean: (('value', False),),
+    ast.Call: (('function', True), ('arguments', True)),
+    ast.ExpressionStatement: (('expression', True),),
+    ast.Function: (('parameters', True), ('body', True)),
+    ast.Identifier: (('value', False),),
+    ast.If: (('condition', True), ('consequence', True), ('alternative', True)),
+    ast.Infix: (('left', True), ('operator', False), ('right', True)),
+    ast.Integer: (('value', False),),
+    ast.LetStatement: (('name', True), ('value', True)),
+    ast.Prefix: (('operator', False), ('right', True)),
+    ast.Program: (('statements', True),),
+    ast.ReturnStatement: (('return_value', True),),
+    ast.StringLiteral: (('value', False),),
+    ast.While: (('condition', True), ('body', True)),
+}
+
+_NODE_CLASSES: List[Type[ast.ASTNode]] = sorted(_NODE_FIELDS, key=lambda cls: cls.__name__)
+_NODE_CODES: Dict[Type[ast.ASTNode], int] = {
+    cls: code for code, cls in enumerate(_NODE_CLASSES)
+}
+
+# Class, number of child entries and whether a plain value is stored inline,
+# by class code. Only Infix and Prefix mix plain values and children.
+_DECODING_PLANS: List[Tuple[Type[ast.ASTNode], int, bool]] = [
+    (cls,
+     sum(holds_nodes for _, holds_nodes in _NODE_FIELDS[cls]),
+     not all(holds_nodes for _, holds_nodes in _NODE_FIELDS[cls]))
+    for cls in _NODE_CLASSES
+]
+
+_LIST = len(_NODE_CLASSES)
+_NONE = _LIST + 1
+
+
+class _Record(NamedTuple):
+    """Marks the flat record of a node whose children were already encoded."""
+    values: Tuple[Any, ...]
+
+
+def _encode(program: ast.Program) -> List[Any]:
+    # The tree is flattened in post-order. Each node is a record holding its
+    # class code, its token and its plain values, and follows the encoding
+    # of its children. Lists end with their length. Node records end with the
+    # source offset of the node.
+    encoded: List[Any] = []
+    pending: List[Any] = [program]
+
+    while pending:
+        item = pending.pop()
+
+        if type(item) is _Record:
+            encoded.extend(item.values)
+
+        elif item is None:
+            encoded.append(_NONE)
+
+        elif isinstance(item, list):
+            pending.append(_Record((_LIST, len(item))))
+            pending.extend(reversed(item))
+
+        else:
+            cls = type(item)
+            values: List[Any] = [_NODE_CODES[cls]]
+            children: List[Any] = []
+
+            if cls is not ast.Program:
+                values.extend([item.token.token_type.value, item.token.literal])
+
+            for field, holds_nodes in _NODE_FIELDS[cls]:
+                if holds_nodes:
+                    children.append(getattr(item, field))
+                else:
+                    values.append(getattr(item, field))
+
+            if cls is not ast.Program:
+                values.append(item.offset)
+
+            pending.append(_Record(tuple(values)))
+            pending.extend(reversed(children))
+
+    return encoded
+
+
+def _decode(encoded: List[Any]) -> ast.Program:
+    decoded: List[Any] = []
+    append = decoded.append
+    index = 0
+    end = len(encoded)
+
+    while index < end:
+        code = encoded[index]
+
+        if code == _NONE:
+            append(None)
+            index += 1
+            continue
+
+        if code == _LIST:
+            length = encoded[index + 1]
+            items = decoded[len(decoded) - length:]
+            del decoded[len(decoded) - length:]
+            append(items)
+            index += 2
+            continue
+
+        cls, children, plain_values = _DECODING_PLANS[code]
+
+        if cls is ast.Program:
+            append(cls(decoded.pop()))
+            index += 1
+            continue
+
+        token_type = TOKEN_TYPES[encoded[index + 1]]
+        literal = encoded[index + 2]
+        if token_type is TokenType.IDENT:
+            _, literal = lookup_symbol(literal)
+        # tuple.__new__ skips the Python level NamedTuple constructor.
+        token = tuple.__new__(Token, (token_type, literal))
+        index += 3
+
+        if plain_values:
+            value = encoded[index]
+            offset = encoded[index + 1]
+            index += 2
+
+            if cls is ast.Identifier:
+                append(cls(token, literal, offset))
+            elif cls is ast.Infix:
+                right = decoded.pop()
+                decoded[-1] = cls(token, decoded[-1], value, right, offset)
+            elif cls is ast.Prefix:
+                decoded[-1] = cls(token, value, decoded[-1], offset)
+            else:
+                append(cls(token, value, offset))
+        else:
+            offset = encoded[index]
+            index += 1
+
+            first_child = len(decoded) - children
+            arguments = decoded[first_child:]
+            del decoded[first_child:]
+            append(cls(token, *arguments, offset=offset))
+
+    program, = decoded
+    return program
+
+
+def serialize_program(program: ast.Program) -> bytes:
+    return marshal.dumps(_encode(program))
+
+
+def deserialize_program(data: bytes) -> ast.Program:
+    return _decode(marshal.loads(data))
+
+
+def cache_path(source_path: str, cache_directory: Optional[str] = None) -> str:
+    """Returns where the cached AST of `source_path` is stored. By default
+    entries live in a __lppcache__ directory next to the source."""
+    source_path = os.path.abspath(source_path)
+    name = os.path.basename(source_path)
+
+    if cache_directory is None:
+        cache_directory = os.path.join(os.path.dirname(source_path), CACHE_DIRECTORY)
+    else:
+        # A shared directory holds sources from many places.
+        name = f'{name}.{blake2b(source_path.encode("utf-8"), digest_size=8).hexdigest()}'
+
+    return os.path.join(cache_directory, f'{name}.{_CACHE_TAG}{CACHE_SUFFIX}')
+
+
+def _source_digest(source_path: str) -> bytes:
+    digest = blake2b()
+
+    with open(source_path, 'rb') as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+
+    return digest.digest()
+
+
+def _payload_digest(payload: bytes) -> bytes:
+    return blake2b(payload, digest_size=16).digest()
+
+
+def _read_entry(path: str, digest: bytes) -> Optional[ast.Program]:
+    try:
+        with open(path, 'rb') as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                return None
+
+            format_version, entry_digest, _, payload_digest = marshal.load(file)
+            if format_version != FORMAT_VERSION or entry_digest != digest:
+                return None
+
+            payload = file.read()
+            if _payload_digest(payload) != payload_digest:
+                return None
+
+            return deserialize_program(payload)
+    except Exception:
+        # Any entry that can not be decoded, whatever the damage, is a miss
+        # and the source is parsed again.
+        return None
+
+
+def _write_entry(path: str,
+                 source_path: str,
+                 digest: bytes,
+                 program: ast.Program) -> None:
+    payload = serialize_program(program)
+    directory = os.path.dirname(path)
+    temporary_path: Optional[str] = None
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        # Entries are written to a temporary file and renamed into place, so
+        # readers never see a partially written entry.
+        with NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as file:
+            temporary_path = file.name
+            file.write(_MAGIC)
+            marshal.dump((FORMAT_VERSION, digest, source_path, _payload_digest(payload)),
+                         file)
+            file.write(payload)
+
+        os.replace(temporary_path, path)
+    except OSError:
+        # A cache that can not be written is not an error.
+        if temporary_path is not None and os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+        return
+
+    evict_stale_entries(directory)
+
+
+def evict_stale_entries(cache_directory: str) -> None:
+    """Removes the entries whose source file no longer exists, and those
+    written by other interpreters or in other formats, which are never
+    read."""
+    try:
+        names = os.listdir(cache_directory)
+    except OSError:
+        return
+
+    for name in names:
+        if not name.endswith(CACHE_SUFFIX):
+            continue
+
+        path = os.path.join(cache_directory, name)
+
+        if (not name.endswith(f'.{_CACHE_TAG}{CACHE_SUFFIX}')
+                or not os.path.exists(_entry_source(path) or '')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _entry_source(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                return None
+
+            format_version, _, source_path, _ = marshal.load(file)
+            if format_version != FORMAT_VERSION:
+                return None
+
+            return source_path
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def load_program(source_path: str,
+                 cache_directory: Optional[str] = None) -> Tuple[ast.Program, List[str]]:
+    """Returns the program in `source_path` and its parse errors, loading
+    the AST from the cache when the source has not changed since it was
+    stored. Programs with parse errors are not cached."""
+    source_path = os.path.abspath(source_path)
+    digest = _source_digest(source_path)
+    path = cache_path(source_path, cache_directory)
+
+    if (program := _read_entry(path, digest)) is not None:
+        return program, []
+
+    parser: Parser = Parser(Lexer.from_file(source_path))
+    program = parser.parse_program()
+
+    if len(parser.errors) == 0:
+        _write_entry(path, source_path, digest, program)
+
+    return program, parser.errors
@@ -0,0 +1,503 @@
+from operator import (
+    add,
+    eq,
+    floordiv,
+    ge,
+    gt,
+    le,
+    lt,
+    mul,
+    ne,
+    sub
+)
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union
+)
+
+import lpp.ast as ast
+from lpp.builtins import BUILTINS
+# The closures share the semantics of the evaluator, including its error
+# messages and its slow paths for operands that are not integers.
+from lpp.evaluator import (
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _extend_function_environment,
+    _new_error,
+    _NOT_A_FUNCTION,
+    _SYNTAX_ERROR,
+    _TailCall,
+    _UNKNOWN_IDENTIFIER,
+    FALSE,
+    NULL,
+    TRUE
+)
+from lpp.object import (
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Integer,
+    new_integer,
+    Object,
+    Return,
+    String
+)
+from lpp.parser import parse_deferred_block
+
+
+# A compiled node: runs it in an environment and returns its value.
+Code = Callable[[Environment], Optional[Object]]
+
+_Arguments = List[Object]
+
+_ARITHMETIC_OPERATIONS: Dict[str, Callable[[int, int], int]] = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+    '/': floordiv,
+}
+
+_COMPARISON_OPERATIONS: Dict[str, Callable[[int, int], bool]] = {
+    '<': lt,
+    '<=': le,
+    '>': gt,
+    '>=': ge,
+    '==': eq,
+    '!=': ne,
+}
+
+
+class _FunctionCode:
+    """The compiled body of a procedimiento, shared by every function built
+    from it. Deferred bodies are parsed and compiled on the first call."""
+    __slots__ = ('scope', 'body', 'run')
+
+    def __init__(self, node: ast.Function) -> None:
+        assert node.body is not None
+        self.scope: Optional[Dict[str, int]] = node.scope
+        self.body: Union[ast.Block, ast.DeferredBlock] = node.body
+        self.run: Optional[Code] = None
+
+        if type(node.body) is not ast.DeferredBlock:
+            self.run = _compile_tail_block(cast(ast.Block, node.body), True)
+
+    def compile_deferred(self) -> Union[Code, Error]:
+        assert type(self.body) is ast.DeferredBlock
+        block = parse_deferred_block(self.body)
+
+        if self.body.errors:
+            return _new_error(_SYNTAX_ERROR, ['; '.join(self.body.errors)])
+
+        self.run = _compile_tail_block(block, True)
+        return self.run
+
+
+class CompiledFunction(Function):
+    """A procedimiento built by compiled code."""
+
+    def __init__(self,
+                 parameters: List[ast.Identifier],
+                 body: Union[ast.Block, ast.DeferredBlock],
+                 env: Environment,
+                 code: _FunctionCode) -> None:
+        super().__init__(parameters, body, env, code.scope)
+        self.code = code
+
+
+def _apply_function(fn: Object, args: List[Object]) -> Optional[Object]:
+    # Bodies evaluate the calls in their tail position to a _TailCall, run
+    # here in a loop instead of nesting, like evaluator._run_tail_calls.
+    evaluated: Optional[Object]
+    unwraps = 0
+
+    while True:
+        if type(fn) is CompiledFunction:
+            code = fn.code
+            run = code.run
+            if run is None:
+                compiled = code.compile_deferred()
+                if type(compiled) is Error:
+                    return compiled
+
+                run = cast(Code, compiled)
+
+            result: Any = run(_extend_function_environment(fn, args))
+            if type(result) is _TailCall:
+                if not result.returned:
+                    unwraps += 1
+
+                fn, args = result.fn, result.args
+                continue
+
+            evaluated = result
+            if type(evaluated) is Return:
+                evaluated = evaluated.value
+
+        elif type(fn) is Builtin:
+            evaluated = fn.fn(*args)
+
+        else:
+            evaluated = _new_error(_NOT_A_FUNCTION, [fn.type().name])
+
+        break
+
+    while unwraps > 0 and type(evaluated) is Return:
+        evaluated = evaluated.value
+        unwraps -= 1
+
+    return evaluated
+
+def _compile_assignment_statement(node: ast.AssignmentStatement) -> Code:
+    assert node.name is not None
+    name = node.name.value
+    value = _compile(node.value)
+
+    def assignment_statement(env: Environment) -> Optional[Object]:
+        if not env.assign(name, value(env)):
+            return _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+        return None
+
+    return assignment_statement
+
+def _compile_block(block: ast.Block) -> Code:
+    statements: Tuple[Code, ...] = tuple(_compile(statement) for statement in block.statements)
+
+    if len(statements) == 1:
+        # The value of a single statement is the value of the block.
+        return statements[0]
+
+    def run_block(env: Environment) -> Optional[Object]:
+        result: Optional[Object] = None
+
+        for statement in statements:
+            result = statement(env)
+
+            if type(result) is Return or type(result) is Error:
+                return result
+
+        return result
+
+    return run_block
+
+def _compile_boolean(node: ast.Boolean) -> Code:
+    value = TRUE if node.value else FALSE
+    return lambda env: value
+
+def _compile_call(node: ast.Call) -> Code:
+    function = _compile(node.function)
+
+    assert node.arguments is not None
+    arguments: Tuple[Code, ...] = tuple(_compile(argument) for argument in node.arguments)
+
+    def call(env: Environment) -> Optional[Object]:
+        fn = function(env)
+        args = [argument(env) for argument in arguments]
+
+        assert fn is not None
+        return _apply_function(fn, cast(_Arguments, args))
+
+    return call
+
+def _compile_expression_statement(node: ast.ExpressionStatement) -> Code:
+    return _compile(node.expression)
+
+def _compile_function(node: ast.Function) -> Code:
+    parameters = node.parameters
+    code = _FunctionCode(node)
+    body = code.body
+
+    return lambda env: CompiledFunction(parameters, body, env, code)
+
+def _compile_identifier(node: ast.Identifier) -> Code:
+    name = node.value
+
+    def identifier(env: Environment) -> Object:
+        try:
+            return env[name]
+        except KeyError:
+            builtin = BUILTINS.get(name)
+            if builtin is None:
+                return _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+            return builtin
+
+    return identifier
+
+def _compile_if(node: ast.If, tail: Optional[bool] = None) -> Code:
+    # With `tail`, the si is a statement of a procedimiento body, and its
+    # branches are compiled like one, see _compile_tail_block.
+    condition = _compile(node.condition)
+    alternative: Optional[Code] = None
+    if tail is None:
+        consequence = _compile(node.consequence)
+        if node.alternative is not None:
+            alternative = _compile(node.alternative)
+    else:
+        assert node.consequence is not None
+        consequence = _compile_tail_block(node.consequence, tail)
+        if node.alternative is not None:
+            alternative = _compile_tail_block(node.alternative, tail)
+
+    def if_expression(env: Environment) -> Optional[Object]:
+        value = condition(env)
+
+        if value is not NULL and value is not FALSE:
+            return consequence(env)
+        elif alternative is not None:
+            return alternative(env)
+
+        return NULL
+
+    return if_expression
+
+def _compile_infix(node: ast.Infix) -> Code:
+    left = _compile(node.left)
+    right = _compile(node.right)
+    operator = node.operator
+
+    if operator in _ARITHMETIC_OPERATIONS:
+        arithmetic_operation = _ARITHMETIC_OPERATIONS[operator]
+
+        def arithmetic(env: Environment) -> Object:
+            left_value = left(env)
+            right_value = right(env)
+
+            if type(left_value) is Integer and type(right_value) is Integer:
+                return new_integer(arithmetic_operation(left_value.value,
+                                                    right_value.value))
+
+            assert left_value is not None and right_value is not None
+            return _evaluate_infix_expression(operator, left_value, right_value)
+
+        return arithmetic
+
+    elif operator in _COMPARISON_OPERATIONS:
+        comparison_operation = _COMPARISON_OPERATIONS[operator]
+
+        def comparison(env: Environment) -> Object:
+            left_value = left(env)
+            right_value = right(env)
+
+            if type(left_value) is Integer and type(right_value) is Integer:
+                if comparison_operation(left_value.value, right_value.value):
+                    return TRUE
+                return FALSE
+
+            assert left_value is not None and right_value is not None
+            return _evaluate_infix_expression(operator, left_value, right_value)
+
+        return comparison
+
+    def infix(env: Environment) -> Object:
+        left_value = left(env)
+        right_value = right(env)
+
+        assert left_value is not None and right_value is not None
+        return _evaluate_infix_expression(operator, left_value, right_value)
+
+    return infix
+
+def _compile_integer(node: ast.Integer) -> Code:
+    # Objects are never mutated, so every run can return the same one.
+    assert node.value is not None
+    value = new_integer(node.value)
+    return lambda env: value
+
+def _compile_let_statement(node: ast.LetStatement) -> Code:
+    assert node.name is not None
+    name = node.name.value
+    value = _compile(node.value)
+
+    def let_statement(env: Environment) -> None:
+        env[name] = value(env)
+
+    return let_statement
+
+def _compile_prefix(node: ast.Prefix) -> Code:
+    right = _compile(node.right)
+    operator = node.operator
+
+    if operator == '!':
+        def bang(env: Environment) -> Object:
+            value = right(env)
+            return TRUE if value is FALSE or value is NULL else FALSE
+
+        return bang
+
+    elif operator == '-':
+        def minus(env: Environment) -> Object:
+            value = right(env)
+
+            if type(value) is Integer:
+                return new_integer(-value.value)
+
+            assert value is not None
+            return _evaluate_prefix_expression(operator, value)
+
+        return minus
+
+    def prefix(env: Environment) -> Object:
+        value = right(env)
+
+        assert value is not None
+        return _evaluate_prefix_expression(operator, value)
+
+    return prefix
+
+def _compile_program(program: ast.Program) -> Code:
+    statements: Tuple[Code, ...] = tuple(_compile(statement) for statement in program.statements)
+
+    def run_program(env: Environment) -> Optional[Object]:
+        result: Optional[Object] = None
+
+        for statement in statements:
+            result = statement(env)
+
+            if type(result) is Return:
+                return result.value
+            if type(result) is Error:
+                return result
+
+        return result
+
+    return run_program
+
+def _compile_return_statement(node: ast.ReturnStatement) -> Code:
+    value = _compile(node.return_value)
+
+    def return_statement(env: Environment) -> Object:
+        evaluated = value(env)
+
+        assert evaluated is not None
+        return Return(evaluated)
+
+    return return_statement
+
+def _compile_string_literal(node: ast.StringLiteral) -> Code:
+    value = String(node.value)
+    return lambda env: value
+
+def _compile_tail_block(block: ast.Block, tail: bool) -> Code:
+    # Compiles a procedimiento body like _compile_block, except for calls in
+    # tail position, like evaluator._evaluate_tail_block: the value of every
+    # `regresa f(x)`, and with `tail` the last statement of the body, through
+    # the branches of si. Those evaluate to a _TailCall for _apply_function.
+    last = len(block.statements) - 1
+    statements: Tuple[Code, ...] = tuple(
+        _compile_tail_statement(statement, tail and index == last)
+        for index, statement in enumerate(block.statements))
+
+    if len(statements) == 1:
+        return statements[0]
+
+    def run_block(env: Environment) -> Any:
+        result: Any = None
+
+        for statement in statements:
+            result = statement(env)
+
+            if type(result) is Return or type(result) is Error or type(result) is _TailCall:
+                return result
+
+        return result
+
+    return run_block
+
+def _compile_tail_call(node: ast.Call, returned: bool) -> Code:
+    function = _compile(node.function)
+
+    assert node.arguments is not None
+    arguments: Tuple[Code, ...] = tuple(_compile(argument) for argument in node.arguments)
+
+    def tail_call(env: Environment) -> Any:
+        fn = function(env)
+        args = [argument(env) for argument in arguments]
+
+        assert fn is not None
+        return _TailCall(fn, cast(_Arguments, args), returned)
+
+    return tail_call
+
+def _compile_tail_statement(statement: ast.Statement, tail: bool) -> Code:
+    if type(statement) is ast.ReturnStatement:
+        return_value = cast(ast.ReturnStatement, statement).return_value
+        if type(return_value) is ast.Call:
+            return _compile_tail_call(cast(ast.Call, return_value), True)
+
+    elif type(statement) is ast.ExpressionStatement:
+        expression = cast(ast.ExpressionStatement, statement).expression
+        if type(expression) is ast.If:
+            return _compile_if(cast(ast.If, expression), tail)
+        elif type(expression) is ast.Block:
+            # A si with a constant condition, replaced by its branch.
+            return _compile_tail_block(cast(ast.Block, expression), tail)
+        elif tail and type(expression) is ast.Call:
+            return _compile_tail_call(cast(ast.Call, expression), False)
+
+    return _compile(statement)
+
+def _compile_while(node: ast.While) -> Code:
+    condition = _compile(node.condition)
+    assert node.body is not None
+    statements: Tuple[Code, ...] = tuple(_compile(statement) for statement in node.body.statements)
+
+    def while_statement(env: Environment) -> Optional[Object]:
+        while True:
+            value = condition(env)
+            if value is FALSE or value is NULL:
+                return None
+            elif type(value) is Error:
+                return value
+
+            for statement in statements:
+                result = statement(env)
+
+                if type(result) is Return or type(result) is Error:
+                    return result
+
+    return while_statement
+
+
+_COMPILERS: Dict[Type[ast.ASTNode], Callable[[Any], Code]] = {
+    ast.AssignmentStatement: _compile_assignment_statement,
+    ast.Block: _compile_block,
+    ast.Boolean: _compile_boolean,
+    ast.Call: _compile_call,
+    ast.ExpressionStatement: _compile_expression_statement,
+    ast.Function: _compile_function,
+    ast.Identifier: _compile_identifier,
+    ast.If: _compile_if,
+    ast.Infix: _compile_infix,
+    ast.Integer: _compile_integer,
+    ast.LetStatement: _compile_let_statement,
+    ast.Prefix: _compile_prefix,
+    ast.Program: _compile_program,
+    ast.ReturnStatement: _compile_return_statement,
+    ast.StringLiteral: _compile_string_literal,
+    ast.While: _compile_while,
+}
+
+
+def _compile(node: Optional[ast.ASTNode]) -> Code:
+    compiler = _COMPILERS.get(type(node)) if node is not None else None
+    if compiler is None:
+        # Like evaluate, unknown nodes, and the ones missing from statements
+        # left incomplete by parse errors, evaluate to None.
+        return lambda env: None
+
+    return compiler(node)
+
+
+def compile_program(program: ast.Program) -> Code:
+    """Compiles `program` once into nested Python closures, each specialized
+    for its node, that run it like evaluate(program, env)."""
+    return _compile(program)
@@ -0,0 +1,399 @@
+from array import array
+from enum import (
+    IntEnum,
+    unique
+)
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union
+)
+
+import lpp.ast as ast
+from lpp.evaluator import (
+    _new_error,
+    _SYNTAX_ERROR,
+    FALSE,
+    NULL,
+    TRUE
+)
+from lpp.object import (
+    Error,
+    new_integer,
+    Object,
+    String
+)
+from lpp.parser import parse_deferred_block
+
+
+@unique
+class Opcode(IntEnum):
+    # Every instruction is an opcode followed by one operand, which is 0 when
+    # the instruction takes none. Jump targets are instruction offsets.
+    LOAD_NAME = 0           # pushes the value of names[operand]
+    LOAD_CONSTANT = 1       # pushes constants[operand]
+    LOAD_NONE = 2           # pushes None, the value of statements like variable
+    STORE_NAME = 3          # pops a value into names[operand] and pushes None
+    CALL = 4                # calls the function below `operand` arguments
+    RETURN = 5              # leaves the frame with the top value, unwrapping Return
+    MAKE_RETURN = 6         # wraps the top value in a Return
+    MAKE_FUNCTION = 7       # builds a function from the FunctionCode in constants[operand]
+    JUMP = 8
+    JUMP_IF_NOT_TRUTHY = 9  # pops a condition and jumps when it is not truthy
+    EXIT_IF_SIGNAL = 10     # jumps keeping a Return or Error on top, or pops the top
+    ADD = 11
+    SUBTRACT = 12
+    MULTIPLY = 13
+    DIVIDE = 14
+    LESS = 15
+    LESS_OR_EQUAL = 16
+    GREATER = 17
+    GREATER_OR_EQUAL = 18
+    EQUAL = 19
+    NOT_EQUAL = 20
+    NEGATE = 21
+    NOT = 22
+    ASSIGN_NAME = 23        # like STORE_NAME, in the scope binding the name, or pushes an Error
+    # Jumps replacing a condition that is not truthy with None, or keeping an
+    # Error, and pops any other condition.
+    END_LOOP_IF_NOT_TRUTHY = 24
+    # A CALL in tail position, of operand >> 1 arguments, where a procedimiento
+    # takes over the frame. The low bit of the operand is set for the call of
+    # a `regresa`; otherwise the frame unwraps one more Return when it ends.
+    TAIL_CALL = 25
+
+
+_INFIX_OPCODES: Dict[str, Opcode] = {
+    '+': Opcode.ADD,
+    '-': Opcode.SUBTRACT,
+    '*': Opcode.MULTIPLY,
+    '/': Opcode.DIVIDE,
+    '<': Opcode.LESS,
+    '<=': Opcode.LESS_OR_EQUAL,
+    '>': Opcode.GREATER,
+    '>=': Opcode.GREATER_OR_EQUAL,
+    '==': Opcode.EQUAL,
+    '!=': Opcode.NOT_EQUAL,
+}
+
+_PREFIX_OPCODES: Dict[str, Opcode] = {
+    '-': Opcode.NEGATE,
+    '!': Opcode.NOT,
+}
+
+
+class Bytecode(NamedTuple):
+    """A compiled program or procedimiento body: its instructions, the
+    constants and the names they refer to."""
+    instructions: array
+    constants: List[Any]
+    names: List[str]
+
+
+class FunctionCode:
+    """The compiled body of a procedimiento, stored as a constant of the code
+    that builds it. Deferred bodies are compiled on the first call."""
+    __slots__ = ('node', 'parameters', 'body', 'bytecode')
+
+    def __init__(self, node: ast.Function) -> None:
+        assert node.body is not None
+        self.node = node
+        self.parameters: List[str] = [parameter.value for parameter in node.parameters]
+        self.body: Union[ast.Block, ast.DeferredBlock] = node.body
+        self.bytecode: Optional[Bytecode] = None
+
+        if type(node.body) is not ast.DeferredBlock:
+            self.bytecode = _Compiler().compile_body(cast(ast.Block, node.body))
+
+    def compile_deferred(self) -> Union[Bytecode, Error]:
+        deferred = self.body
+        assert type(deferred) is ast.DeferredBlock
+        block = parse_deferred_block(deferred)
+
+        if deferred.errors:
+            return _new_error(_SYNTAX_ERROR, ['; '.join(deferred.errors)])
+
+        self.bytecode = _Compiler().compile_body(block)
+        return self.bytecode
+
+
+class _Compiler:
+
+    def __init__(self) -> None:
+        self._instructions: array = array('I')
+        self._constants: List[Any] = []
+        self._constant_indexes: Dict[Tuple[type, Any], int] = {}
+        self._names: List[str] = []
+        self._name_indexes: Dict[str, int] = {}
+        self._compile_fns: Dict[Type[ast.ASTNode], Callable[[Any], None]] = {
+            ast.AssignmentStatement: self._compile_assignment_statement,
+            ast.Block: self._compile_block,
+            ast.Boolean: self._compile_boolean,
+            ast.Call: self._compile_call,
+            ast.ExpressionStatement: self._compile_expression_statement,
+            ast.Function: self._compile_function,
+            ast.Identifier: self._compile_identifier,
+            ast.If: self._compile_if,
+            ast.Infix: self._compile_infix,
+            ast.Integer: self._compile_integer,
+            ast.LetStatement: self._compile_let_statement,
+            ast.Prefix: self._compile_prefix,
+            ast.ReturnStatement: self._compile_return_statement,
+            ast.StringLiteral: self._compile_string_literal,
+            ast.While: self._compile_while,
+        }
+
+    def compile_body(self, node: Union[ast.Program, ast.Block]) -> Bytecode:
+        # The value of a program or a body is the value of its statements
+        # as a block, with a Return unwrapped by the RETURN instruction. The
+        # calls in tail position of procedimiento bodies are TAIL_CALLs.
+        if type(node) is ast.Program:
+            self._compile_statements(node.statements)
+        else:
+            self._compile_tail_statements(node.statements, True)
+        self._emit(Opcode.RETURN)
+
+        return Bytecode(self._instructions, self._constants, self._names)
+
+    def _emit(self, opcode: Opcode, operand: int = 0) -> int:
+        position = len(self._instructions)
+        self._instructions.extend((opcode, operand))
+
+        return position
+
+    def _patch(self, position: int) -> None:
+        """Points the jump at `position` to the next instruction."""
+        self._instructions[position + 1] = len(self._instructions)
+
+    def _constant(self, value: Any, key: Any = None) -> int:
+        if key is None:
+            self._constants.append(value)
+            return len(self._constants) - 1
+
+        try:
+            return self._constant_indexes[key]
+        except KeyError:
+            index = self._constant_indexes[key] = len(self._constants)
+            self._constants.append(value)
+
+            return index
+
+    def _name(self, name: str) -> int:
+        try:
+            return self._name_indexes[name]
+        except KeyError:
+            index = self._name_indexes[name] = len(self._names)
+            self._names.append(name)
+
+            return index
+
+    def _compile(self, node: Optional[ast.ASTNode]) -> None:
+        compile_fn = self._compile_fns.get(type(node)) if node is not None else None
+        if compile_fn is None:
+            # Like evaluate, unknown nodes, and the ones missing from
+            # statements left incomplete by parse errors, evaluate to None.
+            self._emit(Opcode.LOAD_NONE)
+            return
+
+        compile_fn(node)
+
+    def _compile_statements(self, statements: List[ast.Statement]) -> None:
+        if not statements:
+            self._emit(Opcode.LOAD_NONE)
+            return
+
+        exits: List[int] = []
+        for statement in statements[:-1]:
+            self._compile(statement)
+            exits.append(self._emit(Opcode.EXIT_IF_SIGNAL))
+
+        self._compile(statements[-1])
+
+        for position in exits:
+            self._patch(position)
+
+    def _compile_assignment_statement(self, node: ast.AssignmentStatement) -> None:
+        assert node.name is not None
+        self._compile(node.value)
+        self._emit(Opcode.ASSIGN_NAME, self._name(node.name.value))
+
+    def _compile_block(self, block: ast.Block) -> None:
+        self._compile_statements(block.statements)
+
+    def _compile_boolean(self, node: ast.Boolean) -> None:
+        value = TRUE if node.value else FALSE
+        self._emit(Opcode.LOAD_CONSTANT, self._constant(value, (bool, node.value)))
+
+    def _compile_call(self, node: ast.Call) -> None:
+        assert node.arguments is not None
+        self._compile(node.function)
+
+        for argument in node.arguments:
+            self._compile(argument)
+
+        self._emit(Opcode.CALL, len(node.arguments))
+
+    def _compile_tail_call(self, node: ast.Call, returned: bool) -> None:
+        assert node.arguments is not None
+        self._compile(node.function)
+
+        for argument in node.arguments:
+            self._compile(argument)
+
+        self._emit(Opcode.TAIL_CALL, len(node.arguments) << 1 | returned)
+
+    def _compile_expression_statement(self, node: ast.ExpressionStatement) -> None:
+        self._compile(node.expression)
+
+    def _compile_function(self, node: ast.Function) -> None:
+        self._emit(Opcode.MAKE_FUNCTION, self._constant(FunctionCode(node)))
+
+    def _compile_identifier(self, node: ast.Identifier) -> None:
+        self._emit(Opcode.LOAD_NAME, self._name(node.value))
+
+    def _compile_if(self, node: ast.If, tail: Optional[bool] = None) -> None:
+        # With `tail`, the si is a statement of a procedimiento body, and its
+        # branches are compiled like one, see _compile_tail_statements.
+        self._compile(node.condition)
+        to_alternative = self._emit(Opcode.JUMP_IF_NOT_TRUTHY)
+
+        if tail is None:
+            self._compile(node.consequence)
+        else:
+            assert node.consequence is not None
+            self._compile_tail_statements(node.consequence.statements, tail)
+        to_end = self._emit(Opcode.JUMP)
+
+        self._patch(to_alternative)
+        if node.alternative is not None and tail is not None:
+            self._compile_tail_statements(node.alternative.statements, tail)
+        elif node.alternative is not None:
+            self._compile(node.alternative)
+        else:
+            self._emit(Opcode.LOAD_CONSTANT, self._constant(NULL, (type(None), None)))
+
+        self._patch(to_end)
+
+    def _compile_infix(self, node: ast.Infix) -> None:
+        self._compile(node.left)
+        self._compile(node.right)
+        self._emit(_INFIX_OPCODES[node.operator])
+
+    def _compile_integer(self, node: ast.Integer) -> None:
+        # Objects are never mutated, so every run can push the same one.
+        assert node.value is not None
+        self._emit(Opcode.LOAD_CONSTANT, self._constant(new_integer(node.value), (int, node.value)))
+
+    def _compile_let_statement(self, node: ast.LetStatement) -> None:
+        assert node.name is not None
+        self._compile(node.value)
+        self._emit(Opcode.STORE_NAME, self._name(node.name.value))
+
+    def _compile_prefix(self, node: ast.Prefix) -> None:
+        self._compile(node.right)
+        self._emit(_PREFIX_OPCODES[node.operator])
+
+    def _compile_return_statement(self, node: ast.ReturnStatement) -> None:
+        self._compile(node.return_value)
+        self._emit(Opcode.MAKE_RETURN)
+
+    def _compile_string_literal(self, node: ast.StringLiteral) -> None:
+        self._emit(Opcode.LOAD_CONSTANT, self._constant(String(node.value), (str, node.value)))
+
+    def _compile_tail_statements(self, statements: List[ast.Statement], tail: bool) -> None:
+        # Compiles a procedimiento body like _compile_statements, except for
+        # calls in tail position, like evaluator._evaluate_tail_block: the
+        # value of every `regresa f(x)`, and with `tail` the last statement
+        # of the body, through the branches of si. Nothing but jumps and the
+        # RETURN of the frame follow them, so the callee can take it over.
+        if not statements:
+            self._emit(Opcode.LOAD_NONE)
+            return
+
+        exits: List[int] = []
+        last = len(statements) - 1
+        for index, statement in enumerate(statements):
+            self._compile_tail_statement(statement, tail and index == last)
+            if index < last:
+                exits.append(self._emit(Opcode.EXIT_IF_SIGNAL))
+
+        for position in exits:
+            self._patch(position)
+
+    def _compile_tail_statement(self, statement: ast.Statement, tail: bool) -> None:
+        if type(statement) is ast.ReturnStatement:
+            return_value = cast(ast.ReturnStatement, statement).return_value
+            if type(return_value) is ast.Call:
+                # MAKE_RETURN only runs after calls to builtins.
+                self._compile_tail_call(cast(ast.Call, return_value), True)
+                self._emit(Opcode.MAKE_RETURN)
+                return
+
+        elif type(statement) is ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statement).expression
+            if type(expression) is ast.If:
+                self._compile_if(cast(ast.If, expression), tail)
+                return
+            elif type(expression) is ast.Block:
+                # A si with a constant condition, replaced by its branch.
+                self._compile_tail_statements(cast(ast.Block, expression).statements, tail)
+                return
+            elif tail and type(expression) is ast.Call:
+                self._compile_tail_call(cast(ast.Call, expression), False)
+                return
+
+        self._compile(statement)
+
+    def _compile_while(self, node: ast.While) -> None:
+        # Every way out of the loop jumps to its end with its value on top:
+        # None, or the Error of the condition, or the Return or Error that
+        # stopped the body.
+        start = len(self._instructions)
+        self._compile(node.condition)
+        to_end = self._emit(Opcode.END_LOOP_IF_NOT_TRUTHY)
+
+        assert node.body is not None
+        self._compile_statements(node.body.statements)
+        to_end_with_signal = self._emit(Opcode.EXIT_IF_SIGNAL)
+        self._emit(Opcode.JUMP, start)
+
+        self._patch(to_end)
+        self._patch(to_end_with_signal)
+
+
+def compile_program(program: ast.Program) -> Bytecode:
+    """Lowers `program` to bytecode for lpp.vm.execute."""
+    return _Compiler().compile_body(program)
+
+
+def disassemble(bytecode: Bytecode) -> str:
+    lines: List[str] = []
+    instructions = bytecode.instructions
+
+    for position in range(0, len(instructions), 2):
+        opcode = Opcode(instructions[position])
+        operand = instructions[position + 1]
+        line = f'{position:04} {opcode.name}'
+
+        if opcode is Opcode.LOAD_CONSTANT:
+            constant: Object = bytecode.constants[operand]
+            line += f' {operand} ({constant.inspect()})'
+        elif opcode in (Opcode.LOAD_NAME, Opcode.STORE_NAME, Opcode.ASSIGN_NAME):
+            line += f' {operand} ({bytecode.names[operand]})'
+        elif opcode is Opcode.TAIL_CALL:
+            line += f' {operand >> 1}' + (' (regresa)' if operand & 1 else '')
+        elif opcode in (Opcode.CALL, Opcode.JUMP, Opcode.JUMP_IF_NOT_TRUTHY,
+                        Opcode.EXIT_IF_SIGNAL, Opcode.MAKE_FUNCTION,
+                        Opcode.END_LOOP_IF_NOT_TRUTHY):
+            line += f' {operand}'
+
+        lines.append(line)
+
+    return '\n'.join(lines)
@@ -1,13 +1,20 @@
 from typing import (
     Any,
+    Callable,
     cast,
+    Dict,
     List,
     Optional,
-    Type
+    Type,
+    Union
 )
+from weakref import ref
 
 import lpp.ast as ast
+import lpp.memoization as memoization
+import lpp.tiering as tiering
 from lpp.builtins import BUILTINS
+from lpp.parser import parse_deferred_block
 from lpp.object import (
     Environment,
     Error,
@@ -19,7 +26,9 @@ from lpp.object import (
     ObjectType,
     Return,
     String,
-    Builtin
+    Builtin,
+    new_integer,
+    UNSET
 )
 
 
@@ -35,25 +44,146 @@ _TYPE_MISMATCH = 'Discrepancia de tipos: {} {} {}'
 _UNKNOWN_INFIX_OPERATOR = 'Operador desconocido: {} {} {}'
 _UNKNOWN_PREFIX_OPERATOR = 'Operador desconocido: {}{}'
 _UNKNOWN_IDENTIFIER = 'Identificador no encontrado: {}'
-
-
-def _apply_function(fn: Object, args: List[Object]) -> Object:
+_SYNTAX_ERROR = 'Error de sintaxis en el procedimiento: {}'
+_MAX_DEPTH_EXCEEDED = 'Profundidad máxima de llamadas excedida: {}'
+
+
+class _TailCall:
+    """A call in tail position, returned to _run_tail_calls to run in its
+    loop instead of nesting one more call. `returned` tells a `regresa f(x)`
+    from a body ending in `f(x)`, whose value is unwrapped once more. The
+    `cache` of the call site, if any, binds the arguments."""
+    __slots__ = ('fn', 'args', 'returned', 'cache')
+
+    def __init__(self,
+                 fn: Object,
+                 args: List[Object],
+                 returned: bool,
+                 cache: Optional['_InlineCache'] = None) -> None:
+        self.fn = fn
+        self.args = args
+        self.returned = returned
+        self.cache = cache
+
+
+class _Returned:
+    """The status of a procedimiento body left by a `regresa`. Its one
+    instance, _RETURNED, carries the value out of the body, which the call
+    would otherwise wrap in a Return only to strip it right away."""
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value: Optional[Object] = None
+
+
+_RETURNED = _Returned()
+
+# The results that stop a block.
+_EXITS = frozenset([Return, Error])
+_TAIL_EXITS = frozenset([Return, Error, _TailCall, _Returned])
+
+
+class _InlineCache:
+    """What a call site saw on its last call. The callee, when it is a name
+    looked up in the environment the program runs in, holds while that
+    environment keeps `version`, which no other one ever has. It is only
+    referenced weakly, as the program outlives the environments it runs in.
+    The binding plan, for procedimientos with `scope`: the arguments fill
+    the first slots of the frame, and `padding` the rest."""
+    __slots__ = ('version', 'callee', 'scope', 'parameters', 'padding')
+
+    def __init__(self) -> None:
+        self.version = -1
+        self.callee: Optional['ref[Object]'] = None
+        self.scope: Optional[Dict[str, int]] = None
+        self.parameters = 0
+        self.padding: List[Any] = []
+
+
+def _apply_function(fn: Object, args: List[Object], memoize: bool = True) -> Object:
+    return _run_tail_calls(_call(fn, args, memoize, None), memoize)
+
+def _bind_arguments(fn: Function,
+                    args: List[Any],
+                    cache: Optional[_InlineCache]) -> Environment:
+    # The frame of a call to `fn`, through the binding plan of the call site.
+    scope = fn.scope
+    if cache is None or scope is None:
+        return _extend_function_environment(fn, args)
+
+    if scope is not cache.scope:
+        cache.scope = scope
+        cache.parameters = len(fn.parameters)
+        cache.padding = [UNSET] * (len(scope) - cache.parameters)
+
+    if len(args) != cache.parameters:
+        return _extend_function_environment(fn, args)
+
+    args += cache.padding
+    return Environment(fn.env, scope, args)
+
+def _call(fn: Object,
+          args: List[Object],
+          memoize: bool,
+          cache: Optional[_InlineCache]) -> Any:
+    # One call, whose value may be a _TailCall still to run.
     if type(fn) == Function:
         fn = cast(Function, fn)
+        tier = fn.tier
 
-        extended_environment = _extend_function_environment(fn, args)
-        evaluated = evaluate(fn.body, extended_environment)
+        if fn.memo is not None and memoize:
+            return memoization.call(fn, args)
+        elif tier is not None and tier.run is not None:
+            fn.calls += 1
+            evaluated = tier.run(args, fn.env)
+            if evaluated is not tiering.DEOPTIMIZED:
+                tier.optimized_calls += 1
+                return evaluated
+
+            tier.deoptimizations += 1
+            return _evaluate_function_body(fn, args)
+
+        fn.calls += 1
+        if fn.calls == tiering.THRESHOLD:
+            tiering.promote(fn, args)
+
+        if fn.scope is None:
+            return _evaluate_function_body(fn, args)
+
+        # Resolved bodies are never deferred.
+        return _evaluate_frame(cast(ast.Block, fn.body), _bind_arguments(fn, args, cache))
 
-        assert evaluated is not None
-        return _unwrap_return_value(evaluated)
-    
     elif type(fn) == Builtin:
-        fn = cast(Builtin, fn)
+        return cast(Builtin, fn).fn(*args)
+
+    return _new_error(_NOT_A_FUNCTION, [fn.type().name])
+
+def _evaluate_assignment_statement(node: ast.AssignmentStatement,
+                                   env: Environment) -> Optional[Object]:
+    assert node.value is not None
+    value = evaluate(node.value, env)
+
+    assert node.name is not None
+    name = node.name
+    if name.slot >= 0:
+        frame: Optional[Environment] = env
+        depth = name.depth
+        while depth > 0:
+            assert frame is not None
+            frame = frame.outer
+            depth -= 1
+
+        assert frame is not None
+        if frame.slots[name.slot] is not UNSET:
+            frame.slots[name.slot] = value
+            return None
+
+    # Like _evaluate_identifier, a name not declared yet in its procedimiento
+    # refers to the variable of an outer scope.
+    if not env.assign(name.value, value):
+        return _new_error(_UNKNOWN_IDENTIFIER, [name.value])
 
-        return fn.fn(*args)
-    
-    else:
-        return _new_error(_NOT_A_FUNCTION, [fn.type().name])
+    return None
 
 def _evaluate_bang_operator_expression(right: Object) -> Object:
     if right is TRUE:
@@ -71,11 +201,68 @@ def _evaluate_block_statements(block: ast.Block, env: Environment) -> Optional[O
     for statement in block.statements:
         result = evaluate(statement, env)
 
-        if result is not None and result.type() in [ObjectType.RETURN, ObjectType.ERROR]:
+        if type(result) in _EXITS:
             return result
     
     return result
 
+def _evaluate_boolean(node: ast.Boolean, env: Environment) -> Object:
+    assert node.value is not None
+    return _to_boolean_object(node.value)
+
+def _evaluate_call(node: ast.Call, env: Environment) -> Object:
+    function = _evaluate_callee(node, env)
+
+    assert node.arguments is not None
+    args = _evaluate_expression(node.arguments, env)
+
+    return _run_tail_calls(_call(function, args, True, node.cache), True)
+
+def _evaluate_callee(node: ast.Call, env: Environment) -> Object:
+    cache = node.cache
+    if cache is None:
+        cache = node.cache = _InlineCache()
+
+    function = node.function
+    if type(function) is ast.Identifier:
+        return _evaluate_callee_identifier(cast(ast.Identifier, function), env, cache)
+
+    callee = evaluate(function, env)
+
+    assert callee is not None
+    return callee
+
+def _evaluate_callee_identifier(identifier: ast.Identifier,
+                                env: Environment,
+                                cache: _InlineCache) -> Any:
+    if identifier.slot >= 0 or identifier.depth < 0:
+        return _evaluate_identifier(identifier, env)
+
+    # A global or a builtin, looked up by name in the environment the
+    # program runs in. Without outer scopes or slots, only a binding in its
+    # dict changes what the name refers to.
+    frame: Optional[Environment] = env
+    depth = identifier.depth
+    while depth > 0:
+        assert frame is not None
+        frame = frame.outer
+        depth -= 1
+
+    assert frame is not None
+    if frame.version == cache.version:
+        assert cache.callee is not None
+        callee = cache.callee()
+        if callee is not None:
+            return callee
+
+    callee = _evaluate_identifier(identifier, env)
+    if (frame.outer is None and frame.scope is None
+            and (type(callee) == Function or type(callee) == Builtin)):
+        cache.version = frame.version
+        cache.callee = ref(callee)
+
+    return callee
+
 def _evaluate_expression(expressions: List[ast.Expression], env: Environment) -> List[Object]:
     result: List[Object] = []
 
@@ -87,9 +274,63 @@ def _evaluate_expression(expressions: List[ast.Expression], env: Environment) ->
     
     return result
 
+def _evaluate_expression_statement(node: ast.ExpressionStatement,
+                                   env: Environment) -> Optional[Object]:
+    assert node.expression is not None
+    return evaluate(node.expression, env)
+
+def _evaluate_function(node: ast.Function, env: Environment) -> Object:
+    assert node.body is not None
+    function = Function(node.parameters, node.body, env, node.scope)
+
+    if node.dependencies is not None:
+        memoization.attach(function, node.dependencies)
+
+    return function
+
+def _evaluate_frame(body: ast.Block, env: Environment) -> Object:
+    evaluated = _evaluate_tail_block(body, env, True)
+
+    if evaluated is _RETURNED:
+        evaluated = _RETURNED.value
+        _RETURNED.value = None
+
+        assert evaluated is not None
+        return evaluated
+
+    assert evaluated is not None
+    return _unwrap_return_value(evaluated)
+
+def _evaluate_function_body(fn: Function, args: List[Object]) -> Object:
+    body = _function_body(fn)
+    if type(body) == Error:
+        return body
+
+    return _evaluate_frame(cast(ast.Block, body), _extend_function_environment(fn, args))
+
 def _evaluate_identifier(node: ast.Identifier, env: Environment) -> Object:
+    # The resolver counted the scopes around the identifier, so the chain is
+    # at least `depth` scopes long.
+    frame: Optional[Environment] = env
+    depth = node.depth
+    while depth > 0:
+        assert frame is not None
+        frame = frame.outer
+        depth -= 1
+
+    assert frame is not None
+
+    if node.slot >= 0:
+        value = frame.slots[node.slot]
+        if value is not UNSET:
+            return value
+
+        # Not declared yet in its procedimiento: the name refers to the
+        # variable of an outer scope, if any.
+        frame = env
+
     try:
-        return env[node.value]
+        return frame[node.value]
     except KeyError:
         return BUILTINS.get(node.value,
                             _new_error(_UNKNOWN_IDENTIFIER, [node.value]))
@@ -108,6 +349,17 @@ def _evaluate_if_expression(if_expression: ast.If, env: Environment) -> Optional
     
     return NULL
 
+def _evaluate_infix(node: ast.Infix, env: Environment) -> Object:
+    assert node.left is not None and node.right is not None
+    left = evaluate(node.left, env)
+    right = evaluate(node.right, env)
+
+    assert left is not None and right is not None
+    if node.specialization is not None:
+        return node.specialization(left, right)
+
+    return _evaluate_infix_expression(node.operator, left, right)
+
 def _evaluate_infix_expression(operator: str,
                                left: Object,
                                right: Object) -> Object:
@@ -124,6 +376,14 @@ def _evaluate_infix_expression(operator: str,
     
     return _new_error(_UNKNOWN_INFIX_OPERATOR, [left.type().name, operator, right.type().name])
 
+def _evaluate_integer(node: ast.Integer, env: Environment) -> Object:
+    value = node.constant
+    if value is None:
+        assert node.value is not None
+        value = node.constant = new_integer(node.value)
+
+    return value
+
 def _evaluate_integer_infix_expression(operator: str,
                                        left: Object,
                                        right: Object) -> Object:
@@ -131,13 +391,13 @@ def _evaluate_integer_infix_expression(operator: str,
     right_value: int = cast(Integer, right).value
 
     if operator == '+':
-        return Integer(left_value + right_value)
+        return new_integer(left_value + right_value)
     elif operator == '-':
-        return Integer(left_value - right_value)
+        return new_integer(left_value - right_value)
     elif operator == '*':
-        return Integer(left_value * right_value)
+        return new_integer(left_value * right_value)
     elif operator == '/':
-        return Integer(left_value // right_value)
+        return new_integer(left_value // right_value)
     elif operator == '<':
         return _to_boolean_object(left_value < right_value)
     elif operator == '<=':
@@ -153,13 +413,33 @@ def _evaluate_integer_infix_expression(operator: str,
     
     return _new_error(_UNKNOWN_INFIX_OPERATOR, [left.type().name, operator, right.type().name])
 
+def _evaluate_let_statement(node: ast.LetStatement, env: Environment) -> None:
+    assert node.value is not None
+    value = evaluate(node.value, env)
+
+    assert node.name is not None
+    if node.name.slot >= 0:
+        env.slots[node.name.slot] = value
+    else:
+        env[node.name.value] = value
+
 def _evaluate_minus_operator_expression(right: Object) -> Object:
     if type(right) != Integer:
         return _new_error(_UNKNOWN_PREFIX_OPERATOR, ['-', right.type().name])
     
     right = cast(Integer, right)
 
-    return Integer(-right.value)
+    return new_integer(-right.value)
+
+def _evaluate_prefix(node: ast.Prefix, env: Environment) -> Object:
+    assert node.right is not None
+    right = evaluate(node.right, env)
+
+    assert right is not None
+    if node.specialization is not None:
+        return node.specialization(right)
+
+    return _evaluate_prefix_expression(node.operator, right)
 
 def _evaluate_prefix_expression(operator: str, right: Object) -> Object:
     if operator == '!':
@@ -174,14 +454,19 @@ def _evaluate_program(program: ast.Program, env: Environment) -> Optional[Object
     for statement in program.statements:
         result = evaluate(statement, env)
 
-        if type(result) == Return:
-            result = cast(Return, result)
-            return result.value
-        if type(result) == Error:
-            return result
+        if type(result) in _EXITS:
+            assert result is not None
+            return _unwrap_return_value(result)
     
     return result
 
+def _evaluate_return_statement(node: ast.ReturnStatement, env: Environment) -> Object:
+    assert node.return_value is not None
+    value = evaluate(node.return_value, env)
+
+    assert value is not None
+    return Return(value)
+
 def _evaluate_string_infix_expression(operator: str,
                                       left: Object,
                                       right: Object) -> Object:
@@ -207,138 +492,193 @@ def _evaluate_string_infix_expression(operator: str,
                                                     operator,
                                                     right.type().name])
 
-def _extend_function_environment(fn: Function, args: List[Object]) -> Environment:
-    env = Environment(outer= fn.env)
+def _evaluate_string_literal(node: ast.StringLiteral, env: Environment) -> Object:
+    value = node.constant
+    if value is None:
+        value = node.constant = String(node.value)
+
+    return value
+
+def _evaluate_tail_block(block: ast.Block, env: Environment, tail: bool) -> Any:
+    # Evaluates a procedimiento body like _evaluate_block_statements, except
+    # for calls in tail position: the value of every `regresa f(x)`, and with
+    # `tail` the last statement of the body, through the branches of si. The
+    # other `regresa` statements of the body leave it through _RETURNED.
+    result: Any = None
+    last = len(block.statements) - 1
+
+    for index, statement in enumerate(block.statements):
+        if type(statement) == ast.ReturnStatement:
+            statement = cast(ast.ReturnStatement, statement)
+            if type(statement.return_value) == ast.Call:
+                return _tail_call(cast(ast.Call, statement.return_value), env, True)
+
+            assert statement.return_value is not None
+            _RETURNED.value = evaluate(statement.return_value, env)
+            return _RETURNED
+
+        elif type(statement) == ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statement).expression
+            if type(expression) == ast.If:
+                result = _evaluate_tail_if(cast(ast.If, expression), env, tail and index == last)
+            elif type(expression) == ast.Block:
+                # A si with a constant condition, replaced by its branch.
+                result = _evaluate_tail_block(cast(ast.Block, expression), env, tail and index == last)
+            elif tail and index == last and type(expression) == ast.Call:
+                return _tail_call(cast(ast.Call, expression), env, False)
+            else:
+                result = evaluate(statement, env)
+
+        else:
+            result = evaluate(statement, env)
+
+        if type(result) in _TAIL_EXITS:
+            return result
 
-    for idx, param in enumerate(fn.parameters):
-        env[param.value] = args[idx - 1]
-    
-    return env
+    return result
 
-def _is_truthy(obj: Object) -> bool:
-    if obj is NULL:
-        return False
-    elif obj is TRUE:
-        return True
-    elif obj is FALSE:
-        return False
-    
-    return True
+def _evaluate_tail_if(if_expression: ast.If, env: Environment, tail: bool) -> Any:
+    assert if_expression.condition is not None
+    condition = evaluate(if_expression.condition, env)
 
-def _new_error(message: str, args: List[Any]) -> Error:
-    return Error(message.format(*args))
+    assert condition is not None
 
-def _to_boolean_object(value: bool) -> Boolean:
-    return TRUE if value else FALSE
+    if _is_truthy(condition):
+        assert if_expression.consequence is not None
+        return _evaluate_tail_block(if_expression.consequence, env, tail)
+    elif if_expression.alternative is not None:
+        return _evaluate_tail_block(if_expression.alternative, env, tail)
 
-def _unwrap_return_value(obj: Object) -> Object:
-    if type(obj) == Return:
-        obj = cast(Return, obj)
-        return obj.value
-    
-    return obj
+    return NULL
 
+def _evaluate_while_statement(node: ast.While, env: Environment) -> Optional[Object]:
+    # The whole loop runs in this frame, over the environment it is in.
+    assert node.condition is not None and node.body is not None
+    condition = node.condition
+    statements = node.body.statements
 
+    while True:
+        value = evaluate(condition, env)
+        if value is FALSE or value is NULL:
+            return None
+        elif type(value) == Error:
+            return value
 
+        for statement in statements:
+            result = evaluate(statement, env)
 
+            if type(result) in _EXITS:
+                return result
 
+def _extend_function_environment(fn: Function, args: List[Object]) -> Environment:
+    scope = fn.scope
+    if scope is None:
+        env = Environment(outer=fn.env)
+        for idx, param in enumerate(fn.parameters):
+            env[param.value] = args[idx]
 
+        return env
 
-def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
-    node_type: Type = type(node)
+    # The parameters take the first slots, in order, so the arguments are
+    # the start of the frame; the variables of the body follow, unset.
+    parameters = len(fn.parameters)
+    if len(args) < parameters:
+        raise IndexError('list index out of range')
 
-    if node_type == ast.Program:
-        node = cast(ast.Program, node)
-        return _evaluate_program(node, env)
-    
-    elif node_type == ast.ExpressionStatement:
-        node = cast(ast.ExpressionStatement, node)
+    slots = args[:parameters]
+    if len(scope) > parameters:
+        slots.extend([UNSET] * (len(scope) - parameters))
 
-        assert node.expression is not None
-        return evaluate(node.expression, env)
-    
-    elif node_type == ast.Integer:
-        node = cast(ast.Integer, node)
+    return Environment(fn.env, scope, slots)
 
-        assert node.value is not None
-        return Integer(node.value)
-    
-    elif node_type == ast.Boolean:
-        node = cast(ast.Boolean, node)
+def _function_body(fn: Function) -> Union[ast.Block, Error]:
+    # Bodies deferred by a lazy parser are parsed on the first call.
+    if type(fn.body) == ast.DeferredBlock:
+        deferred = cast(ast.DeferredBlock, fn.body)
+        block = parse_deferred_block(deferred)
 
-        assert node.value is not None
-        return _to_boolean_object(node.value)
-    
-    elif node_type == ast.Prefix:
-        node = cast(ast.Prefix, node)
+        if deferred.errors:
+            return _new_error(_SYNTAX_ERROR, ['; '.join(deferred.errors)])
 
-        assert node.right is not None
-        right = evaluate(node.right, env)
+        fn.body = block
 
-        assert right is not None
-        return _evaluate_prefix_expression(node.operator, right)
-    
-    elif node_type == ast.Infix:
-        node = cast(ast.Infix, node)
-        
-        assert node.left is not None and node.right is not None
-        left = evaluate(node.left, env)
-        right = evaluate(node.right, env)
+    return cast(ast.Block, fn.body)
 
-        assert left is not None and right is not None
-        return _evaluate_infix_expression(node.operator, left, right)
-    
-    elif node_type == ast.Block:
-        node = cast(ast.Block, node)
-        return _evaluate_block_statements(node, env)
+def _is_truthy(obj: Object) -> bool:
+    if obj is NULL:
+        return False
+    elif obj is TRUE:
+        return True
+    elif obj is FALSE:
+        return False
     
-    elif node_type == ast.If:
-        node = cast(ast.If, node)
+    return True
 
-        return _evaluate_if_expression(node, env)
-    
-    elif node_type == ast.ReturnStatement:
-        node = cast(ast.ReturnStatement, node)
+def _new_error(message: str, args: List[Any]) -> Error:
+    return Error(message.format(*args))
 
-        assert node.return_value is not None
-        value = evaluate(node.return_value, env)
+def _run_tail_calls(evaluated: Any, memoize: bool) -> Object:
+    if type(evaluated) != _TailCall:
+        return evaluated
 
-        assert value is not None
-        return Return(value)
-    
-    elif node_type == ast.LetStatement:
-        node = cast(ast.LetStatement, node)
+    unwraps = 0
+    while type(evaluated) == _TailCall:
+        tail_call = cast(_TailCall, evaluated)
+        if not tail_call.returned:
+            unwraps += 1
 
-        assert node.value is not None
-        value = evaluate(node.value, env)
+        evaluated = _call(tail_call.fn, tail_call.args, memoize, tail_call.cache)
 
-        assert node.name is not None
-        env[node.name.value] = value
-    
-    elif node_type == ast.Identifier:
-        node = cast(ast.Identifier, node)
+    while unwraps > 0 and type(evaluated) == Return:
+        evaluated = cast(Return, evaluated).value
+        unwraps -= 1
 
-        return _evaluate_identifier(node, env)
-    
-    elif node_type == ast.Function:
-        node = cast(ast.Function, node)
+    return evaluated
 
-        assert node.body is not None
-        return Function(node.parameters, node.body, env)
-    
-    elif node_type == ast.Call:
-        node = cast(ast.Call, node)
+def _tail_call(node: ast.Call, env: Environment, returned: bool) -> _TailCall:
+    function = _evaluate_callee(node, env)
 
-        function = evaluate(node.function, env)
+    assert node.arguments is not None
+    args = _evaluate_expression(node.arguments, env)
 
-        assert node.arguments is not None
-        args = _evaluate_expression(node.arguments, env)
+    return _TailCall(function, args, returned, node.cache)
 
-        assert function is not None
-        return _apply_function(function, args)
-    
-    elif node_type == ast.StringLiteral:
-        node = cast(ast.StringLiteral, node)
-        return String(node.value)
+def _to_boolean_object(value: bool) -> Boolean:
+    return TRUE if value else FALSE
+
+def _unwrap_return_value(obj: Object) -> Object:
+    if type(obj) == Return:
+        obj = cast(Return, obj)
+        return obj.value
     
+    return obj
+
+
+# Evaluation function of each node class. The asserts on the way are
+# stripped when running with python -O.
+_EVALUATORS: Dict[Type[ast.ASTNode], Callable[[Any, Environment], Optional[Object]]] = {
+    ast.AssignmentStatement: _evaluate_assignment_statement,
+    ast.Block: _evaluate_block_statements,
+    ast.Boolean: _evaluate_boolean,
+    ast.Call: _evaluate_call,
+    ast.ExpressionStatement: _evaluate_expression_statement,
+    ast.Function: _evaluate_function,
+    ast.Identifier: _evaluate_identifier,
+    ast.If: _evaluate_if_expression,
+    ast.Infix: _evaluate_infix,
+    ast.Integer: _evaluate_integer,
+    ast.LetStatement: _evaluate_let_statement,
+    ast.Prefix: _evaluate_prefix,
+    ast.Program: _evaluate_program,
+    ast.ReturnStatement: _evaluate_return_statement,
+    ast.StringLiteral: _evaluate_string_literal,
+    ast.While: _evaluate_while_statement,
+}
+
+
+def _evaluate_unknown(node: ast.ASTNode, env: Environment) -> None:
     return None
+
+
+def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+    return _EVALUATORS.get(type(node), _evaluate_unknown)(node, env)
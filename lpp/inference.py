@@ -0,0 +1,402 @@
+from operator import (
+    add,
+    eq,
+    floordiv,
+    ge,
+    gt,
+    le,
+    lt,
+    mul,
+    ne,
+    sub
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast
+)
+
+import lpp.ast as ast
+# A specialized operation gives the operands it wasn't specialized for to
+# the generic one, so its values and errors are the ones of the evaluator.
+from lpp.evaluator import (
+    _evaluate_bang_operator_expression,
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    FALSE,
+    TRUE
+)
+from lpp.object import (
+    Boolean,
+    Integer,
+    new_integer,
+    Object,
+    String
+)
+from lpp.resolver import (
+    _declare_variables,
+    children,
+    Scope
+)
+
+
+# The kinds of values the pass tells apart, by the name of their ObjectType.
+_INTEGER = 'INTEGER'
+_STRING = 'STRING'
+_BOOLEAN = 'BOOLEAN'
+
+_ARITHMETIC_OPERATORS = frozenset(['-', '*', '/'])
+
+_EQUALITY_OPERATORS = frozenset(['==', '!='])
+
+# Inferring the kind of a variable may change the kinds of others; past
+# these rounds, whatever is still changing is left generic.
+_ROUNDS = 8
+
+InfixOperation = Callable[[Object, Object], Object]
+PrefixOperation = Callable[[Object], Object]
+
+
+def _integer_arithmetic(operator: str, operation: Callable[[int, int], int]) -> InfixOperation:
+    def specialized(left: Object, right: Object) -> Object:
+        if type(left) is Integer and type(right) is Integer:
+            return new_integer(operation(left.value, right.value))
+
+        return _evaluate_infix_expression(operator, left, right)
+
+    return specialized
+
+
+def _comparison(operator: str,
+                operand_type: Type[Union[Integer, String]],
+                operation: Callable[[Any, Any], bool]) -> InfixOperation:
+    def specialized(left: Object, right: Object) -> Object:
+        if type(left) is operand_type and type(right) is operand_type:
+            return TRUE if operation(left.value, right.value) else FALSE
+
+        return _evaluate_infix_expression(operator, left, right)
+
+    return specialized
+
+
+def _string_concatenation(left: Object, right: Object) -> Object:
+    if type(left) is String and type(right) is String:
+        return String(left.value + right.value)
+
+    return _evaluate_infix_expression('+', left, right)
+
+
+def _boolean_equality(operator: str, equal: bool) -> InfixOperation:
+    # Booleans are compared by identity, like any value that is neither an
+    # integer nor a string.
+    def specialized(left: Object, right: Object) -> Object:
+        if type(left) is Boolean and type(right) is Boolean:
+            return TRUE if (left is right) == equal else FALSE
+
+        return _evaluate_infix_expression(operator, left, right)
+
+    return specialized
+
+
+def _integer_negation(right: Object) -> Object:
+    if type(right) is Integer:
+        return new_integer(-right.value)
+
+    return _evaluate_prefix_expression('-', right)
+
+
+# The specialized operations by the kind of both operands and the operator.
+_INFIX_OPERATIONS: Dict[Tuple[str, str], InfixOperation] = {
+    (_INTEGER, '+'): _integer_arithmetic('+', add),
+    (_INTEGER, '-'): _integer_arithmetic('-', sub),
+    (_INTEGER, '*'): _integer_arithmetic('*', mul),
+    (_INTEGER, '/'): _integer_arithmetic('/', floordiv),
+    (_INTEGER, '<'): _comparison('<', Integer, lt),
+    (_INTEGER, '<='): _comparison('<=', Integer, le),
+    (_INTEGER, '>'): _comparison('>', Integer, gt),
+    (_INTEGER, '>='): _comparison('>=', Integer, ge),
+    (_INTEGER, '=='): _comparison('==', Integer, eq),
+    (_INTEGER, '!='): _comparison('!=', Integer, ne),
+    (_STRING, '+'): _string_concatenation,
+    (_STRING, '<'): _comparison('<', String, lt),
+    (_STRING, '<='): _comparison('<=', String, le),
+    (_STRING, '>'): _comparison('>', String, gt),
+    (_STRING, '>='): _comparison('>=', String, ge),
+    (_STRING, '=='): _comparison('==', String, eq),
+    (_STRING, '!='): _comparison('!=', String, ne),
+    (_BOOLEAN, '=='): _boolean_equality('==', True),
+    (_BOOLEAN, '!='): _boolean_equality('!=', False),
+}
+
+# `!` works the same on every value, so it needs no guard.
+_PREFIX_OPERATIONS: Dict[Tuple[str, str], PrefixOperation] = {
+    (_INTEGER, '-'): _integer_negation,
+    (_BOOLEAN, '!'): _evaluate_bang_operator_expression,
+}
+
+
+class InferenceStatistics(NamedTuple):
+    integer: int        # operations specialized for integers
+    string: int         # operations specialized for strings
+    boolean: int        # operations specialized for booleans
+    dynamic: int        # operations left on the generic path
+
+
+class _Variable:
+    """A variable or parameter of a scope, with the kind inferred for it."""
+    __slots__ = ('kind',)
+
+    def __init__(self) -> None:
+        self.kind: Optional[str] = None
+
+
+class TypeInference:
+    """Infers the kinds of the operands of the operators of programs, from
+    their literals, the results of other operations and the way variables
+    and parameters are used, and specializes those operators for them.
+
+    lpp is dynamic, so the inferred kinds are a guess: a specialized
+    operation checks the exact types of its operands, and gives the ones it
+    wasn't specialized for, like the string passed to a parameter only used
+    in arithmetic, to the generic operation of the evaluator."""
+
+    def __init__(self) -> None:
+        self._specialized: Dict[str, int] = {_INTEGER: 0, _STRING: 0, _BOOLEAN: 0}
+        self._dynamic = 0
+
+        self._scopes: List[Dict[str, _Variable]] = []
+        self._identifiers: Dict[ast.Identifier, _Variable] = {}
+        self._parameters: Dict[ast.Function, List[_Variable]] = {}
+        self._declarations: List[Tuple[_Variable, Optional[ast.Expression]]] = []
+        self._calls: List[Tuple[_Variable, List[ast.Expression]]] = []
+        self._values: Dict[_Variable, List[ast.Function]] = {}
+        self._operations: List[ast.Expression] = []
+
+    @property
+    def statistics(self) -> InferenceStatistics:
+        return InferenceStatistics(self._specialized[_INTEGER],
+                                   self._specialized[_STRING],
+                                   self._specialized[_BOOLEAN],
+                                   self._dynamic)
+
+    def specialize(self, program: ast.Program) -> ast.Program:
+        """Specializes, in place, the Infix and Prefix nodes of `program`
+        whose operands have a known kind, and returns it. Bodies deferred by
+        a lazy parser are left as they are."""
+        self._collect(program)
+        self._infer()
+
+        for node in self._operations:
+            self._specialize(node)
+
+        self._identifiers.clear()
+        self._parameters.clear()
+        self._declarations.clear()
+        self._calls.clear()
+        self._values.clear()
+        self._operations.clear()
+
+        return program
+
+    def _collect(self, node: Optional[ast.ASTNode]) -> None:
+        node_type = type(node)
+
+        if node_type is ast.Program:
+            self._enter_scope(node, [])
+            for child in children(node):
+                self._collect(child)
+            self._scopes.pop()
+            return
+
+        elif node_type is ast.Function:
+            function = cast(ast.Function, node)
+            parameters = [parameter.value for parameter in function.parameters]
+            scope = self._enter_scope(function.body, parameters)
+            self._parameters[function] = [scope[name] for name in parameters]
+            self._collect(function.body)
+            self._scopes.pop()
+            return
+
+        elif node_type is ast.LetStatement or node_type is ast.AssignmentStatement:
+            # Assignments bind new values to variables like declarations do.
+            statement = cast(ast.LetStatement, node)
+            name = statement.name
+            value = statement.value
+            assert name is not None
+            variable = self._lookup(name)
+            if variable is not None:
+                self._declarations.append((variable, value))
+                if type(value) is ast.Function:
+                    self._values.setdefault(variable, []).append(cast(ast.Function, value))
+            self._collect(value)
+            return
+
+        elif node_type is ast.Identifier:
+            identifier = cast(ast.Identifier, node)
+            variable = self._lookup(identifier)
+            if variable is not None:
+                self._identifiers[identifier] = variable
+
+        elif node_type is ast.Call:
+            call = cast(ast.Call, node)
+            if type(call.function) is ast.Identifier:
+                variable = self._lookup(cast(ast.Identifier, call.function))
+                if variable is not None:
+                    self._calls.append((variable, call.arguments or []))
+
+        elif node_type is ast.Infix or node_type is ast.Prefix:
+            self._operations.append(cast(ast.Expression, node))
+
+        for child in children(node):
+            self._collect(child)
+
+    def _enter_scope(self, body: Optional[ast.ASTNode], parameters: List[str]) -> Dict[str, _Variable]:
+        names: Scope = {name: index for index, name in enumerate(parameters)}
+        _declare_variables(body, names)
+
+        scope = {name: _Variable() for name in names}
+        self._scopes.append(scope)
+
+        return scope
+
+    def _lookup(self, identifier: ast.Identifier) -> Optional[_Variable]:
+        for scope in reversed(self._scopes):
+            variable = scope.get(identifier.value)
+            if variable is not None:
+                return variable
+
+        # A builtin, or a name of the environment the program runs in.
+        return None
+
+    def _infer(self) -> None:
+        for _ in range(_ROUNDS):
+            hints: Dict[_Variable, Set[str]] = {}
+
+            def hint(node: Optional[ast.ASTNode], kind: Optional[str]) -> None:
+                variable = (self._identifiers.get(cast(ast.Identifier, node))
+                            if type(node) is ast.Identifier else None)
+                if variable is not None and kind is not None:
+                    hints.setdefault(variable, set()).add(kind)
+
+            for variable, value in self._declarations:
+                kind = self._kind(value)
+                if kind is not None:
+                    hints.setdefault(variable, set()).add(kind)
+
+            for variable, arguments in self._calls:
+                for function in self._values.get(variable, []):
+                    parameters = self._parameters.get(function, [])
+                    if len(parameters) == len(arguments):
+                        for parameter, argument in zip(parameters, arguments):
+                            kind = self._kind(argument)
+                            if kind is not None:
+                                hints.setdefault(parameter, set()).add(kind)
+
+            for node in self._operations:
+                if type(node) is ast.Prefix:
+                    prefix = cast(ast.Prefix, node)
+                    if prefix.operator == '-':
+                        hint(prefix.right, _INTEGER)
+                    continue
+
+                infix = cast(ast.Infix, node)
+                if infix.operator in _ARITHMETIC_OPERATORS:
+                    hint(infix.left, _INTEGER)
+                    hint(infix.right, _INTEGER)
+                elif infix.operator in _EQUALITY_OPERATORS:
+                    hint(infix.left, self._kind(infix.right))
+                    hint(infix.right, self._kind(infix.left))
+                else:
+                    # `+` and the order operators take integers or strings.
+                    hint(infix.left, _ordered(self._kind(infix.right)))
+                    hint(infix.right, _ordered(self._kind(infix.left)))
+
+            changed = False
+            for variable in set(self._identifiers.values()) | set(hints):
+                kinds = hints.get(variable, set())
+                # Conflicting uses leave the variable dynamic.
+                kind = next(iter(kinds)) if len(kinds) == 1 else None
+                if kind != variable.kind:
+                    variable.kind = kind
+                    changed = True
+
+            if not changed:
+                return
+
+    def _kind(self, node: Optional[ast.ASTNode]) -> Optional[str]:
+        node_type = type(node)
+
+        if node_type is ast.Integer:
+            return _INTEGER
+        elif node_type is ast.StringLiteral:
+            return _STRING
+        elif node_type is ast.Boolean:
+            return _BOOLEAN
+        elif node_type is ast.Identifier:
+            variable = self._identifiers.get(cast(ast.Identifier, node))
+            return variable.kind if variable is not None else None
+        elif node_type is ast.Prefix:
+            return _INTEGER if cast(ast.Prefix, node).operator == '-' else _BOOLEAN
+        elif node_type is ast.Infix:
+            infix = cast(ast.Infix, node)
+            if infix.operator in _ARITHMETIC_OPERATORS:
+                return _INTEGER
+            elif infix.operator == '+':
+                return (_ordered(self._kind(infix.left))
+                        or _ordered(self._kind(infix.right)))
+
+            return _BOOLEAN
+        elif node_type is ast.If:
+            condition = cast(ast.If, node)
+            if condition.alternative is None:
+                # Without a sino, the si may be nulo.
+                return None
+
+            consequence = self._kind(condition.consequence)
+            return consequence if consequence == self._kind(condition.alternative) else None
+        elif node_type is ast.Block:
+            statements = cast(ast.Block, node).statements
+            if statements and type(statements[-1]) is ast.ExpressionStatement:
+                return self._kind(cast(ast.ExpressionStatement, statements[-1]).expression)
+
+        # Calls, procedimientos, and blocks that end in a statement.
+        return None
+
+    def _specialize(self, node: ast.Expression) -> None:
+        operation: Any = None
+        if type(node) is ast.Infix:
+            infix = cast(ast.Infix, node)
+            kind = self._kind(infix.left)
+            if kind is not None and kind == self._kind(infix.right):
+                operation = _INFIX_OPERATIONS.get((kind, infix.operator))
+            infix.specialization = operation
+        else:
+            prefix = cast(ast.Prefix, node)
+            kind = self._kind(prefix.right)
+            if kind is not None:
+                operation = _PREFIX_OPERATIONS.get((kind, prefix.operator))
+            prefix.specialization = operation
+
+        if operation is not None:
+            assert kind is not None
+            self._specialized[kind] += 1
+        else:
+            self._dynamic += 1
+
+
+def _ordered(kind: Optional[str]) -> Optional[str]:
+    return kind if kind == _INTEGER or kind == _STRING else None
+
+
+def specialize(program: ast.Program) -> ast.Program:
+    """Specializes, in place, the operators of `program` for the kinds
+    inferred for their operands."""
+    return TypeInference().specialize(program)
@@ -1,160 +1,246 @@
-from re import match
+from codecs import getincrementaldecoder
+from mmap import (
+    ACCESS_READ,
+    mmap
+)
+from re import (
+    compile,
+    DOTALL,
+    Pattern,
+    VERBOSE
+)
+from itertools import chain
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    TextIO
+)
+
 from lpp.token import (
-    lookup_token_type,
+    lookup_symbol,
     Token,
+    TokenBuffer,
     TokenType
 )
 
+
+_LETTERS = 'a-záéíóúA-ZÁÉÍÓÚñÑ_'
+
+# A single master pattern classifies the next token. Whitespace, identifier,
+# number and string runs are consumed in one step, and the outer group only
+# fails to match at the end of the source. Unterminated strings run until the
+# end of the source.
+_TOKEN_PATTERN: Pattern = compile(rf'''
+    \s*
+    (?:
+        (?P<identifier>[{_LETTERS}][{_LETTERS}\d]*)
+      | (?P<number>\d+)
+      | (?P<two_characters>[=!<>]=)
+      | "(?P<double_quoted>[^"]*)"?
+      | '(?P<single_quoted>[^']*)'?
+      | (?P<character>.)
+    )?
+''', DOTALL | VERBOSE)
+
+_SINGLE_CHARACTER_TOKENS: Dict[str, TokenType] = {
+    '=': TokenType.ASSIGN,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '/': TokenType.DIVISION,
+    '*': TokenType.MULTIPLICATION,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    ',': TokenType.COMMA,
+    ';': TokenType.SEMICOLON,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '!': TokenType.NOT,
+}
+
+_TWO_CHARACTER_TOKENS: Dict[str, TokenType] = {
+    '==': TokenType.EQ,
+    '!=': TokenType.NOT_EQ,
+    '<=': TokenType.LT_OR_EQ,
+    '>=': TokenType.GT_OR_EQ,
+}
+
+# Token type codes used by Lexer.tokenize. Operators are looked up by literal,
+# falling back to the code of the pattern group, and identifiers go through
+# the symbol table.
+_LITERAL_CODES: Dict[str, int] = {
+    literal: token_type.value
+    for literal, token_type in chain(_SINGLE_CHARACTER_TOKENS.items(),
+                                     _TWO_CHARACTER_TOKENS.items())
+}
+
+_TYPE_CODES: Dict[TokenType, int] = {
+    token_type: token_type.value for token_type in TokenType
+}
+
+_GROUP_CODES: List[int] = [TokenType.ILLEGAL.value] * (_TOKEN_PATTERN.groups + 1)
+for _name, _token_type in [('identifier', TokenType.IDENT),
+                           ('number', TokenType.INT),
+                           ('double_quoted', TokenType.STRING),
+                           ('single_quoted', TokenType.STRING)]:
+    _GROUP_CODES[_TOKEN_PATTERN.groupindex[_name]] = _token_type.value
+
+_LOOKUP_GROUPS: FrozenSet[int] = frozenset(
+    _TOKEN_PATTERN.groupindex[name]
+    for name in ['two_characters', 'character']
+)
+
+_IDENTIFIER_GROUP: int = _TOKEN_PATTERN.groupindex['identifier']
+
+# Operator and delimiter tokens are shared instead of built for every match.
+_OPERATOR_TOKENS: Dict[str, Token] = {
+    literal: Token(token_type, literal)
+    for literal, token_type in chain(_SINGLE_CHARACTER_TOKENS.items(),
+                                     _TWO_CHARACTER_TOKENS.items())
+}
+
+_EOF_TOKEN = Token(TokenType.EOF, '')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _read_stream(stream: TextIO, chunk_size: int) -> Iterator[str]:
+    while chunk := stream.read(chunk_size):
+        yield chunk
+
+
+def _read_mapped_file(path: str, chunk_size: int) -> Iterator[str]:
+    decoder = getincrementaldecoder('utf-8')()
+
+    with open(path, 'rb') as file:
+        try:
+            mapped_file = mmap(file.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            # Empty files can not be mapped.
+            return
+
+        with mapped_file:
+            for offset in range(0, len(mapped_file), chunk_size):
+                if chunk := decoder.decode(mapped_file[offset : offset + chunk_size]):
+                    yield chunk
+
+    if chunk := decoder.decode(b'', final=True):
+        yield chunk
+
+
 class Lexer:
 
     def __init__(self, source: str) -> None:
         self._source: str = source
-        self._character: str = ''
-        self._read_position: int = 0
         self._position: int = 0
+        self._chunks: Optional[Iterator[str]] = None
+        # Characters of a streamed source already dropped from the buffer.
+        self._consumed: int = 0
+        # Source offset of the last token returned by next_token.
+        self.token_offset: int = 0
+
+    @classmethod
+    def from_stream(cls, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> 'Lexer':
+        """Lexes a text stream reading `chunk_size` characters at a time."""
+        lexer = cls('')
+        lexer._chunks = _read_stream(stream, chunk_size)
+
+        return lexer
+
+    @classmethod
+    def from_file(cls, path: str, chunk_size: int = CHUNK_SIZE) -> 'Lexer':
+        """Lexes a memory-mapped UTF-8 file decoding `chunk_size` bytes at a
+        time."""
+        lexer = cls('')
+        lexer._chunks = _read_mapped_file(path, chunk_size)
 
-        self._read_character()
+        return lexer
 
-    
     def next_token(self) -> Token:
-        self._skip_whitespace()
+        match = _TOKEN_PATTERN.match(self._source, self._position)
+        assert match is not None
 
-        if match(r'^=$', self._character):
-            if self._peek_character() == '=':
-                token = self._make_two_character_token(TokenType.EQ)
-            else:
-                token = Token(TokenType.ASSIGN, self._character)
-        
-        elif match(r'^\+$', self._character):
-            token = Token(TokenType.PLUS, self._character)
-        
-        elif match(r'^\-$', self._character):
-            token = Token(TokenType.MINUS, self._character)
-        
-        elif match(r'^/$', self._character):
-            token = Token(TokenType.DIVISION, self._character)
-        
-        elif match(r'^\*$', self._character):
-            token = Token(TokenType.MULTIPLICATION, self._character)
-        
-        elif match(r'^$', self._character):
-            token = Token(TokenType.EOF, self._character)
-        
-        elif match(r'^\($', self._character):
-            token = Token(TokenType.LPAREN, self._character)
-        
-        elif match(r'^\)$', self._character):
-            token = Token(TokenType.RPAREN, self._character)
-        
-        elif match(r'^{$', self._character):
-            token = Token(TokenType.LBRACE, self._character)
-        
-        elif match(r'^}$', self._character):
-            token = Token(TokenType.RBRACE, self._character)
-        
-        elif match(r'^,$', self._character):
-            token = Token(TokenType.COMMA, self._character)
-        
-        elif match(r'^;$', self._character):
-            token = Token(TokenType.SEMICOLON, self._character)
-        
-        elif match(r'^<$', self._character):
-            if self._peek_character() == '=':
-                token = self._make_two_character_token(TokenType.LT_OR_EQ)
-            else:
-                token = Token(TokenType.LT, self._character)
-        
-        elif match(r'^>$', self._character):
-            if self._peek_character() == '=':
-                token = self._make_two_character_token(TokenType.GT_OR_EQ)
-            else:
-                token = Token(TokenType.GT, self._character)
-        
-        elif match(r'^!$', self._character):
-            if self._peek_character() == '=':
-                token = self._make_two_character_token(TokenType.NOT_EQ)
+        # A token reaching the end of the buffer may continue in the next chunk.
+        while match.end() >= len(self._source) and self._chunks is not None:
+            self._read_chunk()
+            match = _TOKEN_PATTERN.match(self._source, self._position)
+            assert match is not None
+
+        kind = match.lastgroup
+        self._position = match.end()
+
+        if kind is None:
+            self.token_offset = self._consumed + self._position
+            return _EOF_TOKEN
+
+        self.token_offset = self._consumed + match.start(kind)
+
+        if kind == 'identifier':
+            return Token(*lookup_symbol(match.group(kind)))
+
+        elif kind == 'number':
+            return Token(TokenType.INT, match.group(kind))
+
+        elif kind == 'character' or kind == 'two_characters':
+            literal = match.group(kind)
+            return _OPERATOR_TOKENS.get(literal) or Token(TokenType.ILLEGAL, literal)
+
+        return Token(TokenType.STRING, match.group(kind))
+
+    def tokenize(self) -> TokenBuffer:
+        """Lexes the rest of the source at once into a TokenBuffer ending with
+        an EOF token. Literals are sliced from the source, so a streaming
+        lexer reads its remaining chunks in first."""
+        if self._chunks is not None:
+            self._consumed += self._position
+            self._source = self._source[self._position:] + ''.join(self._chunks)
+            self._position = 0
+            self._chunks = None
+
+        source = self._source
+        buffer = TokenBuffer(source)
+        types_append = buffer.types.append
+        starts_append = buffer.starts.append
+        ends_append = buffer.ends.append
+
+        for match in _TOKEN_PATTERN.finditer(source, self._position):
+            group = match.lastindex
+            if group is None:
+                break
+
+            start, end = match.span(group)
+
+            if group == _IDENTIFIER_GROUP:
+                code = _TYPE_CODES[lookup_symbol(source[start:end])[0]]
+            elif group in _LOOKUP_GROUPS:
+                code = _LITERAL_CODES.get(source[start:end], _GROUP_CODES[group])
             else:
-                token = Token(TokenType.NOT, self._character)
-        
-        elif self._is_letter(self._character):
-            literal = self._read_identifier()
-            token_type = lookup_token_type(literal)
-
-            return Token(token_type, literal)
-        
-        elif self._is_number(self._character):
-            literal = self._read_number()
-            return Token(TokenType.INT, literal)
-        
-        elif match(r"^\"|'$", self._character):
-            literal = self._read_string()
-            return Token(TokenType.STRING, literal)
-        
-        else:
-            token = Token(TokenType.ILLEGAL, self._character)
-        
-        self._read_character()
-
-        return token
-    
-    def _is_letter(self, character: str) -> bool:
-        return bool(match(r'^[a-záéíóúA-ZÁÉÍÓÚñÑ_]$', character))
-
-    def _is_number(self, character: str) -> bool:
-        return bool(match(r'^\d$', character))
-    
-    def _make_two_character_token(self, token_type: TokenType) -> Token:
-        prefix = self._character
-        self._read_character()
-        suffix = self._character
-
-        return Token(token_type, f'{prefix}{suffix}')
-    
-    def _read_character(self) -> None:
-        if self._read_position >= len(self._source):
-            self._character = ''
-        else:
-            self._character = self._source[self._read_position]
-        
-        self._position = self._read_position
-        self._read_position += 1
-
-    def _read_identifier(self) -> str:
-        initial_position = self._position
-
-        while self._is_letter(self._character) or self._is_number(self._character):
-            self._read_character()
-        
-        return self._source[initial_position : self._position]
-    
-    def _read_number(self) -> str:
-        initial_position = self._position
-
-        while self._is_number(self._character):
-            self._read_character()
-        
-        return self._source[initial_position : self._position]
-    
-    def _peek_character(self) -> str:
-        if self._read_position >= len(self._source):
-            return ''
-        
-        return self._source[self._read_position]
-    
-    def _skip_whitespace(self) -> None:
-        while match(r'^\s$', self._character):
-            self._read_character()
-    
-    def _read_string(self) -> str:
-        initial_character = self._character
-        self._read_character()
-        initial_position = self._position
-
-        while self._character != initial_character and self._read_position <= len(self._source):
-            self._read_character()
-        
-        string = self._source[initial_position : self._position]
-
-        self._read_character()
-
-        return string
+                code = _GROUP_CODES[group]
+
+            types_append(code)
+            starts_append(start)
+            ends_append(end)
+
+        self._position = len(source)
+        buffer.append(TokenType.EOF, self._position, self._position)
+
+        return buffer
+
+    def _read_chunk(self) -> None:
+        assert self._chunks is not None
+
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._chunks = None
+            return
+
+        # Only the unconsumed tail of the buffer is kept, so memory stays
+        # bounded by the chunk size and the longest token.
+        self._consumed += self._position
+        self._source = self._source[self._position:] + chunk
+        self._position = 0
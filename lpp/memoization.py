@@ -0,0 +1,272 @@
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast
+)
+from weakref import WeakSet
+
+import lpp.ast as ast
+# The evaluator imports this module, so its names are looked up when a call
+# runs instead of at import time.
+import lpp.evaluator as evaluator
+from lpp.builtins import (
+    BUILTINS,
+    PURE_BUILTINS
+)
+from lpp.object import (
+    Boolean,
+    Function,
+    Integer,
+    Null,
+    Object,
+    String
+)
+from lpp.resolver import children
+
+
+# Results kept per procedimiento; past it, the least recently used go first.
+SIZE = 1024
+
+# Arguments compared by value, and results that can be shared: a cached
+# Error or procedimiento would be the same object on every call, which
+# `==` tells apart.
+_KEYED_ARGUMENTS = frozenset([Boolean, Integer, String])
+_CACHED_RESULTS = frozenset([Boolean, Integer, Null, String])
+
+
+class Memo:
+    """The results of a pure procedimiento by the values of its arguments,
+    valid while the top-level names it depends on keep their values."""
+    __slots__ = ('dependencies', 'values', 'results', 'hits', 'misses', 'evictions',
+                 'invalidations')
+
+    def __init__(self, dependencies: Tuple[str, ...]) -> None:
+        self.dependencies = dependencies
+        self.values: Optional[List[Optional[Object]]] = None
+        self.results: 'OrderedDict[Tuple[Any, ...], Object]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+
+class MemoStatistics(NamedTuple):
+    procedimiento: str
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+
+def _declarations(node: Optional[ast.ASTNode],
+                  declarations: Dict[str, List[Optional[ast.Expression]]]) -> None:
+    """Collects the values declared or assigned to the variables in `node`,
+    in loops too, skipping nested procedimientos, which have scopes of their
+    own."""
+    for child in children(node):
+        if type(child) is ast.LetStatement or type(child) is ast.AssignmentStatement:
+            statement = cast(ast.LetStatement, child)
+            if statement.name is not None:
+                declarations.setdefault(statement.name.value, []).append(statement.value)
+
+        if type(child) is not ast.Function:
+            _declarations(child, declarations)
+
+
+def _is_constant(node: Optional[ast.ASTNode]) -> bool:
+    node_type = type(node)
+    if node_type is ast.Identifier or node_type is ast.Call or node_type is ast.Function:
+        return False
+
+    return all(_is_constant(child) for child in children(node))
+
+
+def _assigns_locally(function: ast.Function, bound: Set[str]) -> bool:
+    """Whether every assignment in `function` rebinds one of its parameters,
+    one of its variables already declared, or one of `bound`, the variables
+    of the procedimientos around it declared before it was built. A name not
+    declared yet refers to an outer variable, so only the statements of the
+    body that always run before the assignment count."""
+    names = bound | {parameter.value for parameter in function.parameters}
+
+    body = cast(ast.Block, function.body)
+    assert body is not None
+    for statement in body.statements:
+        if not _assigns_only(statement, names):
+            return False
+
+        if type(statement) is ast.LetStatement:
+            name = cast(ast.LetStatement, statement).name
+            if name is not None:
+                names = names | {name.value}
+
+    return True
+
+
+def _assigns_only(node: Optional[ast.ASTNode], names: Set[str]) -> bool:
+    if type(node) is ast.AssignmentStatement:
+        name = cast(ast.AssignmentStatement, node).name
+        if name is None or name.value not in names:
+            return False
+    elif type(node) is ast.Function:
+        return _assigns_locally(cast(ast.Function, node), names)
+
+    return all(_assigns_only(child, names) for child in children(node))
+
+
+def _reads(node: Optional[ast.ASTNode], names: Set[str]) -> bool:
+    """Adds the names used in `node` to `names`. False if a procedimiento in
+    it has a body deferred by a lazy parser, which can't be analyzed."""
+    for child in children(node):
+        if type(child) is ast.Identifier:
+            names.add(cast(ast.Identifier, child).value)
+        elif type(child) is ast.DeferredBlock or not _reads(child, names):
+            return False
+
+    return True
+
+
+def mark_pure(program: ast.Program) -> int:
+    """Marks the procedimientos declared at the top level of `program` whose
+    results depend only on their arguments and on top-level names holding
+    constants or pure procedimientos, and that assign no outer variable and
+    call no impure builtin. The evaluator memoizes the calls to them.
+    Returns how many were marked."""
+    declarations: Dict[str, List[Optional[ast.Expression]]] = {}
+    _declarations(program, declarations)
+
+    # The names each procedimiento declared at the top level uses, other than
+    # its parameters, which always shadow the top-level ones.
+    reads: Dict[ast.Function, Set[str]] = {}
+    pure_names: Set[str] = set()
+    for name, values in declarations.items():
+        analyzed = True
+        for value in values:
+            if type(value) is ast.Function:
+                function = cast(ast.Function, value)
+                names: Set[str] = set()
+                # Procedimientos that assign outer variables change more than
+                # their result.
+                if not _reads(function, names) or not _assigns_locally(function, set()):
+                    analyzed = False
+                    continue
+
+                reads[function] = names - {parameter.value for parameter in function.parameters}
+            elif not _is_constant(value):
+                analyzed = False
+
+        if analyzed:
+            pure_names.add(name)
+
+    def is_pure(names: Set[str]) -> bool:
+        return all((name in pure_names if name in declarations
+                    else name not in BUILTINS or name in PURE_BUILTINS)
+                   for name in names)
+
+    # The names whose procedimientos use impure ones are impure too.
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure_names):
+            if not all(is_pure(reads[cast(ast.Function, value)])
+                       for value in declarations[name] if type(value) is ast.Function):
+                pure_names.remove(name)
+                changed = True
+
+    marked = 0
+    for function, names in reads.items():
+        function.dependencies = None
+        if not is_pure(names):
+            continue
+
+        # The top-level names its results depend on, through the
+        # procedimientos it uses too.
+        dependencies: Set[str] = set()
+        pending = [name for name in names if name in declarations]
+        while pending:
+            name = pending.pop()
+            if name not in dependencies:
+                dependencies.add(name)
+                for value in declarations[name]:
+                    if type(value) is ast.Function:
+                        pending.extend(used for used in reads[cast(ast.Function, value)]
+                                       if used in declarations)
+
+        function.dependencies = tuple(sorted(dependencies))
+        marked += 1
+
+    return marked
+
+
+_memoized: 'WeakSet[Function]' = WeakSet()
+
+
+def attach(fn: Function, dependencies: Tuple[str, ...]) -> None:
+    """Memoizes the calls to `fn`, a procedimiento marked by mark_pure."""
+    fn.memo = Memo(dependencies)
+    _memoized.add(fn)
+
+
+def call(fn: Function, args: List[Object]) -> Object:
+    """Applies `fn` to `args`, with the result of an earlier call to the
+    same arguments if there is one."""
+    memo: Memo = fn.memo
+
+    # A top-level name bound again may change every result.
+    values = [fn.env.get(name) for name in memo.dependencies]
+    if values != memo.values:
+        if memo.results:
+            memo.results.clear()
+            memo.invalidations += 1
+        memo.values = values
+
+    key: List[Any] = []
+    for arg in args:
+        if type(arg) not in _KEYED_ARGUMENTS:
+            return evaluator._apply_function(fn, args, False)
+
+        key.append(type(arg))
+        key.append(cast(Union[Boolean, Integer, String], arg).value)
+
+    results = memo.results
+    cached_key = tuple(key)
+    value = results.get(cached_key)
+    if value is not None:
+        results.move_to_end(cached_key)
+        memo.hits += 1
+        return value
+
+    memo.misses += 1
+    value = evaluator._apply_function(fn, args, False)
+    if type(value) in _CACHED_RESULTS:
+        results[cached_key] = value
+        if len(results) > SIZE:
+            results.popitem(last=False)
+            memo.evictions += 1
+
+    return value
+
+
+def statistics() -> List[MemoStatistics]:
+    """Memoization statistics of the live memoized procedimientos."""
+    result: List[MemoStatistics] = []
+
+    for fn in _memoized:
+        memo: Memo = fn.memo
+        parameters = ', '.join(str(parameter) for parameter in fn.parameters)
+        result.append(MemoStatistics(f'procedimiento({parameters}) en {fn.body.offset}',
+                                     memo.hits,
+                                     memo.misses,
+                                     memo.evictions,
+                                     memo.invalidations,
+                                     len(memo.results)))
+
+    return sorted(result, key=lambda statistics: -(statistics.hits + statistics.misses))
@@ -2,17 +2,24 @@ from abc import (
     ABC,
     abstractmethod
 )
+from collections.abc import MutableMapping
 from enum import (
     auto,
     Enum
 )
+from itertools import count
 from typing import (
+    Any,
     Dict,
-    List
+    Iterator,
+    List,
+    Optional,
+    Union
 )
 from typing_extensions import Protocol
 from lpp.ast import (
     Block,
+    DeferredBlock,
     Identifier
 )
 
@@ -29,6 +36,7 @@ class ObjectType(Enum):
 
 
 class Object(ABC):
+    __slots__ = ()
     
     @abstractmethod
     def type(self) -> ObjectType:
@@ -40,6 +48,7 @@ class Object(ABC):
 
 
 class Integer(Object):
+    __slots__ = ('value',)
     
     def __init__(self, value: int) -> None:
         self.value = value
@@ -51,7 +60,38 @@ class Integer(Object):
         return str(self.value)
 
 
+# Integers in this range are preallocated and shared, like the TRUE, FALSE
+# and NULL singletons of the evaluator, so the results that fall in it
+# allocate nothing. Runtime objects are never mutated, so sharing is safe.
+SMALL_INTEGERS_MINIMUM = -5
+SMALL_INTEGERS_MAXIMUM = 1024
+
+_small_integers: List[Integer] = []
+
+
+def cache_small_integers(minimum: int, maximum: int) -> None:
+    """Preallocates the Integers from `minimum` to `maximum`, both included,
+    replacing the ones cached so far."""
+    global SMALL_INTEGERS_MINIMUM, SMALL_INTEGERS_MAXIMUM, _small_integers
+
+    SMALL_INTEGERS_MINIMUM = minimum
+    SMALL_INTEGERS_MAXIMUM = maximum
+    _small_integers = [Integer(value) for value in range(minimum, maximum + 1)]
+
+
+def new_integer(value: int) -> Integer:
+    """The Integer for `value`, shared if it is in the cached range."""
+    if SMALL_INTEGERS_MINIMUM <= value <= SMALL_INTEGERS_MAXIMUM:
+        return _small_integers[value - SMALL_INTEGERS_MINIMUM]
+
+    return Integer(value)
+
+
+cache_small_integers(SMALL_INTEGERS_MINIMUM, SMALL_INTEGERS_MAXIMUM)
+
+
 class Boolean(Object):
+    __slots__ = ('value',)
     
     def __init__(self, value: bool) -> None:
         self.value = value
@@ -64,6 +104,7 @@ class Boolean(Object):
 
 
 class Null(Object):
+    __slots__ = ()
     
     def type(self) -> ObjectType:
         return ObjectType.NULL
@@ -73,6 +114,7 @@ class Null(Object):
 
 
 class Return(Object):
+    __slots__ = ('value',)
 
     def __init__(self, value: Object) -> None:
         self.value = value
@@ -85,6 +127,7 @@ class Return(Object):
 
 
 class Error(Object):
+    __slots__ = ('message',)
 
     def __init__(self, message: str) -> None:
         self.message = message
@@ -96,37 +139,137 @@ class Error(Object):
         return f'Error: {self.message}'
 
 
-class Environment(Dict):
-    
-    def __init__(self, outer = None):
-        self._store = dict()
-        self._outer = outer
-    
+# The value of a slot whose variable was not declared yet.
+UNSET: Any = object()
+
+# The slots of the scopes that have none, shared.
+_NO_SLOTS: List[Any] = []
+
+# The versions of the scopes, never repeated.
+_VERSIONS = count()
+
+
+class Environment(MutableMapping):
+    """A scope of names. The frames of resolved procedimientos keep their
+    parameters, in order, and their variables in fixed slots, addressed by
+    the resolved identifiers; any other name goes to a dict created on the
+    first such binding. Lookups fall back to the outer scopes, while
+    iterating covers only the names bound in this one. `version` changes
+    whenever a name is bound or unbound in the dict, to one no scope had
+    before, so it also tells this scope from any other."""
+    __slots__ = ('outer', 'scope', 'slots', 'version', '_store')
+
+    def __init__(self,
+                 outer: Optional['Environment'] = None,
+                 scope: Optional[Dict[str, int]] = None,
+                 slots: Optional[List[Any]] = None) -> None:
+        self.outer = outer
+        self.scope = scope
+        if slots is None:
+            slots = [UNSET] * len(scope) if scope else _NO_SLOTS
+        self.slots: List[Any] = slots
+        self.version = next(_VERSIONS)
+        self._store: Optional[Dict[str, Any]] = None
+
     def __getitem__(self, key):
-        try:
-            return self._store[key]
-        except KeyError as e:
-            if self._outer is not None:
-                return self._outer[key]
-
-            raise e
-     
+        # Keys are interned symbols from the parser, so each scope costs one
+        # or two dict probes, and the chain is walked without raising at
+        # every level.
+        env = self
+        while env is not None:
+            scope = env.scope
+            if scope is not None:
+                slot = scope.get(key)
+                if slot is not None and env.slots[slot] is not UNSET:
+                    return env.slots[slot]
+
+            store = env._store
+            if store is not None:
+                value = store.get(key, UNSET)
+                if value is not UNSET:
+                    return value
+
+            env = env.outer
+
+        raise KeyError(key)
+
     def __setitem__(self, key, value):
+        if self.scope is not None:
+            slot = self.scope.get(key)
+            if slot is not None:
+                self.slots[slot] = value
+                return
+
+        if self._store is None:
+            self._store = {}
         self._store[key] = value
-    
+        self.version = next(_VERSIONS)
+
+    def assign(self, key: str, value: Any) -> bool:
+        """Binds `key` to `value` in the scope it is looked up from, the
+        nearest one where it is bound. False if no scope binds it."""
+        env: Optional[Environment] = self
+        while env is not None:
+            scope = env.scope
+            if scope is not None:
+                slot = scope.get(key)
+                if slot is not None and env.slots[slot] is not UNSET:
+                    env.slots[slot] = value
+                    return True
+
+            store = env._store
+            if store is not None and key in store:
+                store[key] = value
+                env.version = next(_VERSIONS)
+                return True
+
+            env = env.outer
+
+        return False
+
     def __delitem__(self, key):
+        if self.scope is not None:
+            slot = self.scope.get(key)
+            if slot is not None and self.slots[slot] is not UNSET:
+                self.slots[slot] = UNSET
+                return
+
+        if self._store is None:
+            raise KeyError(key)
         del self._store[key]
+        self.version = next(_VERSIONS)
+
+    def __iter__(self) -> Iterator[str]:
+        if self.scope is not None:
+            for name, slot in self.scope.items():
+                if self.slots[slot] is not UNSET:
+                    yield name
+
+        if self._store is not None:
+            yield from self._store
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
 
 class Function(Object):
     
     def __init__(self,
                  parameters: List[Identifier],
-                 body: Block,
-                 env: Environment) -> None:
+                 body: Union[Block, DeferredBlock],
+                 env: Environment,
+                 scope: Optional[Dict[str, int]] = None) -> None:
         self.parameters = parameters
         self.body = body
         self.env = env
+        # The slots of the frames of the procedimiento, from lpp.resolver.
+        self.scope = scope
+        # Invocations so far, and the lpp.tiering.Tier of the function once
+        # it got hot enough to be considered for promotion.
+        self.calls: int = 0
+        self.tier: Any = None
+        # The lpp.memoization.Memo of a memoized procedimiento.
+        self.memo: Any = None
     
     def type(self) -> ObjectType:
         return ObjectType.FUNCTION
@@ -137,6 +280,7 @@ class Function(Object):
 
 
 class String(Object):
+    __slots__ = ('value',)
 
     def __init__(self, value: str) -> None:
         self.value = value
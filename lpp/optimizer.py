@@ -0,0 +1,324 @@
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Type
+)
+
+import lpp.ast as ast
+# Folding runs the operators of the evaluator on the constants, so folded
+# values are exactly the ones the program would compute.
+from lpp.evaluator import (
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    FALSE,
+    TRUE
+)
+from lpp.object import (
+    Boolean,
+    Error,
+    Integer,
+    new_integer,
+    Object,
+    String
+)
+from lpp.token import (
+    Token,
+    TokenType
+)
+
+
+_ARITHMETIC_OPERATORS = frozenset(['+', '-', '*', '/'])
+
+_COMPARISON_OPERATORS = frozenset(['<', '<=', '>', '>=', '==', '!='])
+
+# Operands that leave the other one unchanged, by operator and side.
+_LEFT_IDENTITIES: Dict[str, int] = {
+    '+': 0,
+    '*': 1,
+}
+
+_RIGHT_IDENTITIES: Dict[str, int] = {
+    '+': 0,
+    '-': 0,
+    '*': 1,
+    '/': 1,
+}
+
+
+class OptimizerStatistics(NamedTuple):
+    folded: int         # operations replaced by their constant value
+    simplified: int     # algebraic identities removed
+    pruned: int         # si branches and mientras bodies removed because of a constant condition
+    unreachable: int    # statements removed after a regresa
+
+
+class Optimizer:
+    """Rewrites programs before they run. Every transform keeps the values
+    and errors of the program: operations that fail at runtime, like a
+    division by zero or a type mismatch, are left in place."""
+
+    def __init__(self,
+                 fold_constants: bool = True,
+                 simplify_algebra: bool = True,
+                 prune_branches: bool = True,
+                 remove_unreachable: bool = True) -> None:
+        self._fold_constants = fold_constants
+        self._simplify_algebra = simplify_algebra
+        self._prune_branches = prune_branches
+        self._remove_unreachable = remove_unreachable
+
+        self._folded = 0
+        self._simplified = 0
+        self._pruned = 0
+        self._unreachable = 0
+
+        self._optimize_fns: Dict[Type[ast.ASTNode], Callable[[Any], ast.ASTNode]] = {
+            ast.AssignmentStatement: self._optimize_assignment_statement,
+            ast.Block: self._optimize_block,
+            ast.Call: self._optimize_call,
+            ast.ExpressionStatement: self._optimize_expression_statement,
+            ast.Function: self._optimize_function,
+            ast.If: self._optimize_if,
+            ast.Infix: self._optimize_infix,
+            ast.LetStatement: self._optimize_let_statement,
+            ast.Prefix: self._optimize_prefix,
+            ast.Program: self._optimize_program,
+            ast.ReturnStatement: self._optimize_return_statement,
+            ast.While: self._optimize_while,
+        }
+
+    @property
+    def statistics(self) -> OptimizerStatistics:
+        return OptimizerStatistics(self._folded,
+                                   self._simplified,
+                                   self._pruned,
+                                   self._unreachable)
+
+    def optimize(self, program: ast.Program) -> ast.Program:
+        """Optimizes `program` in place and returns it. Bodies deferred by a
+        lazy parser are left as they are."""
+        return cast(ast.Program, self._optimize(program))
+
+    def _optimize(self, node: Any) -> Any:
+        optimize_fn = self._optimize_fns.get(type(node))
+        if optimize_fn is None:
+            # Literals, identifiers, deferred bodies, and the nodes missing
+            # from statements left incomplete by parse errors.
+            return node
+
+        return optimize_fn(node)
+
+    def _optimize_assignment_statement(self,
+                                       statement: ast.AssignmentStatement) -> ast.AssignmentStatement:
+        statement.value = self._optimize(statement.value)
+        return statement
+
+    def _optimize_block(self, block: ast.Block) -> ast.Block:
+        block.statements = self._optimize_statements(block.statements)
+
+        if self._remove_unreachable:
+            for index, statement in enumerate(block.statements):
+                if type(statement) is ast.ReturnStatement:
+                    self._unreachable += len(block.statements) - index - 1
+                    del block.statements[index + 1:]
+                    break
+
+        return block
+
+    def _optimize_call(self, call: ast.Call) -> ast.Call:
+        call.function = self._optimize(call.function)
+        if call.arguments is not None:
+            call.arguments = [self._optimize(argument) for argument in call.arguments]
+
+        return call
+
+    def _optimize_expression_statement(self,
+                                       statement: ast.ExpressionStatement) -> ast.ExpressionStatement:
+        statement.expression = self._optimize(statement.expression)
+        return statement
+
+    def _optimize_function(self, function: ast.Function) -> ast.Function:
+        function.body = self._optimize(function.body)
+        return function
+
+    def _optimize_if(self, if_expression: ast.If) -> ast.ASTNode:
+        if_expression.condition = self._optimize(if_expression.condition)
+        if_expression.consequence = self._optimize(if_expression.consequence)
+        if_expression.alternative = self._optimize(if_expression.alternative)
+
+        condition = _constant(if_expression.condition)
+        if (not self._prune_branches or condition is None
+                or if_expression.consequence is None):
+            return if_expression
+
+        # A block evaluates like the branch of a si, in the same environment.
+        if condition is not FALSE:
+            self._pruned += 1
+            return if_expression.consequence
+        elif if_expression.alternative is not None:
+            self._pruned += 1
+            return if_expression.alternative
+        elif if_expression.consequence.statements:
+            # Still evaluates to nulo, without the code that never runs.
+            self._pruned += 1
+            if_expression.consequence.statements = []
+
+        return if_expression
+
+    def _optimize_infix(self, infix: ast.Infix) -> ast.Expression:
+        infix.left = self._optimize(infix.left)
+        infix.right = self._optimize(infix.right)
+
+        left = _constant(infix.left)
+        right = _constant(infix.right)
+
+        if self._fold_constants and left is not None and right is not None:
+            folded = _fold(infix, lambda: _evaluate_infix_expression(infix.operator, left, right))
+            if folded is not None:
+                self._folded += 1
+                return folded
+
+        if self._simplify_algebra:
+            # x + 0 is x only when x is an integer; for anything else it is
+            # an error, so only operands known to be integers are simplified.
+            if (type(left) is Integer
+                    and cast(Integer, left).value == _LEFT_IDENTITIES.get(infix.operator)
+                    and _is_integer(infix.right)):
+                self._simplified += 1
+                return cast(ast.Expression, infix.right)
+            elif (type(right) is Integer
+                    and cast(Integer, right).value == _RIGHT_IDENTITIES.get(infix.operator)
+                    and _is_integer(infix.left)):
+                self._simplified += 1
+                return infix.left
+
+        return infix
+
+    def _optimize_let_statement(self, statement: ast.LetStatement) -> ast.LetStatement:
+        statement.value = self._optimize(statement.value)
+        return statement
+
+    def _optimize_prefix(self, prefix: ast.Prefix) -> ast.Expression:
+        prefix.right = self._optimize(prefix.right)
+
+        right = _constant(prefix.right)
+        if self._fold_constants and right is not None:
+            folded = _fold(prefix, lambda: _evaluate_prefix_expression(prefix.operator, right))
+            if folded is not None:
+                self._folded += 1
+                return folded
+
+        if self._simplify_algebra and type(prefix.right) is ast.Prefix:
+            inner = cast(ast.Prefix, prefix.right)
+            if (prefix.operator == inner.operator == '-' and _is_integer(inner.right)
+                    or prefix.operator == inner.operator == '!' and _is_boolean(inner.right)):
+                self._simplified += 1
+                return cast(ast.Expression, inner.right)
+
+        return prefix
+
+    def _optimize_program(self, program: ast.Program) -> ast.Program:
+        program.statements = self._optimize_statements(program.statements)
+        return program
+
+    def _optimize_return_statement(self, statement: ast.ReturnStatement) -> ast.ReturnStatement:
+        statement.return_value = self._optimize(statement.return_value)
+        return statement
+
+    def _optimize_statements(self, statements: List[ast.Statement]) -> List[ast.Statement]:
+        return [self._optimize(statement) for statement in statements]
+
+    def _optimize_while(self, statement: ast.While) -> ast.While:
+        statement.condition = self._optimize(statement.condition)
+        statement.body = self._optimize(statement.body)
+
+        condition = _constant(statement.condition)
+        if (self._prune_branches and condition is FALSE
+                and statement.body is not None and statement.body.statements):
+            # The body never runs.
+            self._pruned += 1
+            statement.body.statements = []
+
+        return statement
+
+
+def _constant(node: Optional[ast.ASTNode]) -> Optional[Object]:
+    """The value of a literal node, or None for anything else."""
+    node_type = type(node)
+
+    if node_type is ast.Integer:
+        value = cast(ast.Integer, node).value
+        assert value is not None
+        return new_integer(value)
+    elif node_type is ast.Boolean:
+        return TRUE if cast(ast.Boolean, node).value else FALSE
+    elif node_type is ast.StringLiteral:
+        return String(cast(ast.StringLiteral, node).value)
+
+    return None
+
+
+def _fold(node: ast.Expression, operation: Callable[[], Object]) -> Optional[ast.Expression]:
+    """The literal node for the value of `operation`, or None when it fails,
+    so the failure happens when the program runs."""
+    try:
+        value = operation()
+    except ArithmeticError:
+        return None
+
+    if type(value) is Error:
+        return None
+
+    return _literal(value, node.offset)
+
+
+def _is_boolean(node: Optional[ast.ASTNode]) -> bool:
+    """Whether `node` always evaluates to a Boolean."""
+    if type(node) is ast.Boolean:
+        return True
+    elif type(node) is ast.Prefix:
+        return cast(ast.Prefix, node).operator == '!'
+    elif type(node) is ast.Infix:
+        infix = cast(ast.Infix, node)
+        return (infix.operator in _COMPARISON_OPERATORS
+                and _is_integer(infix.left) and _is_integer(infix.right))
+
+    return False
+
+
+def _is_integer(node: Optional[ast.ASTNode]) -> bool:
+    """Whether `node` always evaluates to an Integer, or raises."""
+    if type(node) is ast.Integer:
+        return True
+    elif type(node) is ast.Prefix:
+        prefix = cast(ast.Prefix, node)
+        return prefix.operator == '-' and _is_integer(prefix.right)
+    elif type(node) is ast.Infix:
+        infix = cast(ast.Infix, node)
+        return (infix.operator in _ARITHMETIC_OPERATORS
+                and _is_integer(infix.left) and _is_integer(infix.right))
+
+    return False
+
+
+def _literal(value: Object, offset: int) -> ast.Expression:
+    if type(value) is Integer:
+        integer = cast(Integer, value).value
+        return ast.Integer(Token(TokenType.INT, str(integer)), integer, offset)
+    elif type(value) is Boolean:
+        if value is TRUE:
+            return ast.Boolean(Token(TokenType.TRUE, 'verdadero'), True, offset)
+        return ast.Boolean(Token(TokenType.FALSE, 'falso'), False, offset)
+
+    string = cast(String, value).value
+    return ast.StringLiteral(Token(TokenType.STRING, string), string, offset)
+
+
+def optimize(program: ast.Program) -> ast.Program:
+    """Optimizes `program` in place with every transform enabled."""
+    return Optimizer().optimize(program)
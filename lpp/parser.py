@@ -1,23 +1,46 @@
-from enum import IntEnum
+from bisect import bisect_left
+from functools import partial
+from itertools import (
+    chain,
+    repeat
+)
+from operator import attrgetter
+from re import (
+    compile,
+    escape,
+    Pattern
+)
+from enum import (
+    auto,
+    Enum,
+    IntEnum
+)
 
 from typing import (
+    Any,
     Callable,
     Dict,
     List,
-    Optional
+    Optional,
+    Tuple,
+    Union
 )
 
 from lpp.token import (
+    lookup_symbol,
     Token,
+    TokenBuffer,
     TokenType
 )
 
 from lpp.lexer import Lexer
 
 from lpp.ast import (
+    AssignmentStatement,
     Block,
     Boolean,
     Call,
+    DeferredBlock,
     Expression,
     ExpressionStatement,
     Function,
@@ -30,7 +53,8 @@ from lpp.ast import (
     Program,
     ReturnStatement,
     Statement,
-    StringLiteral
+    StringLiteral,
+    While
 )
 
 PrefixParseFn = Callable[[], Optional[Expression]]
@@ -64,14 +88,61 @@ PRECEDENCES: Dict[TokenType, Precedence] = {
 }
 
 
+_LBRACE_CODE: int = TokenType.LBRACE.value
+# Finds the braces in the type codes of a TokenBuffer.
+_BRACES: Pattern = compile(b'[' + escape(bytes([_LBRACE_CODE, TokenType.RBRACE.value])) + b']')
+
+
+class _Pending(Enum):
+    """What an expression parsed by the iterative parser is waiting for."""
+    CALL_ARGUMENT = auto()
+    GROUPED = auto()
+    INFIX_RIGHT = auto()
+    PREFIX_RIGHT = auto()
+
+
 class Parser:
 
-    def __init__(self, lexer: Lexer) -> None:
-        self._lexer = lexer
+    def __init__(self,
+                 lexer: Union[Lexer, TokenBuffer],
+                 iterative: bool = False,
+                 lazy: bool = False) -> None:
+        """With `iterative`, expressions are parsed with an explicit stack
+        instead of recursion, so nesting depth is not bound by the Python
+        recursion limit. Both modes build the same AST.
+
+        With `lazy`, procedimiento bodies are only brace-matched and become
+        DeferredBlock nodes, parsed by parse_deferred_block when they are
+        first needed. Lazy parsing works over a TokenBuffer, so a Lexer is
+        tokenized first."""
+        if lazy and not isinstance(lexer, TokenBuffer):
+            lexer = lexer.tokenize()
+
+        self._iterative = iterative
+        self._lazy = lazy
+        self._next_token: Callable[[], Token]
+        self._next_offset: Callable[[], int]
+        if isinstance(lexer, TokenBuffer):
+            self._buffer: Optional[TokenBuffer] = lexer
+
+            self._next_token = lexer.tokens().__next__
+            self._next_offset = chain(lexer.starts, repeat(len(lexer.source))).__next__
+        else:
+            self._buffer = None
+            self._next_token = lexer.next_token
+            self._next_offset = partial(attrgetter('token_offset'), lexer)
+
         self._current_token: Optional[Token] = None
         self._peek_token: Optional[Token] = None
+        # Source offsets of the current and peek tokens, kept in the nodes.
+        self._current_offset: int = 0
+        self._peek_offset: int = 0
         self._errors: List[str] = []
         
+        self._parse_expression: Callable[[Precedence], Optional[Expression]] = (
+            self._parse_expression_iteratively if iterative
+            else self._parse_expression_recursively
+        )
         self._prefix_parse_fns: PrefixParseFns = self._register_prefix_fns()
         self._infix_parse_fns: InfixParseFns = self._register_infix_fns()
         self._advance_tokens()
@@ -83,7 +154,19 @@ class Parser:
         
     def _advance_tokens(self) -> None:
         self._current_token = self._peek_token
-        self._peek_token = self._lexer.next_token()
+        self._current_offset = self._peek_offset
+        self._peek_token = self._next_token()
+        self._peek_offset = self._next_offset()
+
+    def _seek(self, index: int) -> None:
+        """Continues parsing with the token at `index` of the buffer as the
+        current token."""
+        assert self._buffer is not None
+        self._next_token = self._buffer.tokens(index).__next__
+        self._next_offset = chain(memoryview(self._buffer.starts)[index:],
+                                  repeat(len(self._buffer.source))).__next__
+        self._advance_tokens()
+        self._advance_tokens()
     
     def _current_precedence(self) -> Precedence:
         assert self._current_token is not None
@@ -110,13 +193,34 @@ class Parser:
         error = f'Se esperaba {token_type}, pero se obtiene {self._peek_token.token_type}'
         self._errors.append(error)
     
+    def _parse_assignment_statement(self) -> Optional[AssignmentStatement]:
+        assert self._current_token is not None
+
+        assignment = AssignmentStatement(token=self._current_token,
+                                         name=self._parse_identifier(),
+                                         offset=self._current_offset)
+
+        if not self._expected_token(TokenType.ASSIGN):
+            return None
+
+        self._advance_tokens()
+        assignment.value = self._parse_expression(Precedence.LOWEST)
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == TokenType.SEMICOLON:
+            self._advance_tokens()
+
+        return assignment
+
     def _parse_block(self) -> Block:
         assert self._current_token is not None
-        block_statement = Block(token=self._current_token, statements=[])
+        block_statement = Block(token=self._current_token,
+                                statements=[],
+                                offset=self._current_offset)
 
         self._advance_tokens()
 
-        while not self._current_token.token_type == TokenType.RBRACE and not self._current_token == TokenType.EOF:
+        while not self._current_token.token_type == TokenType.RBRACE and not self._current_token.token_type == TokenType.EOF:
             statement = self._parse_statement()
 
             if statement:
@@ -130,11 +234,12 @@ class Parser:
         assert self._current_token is not None
 
         return Boolean(token=self._current_token,
-                       value=self._current_token.token_type == TokenType.TRUE)
+                       value=self._current_token.token_type == TokenType.TRUE,
+                       offset=self._current_offset)
     
     def _parse_call(self, function: Expression) -> Call:
         assert self._current_token is not None
-        call = Call(self._current_token, function)
+        call = Call(self._current_token, function, offset=self._current_offset)
         call.arguments = self._parse_call_arguments()
 
         return call
@@ -163,7 +268,122 @@ class Parser:
 
         return args
     
-    def _parse_expression(self, precedence: Precedence) -> Optional[Expression]:
+    def _parse_expression_iteratively(self, precedence: Precedence) -> Optional[Expression]:
+        # Mirrors _parse_expression_recursively. Prefix operators, groupings,
+        # infix operators and calls waiting for a subexpression are pushed to
+        # `pending` with the precedence of the expression they belong to, and
+        # are resumed once that subexpression is complete.
+        pending: List[Tuple[_Pending, Precedence, Any]] = []
+        infix_parse_fns = self._infix_parse_fns
+        subexpression_precedence: Optional[Precedence]
+
+        while True:
+            assert self._current_token is not None
+            token = self._current_token
+
+            if token.token_type is TokenType.MINUS or token.token_type is TokenType.NOT:
+                prefix = Prefix(token=token,
+                                operator=token.literal,
+                                offset=self._current_offset)
+                pending.append((_Pending.PREFIX_RIGHT, precedence, prefix))
+                self._advance_tokens()
+                precedence = Precedence.PREFIX
+                continue
+
+            if token.token_type is TokenType.LPAREN:
+                pending.append((_Pending.GROUPED, precedence, None))
+                self._advance_tokens()
+                precedence = Precedence.LOWEST
+                continue
+
+            expression: Optional[Expression] = None
+            prefix_parse_fn = self._prefix_parse_fns.get(token.token_type)
+            if prefix_parse_fn is not None:
+                expression = prefix_parse_fn()
+            else:
+                error = f'No se encontró una función para parsear {token.literal}'
+                self._errors.append(error)
+
+            # Without a prefix function the expression ends right away.
+            complete = prefix_parse_fn is None
+            subexpression_precedence = None
+
+            while True:
+                # The infix loop of _parse_expression_recursively. An operator
+                # waiting for its right operand, or a call waiting for its
+                # arguments, starts a subexpression instead of recursing.
+                while not complete:
+                    assert self._peek_token is not None
+                    peek_type = self._peek_token.token_type
+                    if (peek_type is TokenType.SEMICOLON
+                            or precedence >= PRECEDENCES.get(peek_type, Precedence.LOWEST)
+                            or peek_type not in infix_parse_fns):
+                        break
+
+                    self._advance_tokens()
+
+                    assert expression is not None and self._current_token is not None
+                    token = self._current_token
+
+                    if token.token_type is TokenType.LPAREN:
+                        call = Call(token, expression, offset=self._current_offset)
+
+                        if self._peek_token.token_type == TokenType.RPAREN:
+                            self._advance_tokens()
+                            call.arguments = []
+                            expression = call
+                            continue
+
+                        pending.append((_Pending.CALL_ARGUMENT, precedence, (call, [])))
+                        subexpression_precedence = Precedence.LOWEST
+                    else:
+                        infix = Infix(token=token,
+                                      operator=token.literal,
+                                      left=expression,
+                                      offset=self._current_offset)
+                        pending.append((_Pending.INFIX_RIGHT, precedence, infix))
+                        subexpression_precedence = PRECEDENCES[token.token_type]
+
+                    self._advance_tokens()
+                    break
+
+                if subexpression_precedence is not None:
+                    break
+
+                if not pending:
+                    return expression
+
+                waiting, precedence, node = pending.pop()
+                complete = False
+
+                if waiting is _Pending.PREFIX_RIGHT or waiting is _Pending.INFIX_RIGHT:
+                    node.right = expression
+                    expression = node
+
+                elif waiting is _Pending.GROUPED:
+                    if not self._expected_token(TokenType.RPAREN):
+                        expression = None
+
+                else:
+                    call, args = node
+                    if expression:
+                        args.append(expression)
+
+                    assert self._peek_token is not None
+                    if self._peek_token.token_type == TokenType.COMMA:
+                        self._advance_tokens()
+                        self._advance_tokens()
+                        pending.append((_Pending.CALL_ARGUMENT, precedence, node))
+                        subexpression_precedence = Precedence.LOWEST
+                        break
+
+                    if self._expected_token(TokenType.RPAREN):
+                        call.arguments = args
+                    expression = call
+
+            precedence = subexpression_precedence
+
+    def _parse_expression_recursively(self, precedence: Precedence) -> Optional[Expression]:
         assert self._current_token is not None
 
         try:
@@ -190,7 +410,8 @@ class Parser:
     
     def _parse_expression_statement(self) -> Optional[ExpressionStatement]:
         assert self._current_token is not None
-        expression_statement = ExpressionStatement(token=self._current_token)
+        expression_statement = ExpressionStatement(token=self._current_token,
+                                                   offset=self._current_offset)
 
         expression_statement.expression = self._parse_expression(Precedence.LOWEST)
 
@@ -202,7 +423,7 @@ class Parser:
     
     def _parse_function(self) -> Optional[Function]:
         assert self._current_token is not None
-        function = Function(token=self._current_token)
+        function = Function(token=self._current_token, offset=self._current_offset)
 
         if not self._expected_token(TokenType.LPAREN):
             return None
@@ -212,9 +433,36 @@ class Parser:
         if not self._expected_token(TokenType.LBRACE):
             return None
         
-        function.body = self._parse_block()
+        function.body = self._defer_block() if self._lazy else self._parse_block()
 
         return function
+
+    def _defer_block(self) -> Union[Block, DeferredBlock]:
+        assert self._buffer is not None and self._current_token is not None
+        start = bisect_left(self._buffer.starts, self._current_offset)
+
+        # The type codes are searched in place through the buffer protocol.
+        codes = self._buffer.types
+        depth = 0
+        for match in _BRACES.finditer(codes, start):
+            if codes[match.start()] == _LBRACE_CODE:
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 0:
+                deferred = DeferredBlock(token=self._current_token,
+                                         tokens=self._buffer,
+                                         start=start,
+                                         stop=match.start(),
+                                         iterative=self._iterative,
+                                         offset=self._current_offset)
+                self._seek(deferred.stop)
+
+                return deferred
+
+        # An unclosed body is parsed right away to report it as usual.
+        return self._parse_block()
     
     def _parse_function_parameters(self) -> List[Identifier]:
         assert self._peek_token is not None
@@ -226,16 +474,13 @@ class Parser:
 
         params: List[Identifier] = []
         
-        assert self._current_token is not None
-        identifier = Identifier(token=self._current_token, value=self._current_token.literal)
-        params.append(identifier)
+        params.append(self._parse_identifier())
 
         while self._peek_token.token_type == TokenType.COMMA:
             self._advance_tokens()
             self._advance_tokens()
 
-            identifier = Identifier(token=self._current_token, value=self._current_token.literal)
-            params.append(identifier)
+            params.append(self._parse_identifier())
         
         if not self._expected_token(TokenType.RPAREN):
             return []
@@ -255,13 +500,18 @@ class Parser:
     
     def _parse_identifier(self) -> Identifier:
         assert self._current_token is not None
-        
+
+        # Tokens read from a TokenBuffer carry fresh slices, so the name is
+        # always mapped to its interned symbol.
+        _, symbol = lookup_symbol(self._current_token.literal)
+
         return Identifier(token=self._current_token,
-                          value=self._current_token.literal)
+                          value=symbol,
+                          offset=self._current_offset)
     
     def _parse_if(self) -> Optional[If]:
         assert self._current_token is not None
-        if_expression = If(token=self._current_token)
+        if_expression = If(token=self._current_token, offset=self._current_offset)
 
         if not self._expected_token(TokenType.LPAREN):
             return None
@@ -295,7 +545,8 @@ class Parser:
         assert self._current_token is not None
         infix = Infix(token=self._current_token,
                       operator=self._current_token.literal,
-                      left=left)
+                      left=left,
+                      offset=self._current_offset)
 
         precedence = self._current_precedence()
 
@@ -308,7 +559,7 @@ class Parser:
     def _parse_integer(self) -> Optional[Integer]:
         assert self._current_token is not None
 
-        integer = Integer(token=self._current_token)
+        integer = Integer(token=self._current_token, offset=self._current_offset)
 
         try:
             integer.value = int(self._current_token.literal)
@@ -323,7 +574,8 @@ class Parser:
     def _parse_let_statement(self) -> Optional[LetStatement]:
         assert self._current_token is not None
 
-        let_statement = LetStatement(token=self._current_token)
+        let_statement = LetStatement(token=self._current_token,
+                                     offset=self._current_offset)
 
         if not self._expected_token(TokenType.IDENT):
             return None
@@ -359,7 +611,8 @@ class Parser:
     def _parse_prefix_expression(self) -> Prefix:
         assert self._current_token is not None
         prefix_expression = Prefix(token=self._current_token,
-                                   operator=self._current_token.literal)
+                                   operator=self._current_token.literal,
+                                   offset=self._current_offset)
         
         self._advance_tokens()
 
@@ -370,7 +623,8 @@ class Parser:
     def _parse_return_statement(self) -> Optional[ReturnStatement]:
         assert self._current_token is not None
 
-        return_statement = ReturnStatement(token=self._current_token)
+        return_statement = ReturnStatement(token=self._current_token,
+                                           offset=self._current_offset)
 
         self._advance_tokens()
 
@@ -385,17 +639,50 @@ class Parser:
     def _parse_statement(self) -> Optional[Statement]:
         assert self._current_token is not None
 
+        assert self._peek_token is not None
+
         if self._current_token.token_type is TokenType.LET:
             return self._parse_let_statement()
         elif self._current_token.token_type is TokenType.RETURN:
             return self._parse_return_statement()
+        elif self._current_token.token_type is TokenType.WHILE:
+            return self._parse_while_statement()
+        elif (self._current_token.token_type is TokenType.IDENT
+                and self._peek_token.token_type is TokenType.ASSIGN):
+            return self._parse_assignment_statement()
         else:
             return self._parse_expression_statement()
     
     def _parse_string_literal(self) -> Expression:
         assert self._current_token is not None
-        return StringLiteral(token=self._current_token, value=self._current_token.literal)
+        return StringLiteral(token=self._current_token,
+                             value=self._current_token.literal,
+                             offset=self._current_offset)
     
+    def _parse_while_statement(self) -> Optional[While]:
+        assert self._current_token is not None
+        while_statement = While(token=self._current_token, offset=self._current_offset)
+
+        if not self._expected_token(TokenType.LPAREN):
+            return None
+
+        self._advance_tokens()
+
+        while_statement.condition = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.RPAREN):
+            return None
+        if not self._expected_token(TokenType.LBRACE):
+            return None
+
+        while_statement.body = self._parse_block()
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == TokenType.SEMICOLON:
+            self._advance_tokens()
+
+        return while_statement
+
     def _peek_precedence(self) -> Precedence:
         assert self._peek_token is not None
 
@@ -432,3 +719,16 @@ class Parser:
             TokenType.FUNCTION: self._parse_function,
             TokenType.STRING: self._parse_string_literal
         }
+
+
+def parse_deferred_block(deferred: DeferredBlock) -> Block:
+    """Parses the body deferred by a lazy parser the first time it is asked
+    for. The parse errors are kept in `deferred.errors`."""
+    if deferred.block is None:
+        parser = Parser(deferred.tokens, iterative=deferred.iterative, lazy=True)
+        parser._seek(deferred.start)
+
+        deferred.block = parser._parse_block()
+        deferred.errors = parser.errors
+
+    return deferred.block
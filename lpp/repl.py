@@ -6,6 +6,7 @@ from lpp.evaluator import evaluate
 from lpp.object import Environment
 from lpp.parser import Parser
 from lpp.lexer import Lexer
+from lpp.resolver import resolve
 from lpp.token import(
     Token,
     TokenType
@@ -15,24 +16,51 @@ from lpp.token import(
 EOF_TOKEN: Token = Token(TokenType.EOF, '')
 
 
-def _print_parse_errors(errors: List[str]):
-    for error in errors:
-        print(error)
+def _open_braces(source: str) -> int:
+    # Braces are counted on tokens, so those inside strings are ignored.
+    types = Lexer(source).tokenize().types
+    return types.count(TokenType.LBRACE.value) - types.count(TokenType.RBRACE.value)
 
 
-def start_repl() -> None:
-    scanned: List[str] = []
+class ReplSession:
+    """An interactive session. Each input is lexed, parsed and evaluated only
+    once, against an environment kept for the whole session, so the cost of
+    a line does not grow with the history."""
+
+    def __init__(self) -> None:
+        self._env: Environment = Environment()
+        self._lines: List[str] = []
+
+    @property
+    def continuing(self) -> bool:
+        """Whether the last lines left braces open and more input is expected."""
+        return len(self._lines) > 0
 
-    while (source := input('>> ')) != 'salir':
-        scanned.append(source)
-        lexer: Lexer = Lexer(' '.join(scanned))
-        parser: Parser = Parser(lexer)
-        
+    def feed(self, line: str) -> List[str]:
+        """Takes a line of input and returns the lines to print. Input with
+        unclosed braces is kept until the lines that close them arrive."""
+        self._lines.append(line)
+        source = '\n'.join(self._lines)
+
+        if _open_braces(source) > 0:
+            return []
+
+        self._lines = []
+        parser: Parser = Parser(Lexer(source))
         program: Program = parser.parse_program()
 
         if len(parser.errors) > 0:
-            _print_parse_errors(parser.errors)
-            continue
-        
-        if evaluated := evaluate(program, Environment()):
-            print(evaluated.inspect())
+            return parser.errors
+
+        if evaluated := evaluate(resolve(program), self._env):
+            return [evaluated.inspect()]
+
+        return []
+
+
+def start_repl() -> None:
+    session = ReplSession()
+
+    while (source := input('.. ' if session.continuing else '>> ')) != 'salir':
+        for output in session.feed(source):
+            print(output)
@@ -0,0 +1,138 @@
+from typing import (
+    cast,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union
+)
+
+import lpp.ast as ast
+
+
+# The parameters and variables of a procedimiento, by slot.
+Scope = Dict[str, int]
+
+
+def children(node: Optional[ast.ASTNode]) -> Sequence[Optional[ast.ASTNode]]:
+    """The nodes right under `node`, in source order, with None for the
+    missing ones."""
+    node_type = type(node)
+
+    if node_type is ast.Program or node_type is ast.Block:
+        return cast(Union[ast.Program, ast.Block], node).statements
+    elif node_type is ast.ExpressionStatement:
+        return [cast(ast.ExpressionStatement, node).expression]
+    elif node_type is ast.LetStatement or node_type is ast.AssignmentStatement:
+        binding = cast(Union[ast.LetStatement, ast.AssignmentStatement], node)
+        return [binding.name, binding.value]
+    elif node_type is ast.ReturnStatement:
+        return [cast(ast.ReturnStatement, node).return_value]
+    elif node_type is ast.Prefix:
+        return [cast(ast.Prefix, node).right]
+    elif node_type is ast.Infix:
+        infix = cast(ast.Infix, node)
+        return [infix.left, infix.right]
+    elif node_type is ast.If:
+        if_expression = cast(ast.If, node)
+        return [if_expression.condition, if_expression.consequence, if_expression.alternative]
+    elif node_type is ast.While:
+        while_statement = cast(ast.While, node)
+        return [while_statement.condition, while_statement.body]
+    elif node_type is ast.Call:
+        call = cast(ast.Call, node)
+        return [call.function, *(call.arguments or [])]
+    elif node_type is ast.Function:
+        function = cast(ast.Function, node)
+        return [*function.parameters, function.body]
+
+    # Literals, identifiers and deferred bodies.
+    return []
+
+
+def _declare_variables(node: Optional[ast.ASTNode], scope: Scope) -> None:
+    """Adds the variables declared in `node` to `scope`, skipping nested
+    procedimientos, which have scopes of their own."""
+    for child in children(node):
+        if type(child) is ast.LetStatement:
+            name = cast(ast.LetStatement, child).name
+            if name is not None:
+                scope.setdefault(name.value, len(scope))
+
+        if type(child) is not ast.Function:
+            _declare_variables(child, scope)
+
+
+class _Resolver:
+
+    def __init__(self) -> None:
+        # The scopes of the procedimientos around the current node, the
+        # innermost last. Names at the top level are globals.
+        self._scopes: List[Optional[Scope]] = []
+
+    def resolve(self, node: Optional[ast.ASTNode]) -> None:
+        node_type = type(node)
+
+        if node_type is ast.Identifier:
+            self._resolve_identifier(cast(ast.Identifier, node))
+        elif node_type is ast.Function:
+            self._resolve_function(cast(ast.Function, node))
+        else:
+            for child in children(node):
+                self.resolve(child)
+
+    def _resolve_function(self, node: ast.Function) -> None:
+        if type(node.body) is not ast.Block:
+            # Bodies deferred by a lazy parser are looked up by name.
+            node.scope = None
+            return
+
+        # The arguments of a call are bound positionally, so the parameters
+        # take the first slots, in order.
+        scope: Scope = {}
+        for parameter in node.parameters:
+            scope.setdefault(parameter.value, len(scope))
+
+        if len(scope) < len(node.parameters):
+            # A parameter given twice binds the last argument, so the frames
+            # of the procedimiento are looked up by name.
+            node.scope = None
+            self._scopes.append(None)
+        else:
+            # Every variable of the procedimiento gets its slot up front, so
+            # names used before their declaration, or declared in a branch,
+            # still have one; until declared, the slot is UNSET.
+            _declare_variables(node.body, scope)
+            node.scope = scope
+            self._scopes.append(scope)
+
+        for child in children(node):
+            self.resolve(child)
+        self._scopes.pop()
+
+    def _resolve_identifier(self, node: ast.Identifier) -> None:
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if scope is None:
+                # Looked up by name from the current frame.
+                node.depth = -1
+                node.slot = -1
+                return
+
+            slot = scope.get(node.value)
+            if slot is not None:
+                node.depth = depth
+                node.slot = slot
+                return
+
+        # Looked up by name from the environment the program runs in.
+        node.depth = len(self._scopes)
+        node.slot = -1
+
+
+def resolve(program: ast.Program) -> ast.Program:
+    """Annotates, in place, every identifier in `program` with its lexical
+    address, and every procedimiento with the slots of its frames. Globals
+    and builtins get the depth of the top level, where they are looked up
+    by name."""
+    _Resolver().resolve(program)
+    return program
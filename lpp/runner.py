@@ -0,0 +1,83 @@
+from typing import (
+    Callable,
+    Dict,
+    Optional
+)
+
+from lpp.ast import Program
+from lpp.cache import load_program
+from lpp.closures import compile_program as compile_to_closures
+from lpp.compiler import compile_program as compile_to_bytecode
+from lpp.evaluator import evaluate
+from lpp.inference import TypeInference
+from lpp.lexer import Lexer
+from lpp.memoization import mark_pure
+from lpp.object import (
+    Environment,
+    Object
+)
+from lpp.optimizer import Optimizer
+from lpp.parser import Parser
+from lpp.resolver import resolve
+from lpp.stackless import evaluate as evaluate_stackless
+from lpp.unboxed import evaluate as evaluate_unboxed
+from lpp.vm import execute
+
+
+def _run_closures(program: Program, env: Environment) -> Optional[Object]:
+    return compile_to_closures(program)(env)
+
+
+def _run_vm(program: Program, env: Environment) -> Optional[Object]:
+    return execute(compile_to_bytecode(program), env)
+
+
+# Execution engines by name. All of them give the same results, and run
+# calls in tail position without nesting. They only differ in how deep other
+# calls can nest: evaluador, closures and nativo recurse in Python and raise
+# RecursionError past its limit, while vm and pila keep their own frames and
+# stop with an Error past vm.MAX_FRAMES and stackless.MAX_DEPTH.
+ENGINES: Dict[str, Callable[[Program, Environment], Optional[Object]]] = {
+    'evaluador': evaluate,
+    'closures': _run_closures,
+    'vm': _run_vm,
+    'pila': evaluate_stackless,
+    'nativo': evaluate_unboxed,
+}
+
+
+def run_file(path: str,
+             use_cache: bool = True,
+             lazy: bool = False,
+             engine: str = 'evaluador',
+             optimizer: Optional[Optimizer] = None,
+             memoize: bool = False,
+             inference: Optional[TypeInference] = None) -> None:
+    """Runs the program in `path` with one of ENGINES. With `lazy`,
+    procedimiento bodies are parsed when first called, and the cache is not
+    used. With an `optimizer`, the program is optimized before it runs. With
+    `memoize`, the evaluator caches the results of pure procedimientos. With
+    an `inference`, the evaluator runs the operators it specializes."""
+    if use_cache and not lazy:
+        program, errors = load_program(path)
+    else:
+        parser: Parser = Parser(Lexer.from_file(path), lazy=lazy)
+        program = parser.parse_program()
+        errors = parser.errors
+
+    if len(errors) > 0:
+        for error in errors:
+            print(error)
+
+        return
+
+    if optimizer is not None:
+        program = optimizer.optimize(program)
+    resolve(program)
+    if memoize:
+        mark_pure(program)
+    if inference is not None:
+        inference.specialize(program)
+
+    if evaluated := ENGINES[engine](program, Environment()):
+        print(evaluated.inspect())
@@ -0,0 +1,343 @@
+from typing import (
+    Any,
+    cast,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+import lpp.ast as ast
+from lpp.builtins import BUILTINS
+# The stackless evaluator shares the semantics of the evaluator, including
+# its error messages and the way bodies deferred by a lazy parser are parsed.
+from lpp.evaluator import (
+    _evaluate_infix_expression,
+    _evaluate_integer,
+    _evaluate_prefix_expression,
+    _evaluate_string_literal,
+    _extend_function_environment,
+    _function_body,
+    _MAX_DEPTH_EXCEEDED,
+    _new_error,
+    _NOT_A_FUNCTION,
+    _UNKNOWN_IDENTIFIER,
+    FALSE,
+    NULL,
+    TRUE
+)
+from lpp.object import (
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Object,
+    Return
+)
+
+
+# Calls nested deeper than this stop the evaluation with an Error. The
+# frames live in a Python list, so the limit only guards the memory used.
+MAX_DEPTH = 100_000
+
+# Continuations, tuples that start with one of these tags. Each one resumes
+# the evaluation of a node with the value of one of its children.
+_PROGRAM = 0            # (_PROGRAM, statements, next index, env)
+_BLOCK = 1              # (_BLOCK, statements, next index, env)
+_LET = 2                # (_LET, name, env)
+_RETURN = 3             # (_RETURN,)
+_PREFIX = 4             # (_PREFIX, operator)
+_INFIX_LEFT = 5         # (_INFIX_LEFT, node, env)
+_INFIX_RIGHT = 6        # (_INFIX_RIGHT, operator, left value)
+_IF = 7                 # (_IF, node, env)
+_CALL_FUNCTION = 8      # (_CALL_FUNCTION, node, env)
+_CALL_ARGUMENTS = 9     # (_CALL_ARGUMENTS, argument nodes, env, function, arguments so far)
+_FRAME = 10             # (_FRAME, unwraps): the end of an lpp call
+_WHILE = 11             # (_WHILE, node, env): after the condition
+_WHILE_BODY = 12        # (_WHILE_BODY, node, env): after the body
+_ASSIGN = 13            # (_ASSIGN, name, env)
+
+Continuation = Tuple[Any, ...]
+
+_Statements = Union[ast.Block, ast.Program]
+
+# Marks that the next step resumes the top continuation with `value`,
+# instead of evaluating `node`.
+_RESUME: Any = object()
+
+
+def _tail_frame(stack: List[Continuation]) -> int:
+    """The index of the frame the call about to be applied returns into,
+    when the call is in tail position, or -1."""
+    index = len(stack) - 1
+    if index < 0:
+        return -1
+
+    if stack[index][0] == _RETURN:
+        # The Return stops every block and loop up to the frame.
+        index -= 1
+        while index >= 0 and (stack[index][0] == _BLOCK or stack[index][0] == _WHILE_BODY):
+            index -= 1
+
+    if index >= 0 and stack[index][0] == _FRAME:
+        return index
+
+    return -1
+
+
+def evaluate(node: Optional[ast.ASTNode],
+             env: Environment,
+             max_depth: Optional[int] = None) -> Optional[Object]:
+    """Evaluates `node` in `env` like lpp.evaluator.evaluate, keeping the
+    pending work in a list of continuations instead of the Python stack.
+    Calls in tail position reuse the frame of their caller, and nesting more
+    than `max_depth` calls (MAX_DEPTH by default) evaluates to an Error."""
+    if max_depth is None:
+        max_depth = MAX_DEPTH
+
+    stack: List[Continuation] = []
+    push = stack.append
+    pop = stack.pop
+    depth = 0
+    value: Optional[Object] = None
+
+    while True:
+        if node is not _RESUME:
+            node_type = type(node)
+
+            if node_type is ast.Integer:
+                value = _evaluate_integer(cast(ast.Integer, node), env)
+
+            elif node_type is ast.Identifier:
+                name = cast(ast.Identifier, node).value
+                try:
+                    value = env[name]
+                except KeyError:
+                    value = BUILTINS.get(name, _new_error(_UNKNOWN_IDENTIFIER, [name]))
+
+            elif node_type is ast.Infix:
+                push((_INFIX_LEFT, node, env))
+                node = cast(ast.Infix, node).left
+                continue
+
+            elif node_type is ast.Call:
+                push((_CALL_FUNCTION, node, env))
+                node = cast(ast.Call, node).function
+                continue
+
+            elif node_type is ast.ExpressionStatement:
+                node = cast(ast.ExpressionStatement, node).expression
+                continue
+
+            elif node_type is ast.Block or node_type is ast.Program:
+                statements = cast(_Statements, node).statements
+                tag = _BLOCK if node_type is ast.Block else _PROGRAM
+                if not statements:
+                    value = None
+                else:
+                    # The value of the last statement of a block is the
+                    # value of the block, and needs no continuation.
+                    if tag == _PROGRAM or len(statements) > 1:
+                        push((tag, statements, 1, env))
+                    node = statements[0]
+                    continue
+
+            elif node_type is ast.If:
+                push((_IF, node, env))
+                node = cast(ast.If, node).condition
+                continue
+
+            elif node_type is ast.ReturnStatement:
+                push((_RETURN,))
+                node = cast(ast.ReturnStatement, node).return_value
+                continue
+
+            elif node_type is ast.Boolean:
+                value = TRUE if cast(ast.Boolean, node).value else FALSE
+
+            elif node_type is ast.Prefix:
+                prefix = cast(ast.Prefix, node)
+                push((_PREFIX, prefix.operator))
+                node = prefix.right
+                continue
+
+            elif node_type is ast.LetStatement:
+                let_statement = cast(ast.LetStatement, node)
+                assert let_statement.name is not None
+                push((_LET, let_statement.name.value, env))
+                node = let_statement.value
+                continue
+
+            elif node_type is ast.StringLiteral:
+                value = _evaluate_string_literal(cast(ast.StringLiteral, node), env)
+
+            elif node_type is ast.While:
+                push((_WHILE, node, env))
+                node = cast(ast.While, node).condition
+                continue
+
+            elif node_type is ast.AssignmentStatement:
+                assignment = cast(ast.AssignmentStatement, node)
+                assert assignment.name is not None
+                push((_ASSIGN, assignment.name.value, env))
+                node = assignment.value
+                continue
+
+            elif node_type is ast.Function:
+                function_node = cast(ast.Function, node)
+                assert function_node.body is not None
+                value = Function(function_node.parameters, function_node.body, env,
+                                 function_node.scope)
+
+            else:
+                # Like evaluate, unknown nodes, and the ones missing from
+                # statements left incomplete by parse errors, evaluate to None.
+                value = None
+
+            node = _RESUME
+
+        if not stack:
+            return value
+
+        continuation = pop()
+        tag = continuation[0]
+
+        if tag == _INFIX_RIGHT:
+            assert value is not None
+            value = _evaluate_infix_expression(continuation[1], continuation[2], value)
+
+        elif tag == _INFIX_LEFT:
+            infix: ast.Infix = continuation[1]
+            push((_INFIX_RIGHT, infix.operator, value))
+            node, env = infix.right, continuation[2]
+
+        elif tag == _BLOCK:
+            if type(value) is Return or type(value) is Error:
+                continue
+
+            statements, index, env = continuation[1:]
+            if index + 1 < len(statements):
+                push((_BLOCK, statements, index + 1, env))
+            node = statements[index]
+
+        elif tag == _IF:
+            if_expression: ast.If = continuation[1]
+            if value is not NULL and value is not FALSE:
+                node, env = if_expression.consequence, continuation[2]
+            elif if_expression.alternative is not None:
+                node, env = if_expression.alternative, continuation[2]
+            else:
+                value = NULL
+
+        elif tag == _CALL_FUNCTION:
+            call: ast.Call = continuation[1]
+            env = continuation[2]
+            arguments: List[Object] = []
+
+            if call.arguments:
+                push((_CALL_ARGUMENTS, call.arguments, env, value, arguments))
+                node = call.arguments[0]
+                continue
+
+            function = value
+
+        elif tag == _CALL_ARGUMENTS:
+            argument_nodes, env, function, arguments = continuation[1:]
+            assert value is not None
+            arguments.append(value)
+
+            if len(arguments) < len(argument_nodes):
+                push(continuation)
+                node = argument_nodes[len(arguments)]
+                continue
+
+        elif tag == _FRAME:
+            depth -= 1
+            for _ in range(continuation[1]):
+                if type(value) is not Return:
+                    break
+                value = value.value
+
+        elif tag == _RETURN:
+            assert value is not None
+            value = Return(value)
+
+        elif tag == _PREFIX:
+            assert value is not None
+            value = _evaluate_prefix_expression(continuation[1], value)
+
+        elif tag == _LET:
+            continuation[2][continuation[1]] = value
+            value = None
+
+        elif tag == _WHILE:
+            if value is FALSE or value is NULL:
+                value = None
+            elif type(value) is not Error:
+                while_statement: ast.While = continuation[1]
+                push((_WHILE_BODY, while_statement, continuation[2]))
+                node, env = while_statement.body, continuation[2]
+
+        elif tag == _WHILE_BODY:
+            if type(value) is Return or type(value) is Error:
+                continue
+
+            while_statement = continuation[1]
+            push((_WHILE, while_statement, continuation[2]))
+            node, env = while_statement.condition, continuation[2]
+
+        elif tag == _ASSIGN:
+            if continuation[2].assign(continuation[1], value):
+                value = None
+            else:
+                value = _new_error(_UNKNOWN_IDENTIFIER, [continuation[1]])
+
+        elif tag == _PROGRAM:
+            if type(value) is Return:
+                value = value.value
+                del stack[:]
+                continue
+            if type(value) is Error:
+                del stack[:]
+                continue
+
+            statements, index, env = continuation[1:]
+            if index < len(statements):
+                push((_PROGRAM, statements, index + 1, env))
+                node = statements[index]
+
+        if tag != _CALL_FUNCTION and tag != _CALL_ARGUMENTS:
+            continue
+
+        # Applies `function` to `arguments`.
+        if type(function) is Function:
+            body = _function_body(function)
+            if type(body) is Error:
+                value = body
+                continue
+
+            function_env = _extend_function_environment(function, arguments)
+
+            # A call that returns straight into the frame of its caller
+            # replaces that frame. Like _apply_function does for tail calls,
+            # the new frame also unwraps the Returns the caller would have.
+            unwraps = 1
+            frame = _tail_frame(stack)
+            if frame >= 0:
+                unwraps = stack[frame][1] + (1 if frame == len(stack) - 1 else 0)
+                del stack[frame:]
+                depth -= 1
+
+            if depth >= max_depth:
+                return _new_error(_MAX_DEPTH_EXCEEDED, [max_depth])
+
+            push((_FRAME, unwraps))
+            depth += 1
+            node, env = cast(ast.Block, body), function_env
+
+        elif type(function) is Builtin:
+            value = function.fn(*arguments)
+
+        else:
+            assert function is not None
+            value = _new_error(_NOT_A_FUNCTION, [function.type().name])
@@ -0,0 +1,438 @@
+from enum import (
+    auto,
+    Enum
+)
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+from weakref import WeakSet
+
+import lpp.ast as ast
+# The evaluator imports this module, so its names are looked up when code is
+# generated instead of at import time.
+import lpp.evaluator as evaluator
+from lpp.builtins import BUILTINS
+from lpp.object import (
+    Boolean,
+    Environment,
+    Error,
+    Function,
+    Integer,
+    new_integer,
+    Object,
+    Return,
+    String
+)
+
+
+# Calls after which a procedimiento is translated to Python. 0 disables it.
+THRESHOLD = 100
+
+# Returned by promoted code when its guards fail, so the call falls back to
+# the tree walker.
+DEOPTIMIZED = object()
+
+# Tiered code runs with the arguments of the call and the environment the
+# procedimiento was defined in.
+TieredCode = Callable[[List[Object], Environment], Any]
+
+
+class _Kind(Enum):
+    """How a value is represented by the generated code."""
+    BOOLEAN = auto()    # a Python bool
+    INTEGER = auto()    # a Python int
+    OBJECT = auto()     # an lpp Object
+
+
+_GUARDED_KINDS: Dict[type, _Kind] = {
+    Boolean: _Kind.BOOLEAN,
+    Integer: _Kind.INTEGER,
+}
+
+_INTEGER_ARITHMETIC: Dict[str, str] = {
+    '+': '+',
+    '-': '-',
+    '*': '*',
+    '/': '//',
+}
+
+_COMPARISONS = frozenset(['<', '<=', '>', '>=', '==', '!='])
+
+
+class Tier:
+    """Tier statistics of a procedimiento that reached THRESHOLD calls, and
+    its promoted code when it could be translated."""
+    __slots__ = ('run', 'source', 'guards', 'reason', 'optimized_calls', 'deoptimizations')
+
+    def __init__(self,
+                 run: Optional[TieredCode] = None,
+                 source: str = '',
+                 guards: Tuple[str, ...] = (),
+                 reason: str = '') -> None:
+        self.run = run
+        self.source = source
+        self.guards = guards
+        self.reason = reason
+        self.optimized_calls = 0
+        self.deoptimizations = 0
+
+
+class TierStatistics(NamedTuple):
+    procedimiento: str
+    calls: int
+    promoted: bool
+    guards: Tuple[str, ...]
+    optimized_calls: int
+    deoptimizations: int
+    reason: str
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _assign(env: Environment, name: str, value: Object) -> Optional[Error]:
+    if env.assign(name, value):
+        return None
+
+    return evaluator._new_error(evaluator._UNKNOWN_IDENTIFIER, [name])
+
+
+def _lookup(env: Environment, name: str) -> Object:
+    try:
+        return env[name]
+    except KeyError:
+        builtin = BUILTINS.get(name)
+        if builtin is None:
+            return evaluator._new_error(evaluator._UNKNOWN_IDENTIFIER, [name])
+
+        return builtin
+
+
+class _Translator:
+    """Translates the body of a procedimiento into the source of a Python
+    function, with the parameters unboxed according to the kinds of the
+    arguments the procedimiento was promoted with."""
+
+    def __init__(self, fn: Function, kinds: List[_Kind]) -> None:
+        self._fn = fn
+        self._kinds = kinds
+        self._lines: List[str] = []
+        self._variables: Dict[str, _Kind] = {}
+        self.constants: Dict[str, Object] = {}
+
+    def translate(self, body: ast.Block) -> str:
+        names = [parameter.value for parameter in self._fn.parameters]
+        if len(set(names)) != len(names):
+            raise _Unsupported('parámetros repetidos')
+
+        self._emit(0, 'def tiered(args, env):')
+        self._emit(1, f'if len(args) < {len(names)}:')
+        self._emit(2, 'return DEOPTIMIZED')
+
+        for index, (name, kind) in enumerate(zip(names, self._kinds)):
+            variable = f'v_{name}'
+            self._emit(1, f'{variable} = args[{index}]')
+
+            if kind is _Kind.INTEGER:
+                self._emit(1, f'if type({variable}) is not Integer:')
+                self._emit(2, 'return DEOPTIMIZED')
+                self._emit(1, f'{variable} = {variable}.value')
+            elif kind is _Kind.BOOLEAN:
+                self._emit(1, f'if {variable} is not TRUE and {variable} is not FALSE:')
+                self._emit(2, 'return DEOPTIMIZED')
+                self._emit(1, f'{variable} = {variable} is TRUE')
+
+            self._variables[name] = kind
+
+        self._statements(body.statements, 1, tail=True)
+
+        return '\n'.join(self._lines) + '\n'
+
+    def _emit(self, depth: int, line: str) -> None:
+        self._lines.append('    ' * depth + line)
+
+    def _statements(self, statements: List[ast.Statement], depth: int, tail: bool) -> None:
+        # In tail position the value of the last statement is the value of
+        # the call. Elsewhere, like in a block, a statement only stops the
+        # body when its value is a Return or an Error. Like _apply_function,
+        # the generated code returns the value of a Return, not the Return.
+        # Calls in tail position are handed back to _run_tail_calls as a
+        # _TailCall, like the evaluator does.
+        if not statements:
+            self._emit(depth, 'return None' if tail else 'pass')
+            return
+
+        for index, statement in enumerate(statements):
+            last = tail and index == len(statements) - 1
+
+            if type(statement) is ast.LetStatement:
+                self._let_statement(statement, depth)
+                if last:
+                    self._emit(depth, 'return None')
+
+            elif type(statement) is ast.AssignmentStatement:
+                self._assignment_statement(statement, depth)
+                if last:
+                    self._emit(depth, 'return None')
+
+            elif type(statement) is ast.While:
+                self._while(statement, depth)
+                if last:
+                    self._emit(depth, 'return None')
+
+            elif type(statement) is ast.ReturnStatement:
+                return_value = statement.return_value
+                if type(return_value) is ast.Call:
+                    self._emit(depth, f'return _tail({self._call_arguments(return_value)}, True)')
+                    continue
+
+                value, kind = self._expression(return_value)
+                self._emit(depth, f'return {_box(value, kind)}')
+
+            elif type(statement) is ast.ExpressionStatement:
+                expression = statement.expression
+                if type(expression) is ast.If:
+                    self._if(expression, depth, last)
+                    continue
+                elif type(expression) is ast.Block:
+                    # A si with a constant condition, replaced by its branch.
+                    self._statements(expression.statements, depth, last)
+                    continue
+                elif last and type(expression) is ast.Call:
+                    self._emit(depth, f'return _tail({self._call_arguments(expression)}, False)')
+                    continue
+
+                value, kind = self._expression(expression)
+                if last:
+                    if kind is _Kind.OBJECT:
+                        value = f'_unwrap({value})'
+                    self._emit(depth, f'return {_box(value, kind)}')
+                elif kind is _Kind.OBJECT:
+                    self._emit(depth, f'if type(value := {value}) is Error:')
+                    self._emit(depth + 1, 'return value')
+                    self._emit(depth, 'if type(value) is Return:')
+                    self._emit(depth + 1, 'return value.value')
+                else:
+                    self._emit(depth, value)
+
+            else:
+                raise _Unsupported(type(statement).__name__)
+
+    def _let_statement(self, statement: ast.LetStatement, depth: int) -> None:
+        assert statement.name is not None
+        if depth > 1:
+            # Whether the name is local would depend on the branch taken.
+            raise _Unsupported('variable dentro de un bloque')
+
+        value, kind = self._expression(statement.value)
+        name = statement.name.value
+        if self._variables.get(name, kind) is not kind:
+            raise _Unsupported(f'{name} cambia de tipo')
+
+        self._emit(depth, f'v_{name} = {value}')
+        self._variables[name] = kind
+
+    def _assignment_statement(self, statement: ast.AssignmentStatement, depth: int) -> None:
+        assert statement.name is not None
+        value, kind = self._expression(statement.value)
+        name = statement.name.value
+
+        if name not in self._variables:
+            # Bound outside of the procedimiento, or nowhere.
+            self._emit(depth, f'if (value := _assign(env, {name!r}, {_box(value, kind)})) is not None:')
+            self._emit(depth + 1, 'return value')
+            return
+
+        if self._variables[name] is not kind:
+            raise _Unsupported(f'{name} cambia de tipo')
+
+        self._emit(depth, f'v_{name} = {value}')
+
+    def _while(self, node: ast.While, depth: int) -> None:
+        condition, kind = self._expression(node.condition)
+
+        if kind is _Kind.BOOLEAN:
+            self._emit(depth, f'while {condition}:')
+        elif kind is _Kind.INTEGER:
+            self._emit(depth, f'while {condition} or True:')
+        else:
+            self._emit(depth, 'while True:')
+            self._emit(depth + 1, f'if (value := {condition}) is NULL or value is FALSE:')
+            self._emit(depth + 2, 'break')
+            self._emit(depth + 1, 'if type(value) is Error:')
+            self._emit(depth + 2, 'return value')
+
+        assert node.body is not None
+        self._statements(node.body.statements, depth + 1, tail=False)
+
+    def _if(self, node: ast.If, depth: int, tail: bool) -> None:
+        condition, kind = self._expression(node.condition)
+
+        if kind is _Kind.BOOLEAN:
+            self._emit(depth, f'if {condition}:')
+        elif kind is _Kind.INTEGER:
+            # Integers are always truthy.
+            self._emit(depth, f'if {condition} or True:')
+        else:
+            self._emit(depth, f'if (value := {condition}) is not NULL and value is not FALSE:')
+
+        assert node.consequence is not None
+        self._statements(node.consequence.statements, depth + 1, tail)
+
+        if node.alternative is not None:
+            self._emit(depth, 'else:')
+            self._statements(node.alternative.statements, depth + 1, tail)
+        elif tail:
+            self._emit(depth, 'else:')
+            self._emit(depth + 1, 'return NULL')
+
+    def _expression(self, node: Optional[ast.ASTNode]) -> Tuple[str, _Kind]:
+        node_type = type(node)
+
+        if node_type is ast.Integer:
+            return repr(cast(ast.Integer, node).value), _Kind.INTEGER
+
+        elif node_type is ast.Boolean:
+            return repr(bool(cast(ast.Boolean, node).value)), _Kind.BOOLEAN
+
+        elif node_type is ast.StringLiteral:
+            name = f'c{len(self.constants)}'
+            self.constants[name] = String(cast(ast.StringLiteral, node).value)
+            return name, _Kind.OBJECT
+
+        elif node_type is ast.Identifier:
+            name = cast(ast.Identifier, node).value
+            if name in self._variables:
+                return f'v_{name}', self._variables[name]
+
+            return f'_lookup(env, {name!r})', _Kind.OBJECT
+
+        elif node_type is ast.Prefix:
+            return self._prefix(cast(ast.Prefix, node))
+
+        elif node_type is ast.Infix:
+            return self._infix(cast(ast.Infix, node))
+
+        elif node_type is ast.Call:
+            return f'_call({self._call_arguments(cast(ast.Call, node))})', _Kind.OBJECT
+
+        raise _Unsupported(node_type.__name__)
+
+    def _call_arguments(self, node: ast.Call) -> str:
+        function, function_kind = self._expression(node.function)
+
+        assert node.arguments is not None
+        arguments = [_box(*self._expression(argument))
+                     for argument in node.arguments]
+
+        return f'{_box(function, function_kind)}, [{", ".join(arguments)}]'
+
+    def _prefix(self, node: ast.Prefix) -> Tuple[str, _Kind]:
+        right, kind = self._expression(node.right)
+
+        if node.operator == '-' and kind is _Kind.INTEGER:
+            return f'(-{right})', _Kind.INTEGER
+        elif node.operator == '!' and kind is _Kind.BOOLEAN:
+            return f'(not {right})', _Kind.BOOLEAN
+
+        return f'_prefix({node.operator!r}, {_box(right, kind)})', _Kind.OBJECT
+
+    def _infix(self, node: ast.Infix) -> Tuple[str, _Kind]:
+        left, left_kind = self._expression(node.left)
+        right, right_kind = self._expression(node.right)
+        operator = node.operator
+
+        if left_kind is _Kind.INTEGER and right_kind is _Kind.INTEGER:
+            if operator in _INTEGER_ARITHMETIC:
+                return f'({left} {_INTEGER_ARITHMETIC[operator]} {right})', _Kind.INTEGER
+            elif operator in _COMPARISONS:
+                return f'({left} {operator} {right})', _Kind.BOOLEAN
+
+        elif (left_kind is _Kind.BOOLEAN and right_kind is _Kind.BOOLEAN
+                and operator in ('==', '!=')):
+            return f'({left} {operator} {right})', _Kind.BOOLEAN
+
+        return (f'_infix({operator!r}, {_box(left, left_kind)}, {_box(right, right_kind)})',
+                _Kind.OBJECT)
+
+
+def _box(value: str, kind: _Kind) -> str:
+    if kind is _Kind.INTEGER:
+        return f'_integer({value})'
+    elif kind is _Kind.BOOLEAN:
+        return f'(TRUE if {value} else FALSE)'
+
+    return value
+
+
+_promoted: 'WeakSet[Function]' = WeakSet()
+
+
+def promote(fn: Function, args: List[Object]) -> Tier:
+    """Translates the body of `fn` into Python specialized for the types of
+    `args`, and attaches the result to `fn.tier`. Procedimientos using
+    constructs the translator does not cover keep running in the tree walker,
+    with the reason in their Tier."""
+    kinds = [_GUARDED_KINDS.get(type(arg), _Kind.OBJECT) for arg in args]
+    guards = tuple(f'{parameter.value}: {kind.name}'
+                   for parameter, kind in zip(fn.parameters, kinds))
+    translator = _Translator(fn, kinds)
+
+    try:
+        if type(fn.body) is not ast.Block:
+            raise _Unsupported('cuerpo con errores de sintaxis')
+
+        source = translator.translate(fn.body)
+    except _Unsupported as reason:
+        fn.tier = Tier(reason=str(reason))
+    else:
+        namespace: Dict[str, Any] = {
+            'DEOPTIMIZED': DEOPTIMIZED,
+            'Error': Error,
+            'FALSE': evaluator.FALSE,
+            'Integer': Integer,
+            'NULL': evaluator.NULL,
+            'Return': Return,
+            'TRUE': evaluator.TRUE,
+            '_assign': _assign,
+            '_call': evaluator._apply_function,
+            '_infix': evaluator._evaluate_infix_expression,
+            '_integer': new_integer,
+            '_lookup': _lookup,
+            '_prefix': evaluator._evaluate_prefix_expression,
+            '_tail': evaluator._TailCall,
+            '_unwrap': evaluator._unwrap_return_value,
+        }
+        namespace.update(translator.constants)
+        exec(compile(source, f'<procedimiento en {fn.body.offset}>', 'exec'), namespace)
+
+        fn.tier = Tier(namespace['tiered'], source, guards)
+
+    _promoted.add(fn)
+    return fn.tier
+
+
+def statistics() -> List[TierStatistics]:
+    """Tier statistics of the live procedimientos that reached THRESHOLD."""
+    result: List[TierStatistics] = []
+
+    for fn in _promoted:
+        tier: Tier = fn.tier
+        parameters = ', '.join(str(parameter) for parameter in fn.parameters)
+        result.append(TierStatistics(f'procedimiento({parameters}) en {fn.body.offset}',
+                                     fn.calls,
+                                     tier.run is not None,
+                                     tier.guards,
+                                     tier.optimized_calls,
+                                     tier.deoptimizations,
+                                     tier.reason))
+
+    return sorted(result, key=lambda statistics: -statistics.calls)
@@ -1,12 +1,21 @@
+from array import array
 from enum import (
     auto,
     Enum,
     unique
 )
 
+from sys import intern
+from itertools import (
+    chain,
+    repeat
+)
 from typing import (
+    Dict,
+    Iterator,
     NamedTuple,
-    Dict
+    Sequence,
+    Tuple
 )
 
 
@@ -42,6 +51,11 @@ class TokenType(Enum):
     SEMICOLON = auto()
     STRING = auto()
     TRUE = auto()
+    WHILE = auto()
+
+    # Members are singletons, so the identity hash of object is enough and
+    # avoids the Python level Enum.__hash__ on every dict lookup by type.
+    __hash__ = object.__hash__
 
 class Token(NamedTuple):
     token_type: TokenType
@@ -51,15 +65,89 @@ class Token(NamedTuple):
         return f'Type: {self.token_type}, Literal: {self.literal}'
 
 
+KEYWORDS: Dict[str, TokenType] = {
+    'falso' : TokenType.FALSE,
+    'mientras': TokenType.WHILE,
+    'procedimiento': TokenType.FUNCTION,
+    'regresa' : TokenType.RETURN,
+    'si' : TokenType.IF,
+    'sino' : TokenType.ELSE,
+    'variable': TokenType.LET,
+    'verdadero' : TokenType.TRUE
+}
+
+
+# Symbol table shared by the lexer, the parser and Environment. Each
+# identifier is interned once, so equal names share a single str whose hash
+# is computed only once and dict lookups succeed on identity. The keywords
+# are precomputed entries.
+_SYMBOLS: Dict[str, Tuple[TokenType, str]] = {
+    literal: (token_type, literal) for literal, token_type in KEYWORDS.items()
+}
+
+
+def lookup_symbol(literal: str) -> Tuple[TokenType, str]:
+    """Returns the token type of an identifier or keyword together with its
+    interned literal, adding new identifiers to the symbol table."""
+    try:
+        return _SYMBOLS[literal]
+    except KeyError:
+        symbol = _SYMBOLS[literal] = (TokenType.IDENT, intern(literal))
+        return symbol
+
+
 def lookup_token_type(literal: str) -> TokenType:
-    keywords: Dict[str, TokenType] = {
-        'falso' : TokenType.FALSE,
-        'procedimiento': TokenType.FUNCTION,
-        'regresa' : TokenType.RETURN,
-        'si' : TokenType.IF,
-        'sino' : TokenType.ELSE,
-        'variable': TokenType.LET,
-        'verdadero' : TokenType.TRUE
-    }
-
-    return keywords.get(literal, TokenType.IDENT)
+    return lookup_symbol(literal)[0]
+
+
+TOKEN_TYPES: Dict[int, TokenType] = {
+    token_type.value: token_type for token_type in TokenType
+}
+
+
+class TokenBuffer:
+    """A token stream stored as parallel arrays of type codes and source
+    offsets. Literals are sliced from the source only when asked for."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.types: array = array('B')
+        self.starts: array = array('I')
+        self.ends: array = array('I')
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(self.token_type(index), self.literal(index))
+
+    def append(self, token_type: TokenType, start: int, end: int) -> None:
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def literal(self, index: int) -> str:
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def tokens(self, start: int = 0) -> Iterator[Token]:
+        """Iterates over the buffer from the token at `start` like repeated
+        calls to Lexer.next_token, which keeps returning EOF once the source
+        is exhausted."""
+        types: Sequence[int] = self.types
+        starts: Sequence[int] = self.starts
+        ends: Sequence[int] = self.ends
+        if start:
+            # Memory views skip the leading tokens without copying the arrays.
+            types = memoryview(self.types)[start:]
+            starts = memoryview(self.starts)[start:]
+            ends = memoryview(self.ends)[start:]
+
+        token_types = map(TOKEN_TYPES.__getitem__, types)
+        literals = map(self.source.__getitem__, map(slice, starts, ends))
+        # tuple.__new__ builds each Token without a Python level __new__ call.
+        tokens = map(tuple.__new__, repeat(Token), zip(token_types, literals))
+
+        return chain(tokens, repeat(Token(TokenType.EOF, '')))
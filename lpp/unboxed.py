@@ -0,0 +1,433 @@
+from operator import (
+    add,
+    eq,
+    floordiv,
+    ge,
+    gt,
+    le,
+    lt,
+    mul,
+    ne,
+    sub
+)
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    Optional,
+    Type,
+    Union
+)
+
+import lpp.ast as ast
+# The unboxed evaluator shares the semantics of the evaluator, including its
+# error messages, the lookup of identifiers, its tail calls and the inline
+# caches of call sites.
+from lpp.evaluator import (
+    _bind_arguments,
+    _evaluate_callee_identifier,
+    _evaluate_identifier,
+    _EXITS,
+    _function_body,
+    _InlineCache,
+    _NOT_A_FUNCTION,
+    _RETURNED,
+    _TAIL_EXITS,
+    _TailCall,
+    _TYPE_MISMATCH,
+    _UNKNOWN_IDENTIFIER,
+    _UNKNOWN_INFIX_OPERATOR,
+    _UNKNOWN_PREFIX_OPERATOR,
+    FALSE,
+    NULL,
+    TRUE
+)
+from lpp.object import (
+    Boolean,
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Integer,
+    new_integer,
+    Object,
+    Return,
+    String,
+    UNSET
+)
+
+
+# A runtime value of this evaluator: an int, a str or a bool for the
+# integers, strings and booleans of lpp, and an Object for anything else.
+Value = Any
+
+_TYPE_NAMES: Dict[type, str] = {
+    bool: 'BOOLEAN',
+    int: 'INTEGER',
+    str: 'STRING',
+}
+
+# bool is a subclass of int, so operands are told apart by their exact type.
+_INTEGER_OPERATIONS: Dict[str, Callable[[int, int], Any]] = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+    '/': floordiv,
+    '<': lt,
+    '<=': le,
+    '>': gt,
+    '>=': ge,
+    '==': eq,
+    '!=': ne,
+}
+
+_STRING_OPERATIONS: Dict[str, Callable[[str, str], Any]] = {
+    '+': add,
+    '<': lt,
+    '<=': le,
+    '>': gt,
+    '>=': ge,
+    '==': eq,
+    '!=': ne,
+}
+
+_OPERATIONS: Dict[str, Dict[str, Callable[[Any, Any], Any]]] = {
+    'INTEGER': _INTEGER_OPERATIONS,
+    'STRING': _STRING_OPERATIONS,
+}
+
+
+def box(value: Value) -> Optional[Object]:
+    """The Object for a value of this evaluator, for code that expects the
+    objects of lpp.object, like the builtins."""
+    value_type = type(value)
+
+    if value_type is int:
+        return new_integer(value)
+    elif value_type is str:
+        return String(value)
+    elif value_type is bool:
+        return TRUE if value else FALSE
+    elif value_type is Return:
+        return Return(cast(Object, box(value.value)))
+
+    return value
+
+
+def unbox(obj: Optional[Object]) -> Value:
+    """The value of this evaluator for an Object, the inverse of box."""
+    obj_type = type(obj)
+
+    if obj_type is Integer or obj_type is String or obj_type is Boolean:
+        return cast(Union[Boolean, Integer, String], obj).value
+    elif obj_type is Return:
+        return Return(unbox(cast(Return, obj).value))
+
+    return obj
+
+
+def _apply_function(fn: Value, args: List[Value], cache: Optional[_InlineCache]) -> Value:
+    unwraps = 0
+    evaluated: Value
+
+    while True:
+        if type(fn) is Function:
+            body = _function_body(fn)
+            if type(body) is Error:
+                evaluated = body
+            else:
+                env = _bind_arguments(fn, args, cache)
+                evaluated = _evaluate_tail_block(cast(ast.Block, body), env, True)
+
+                if evaluated is _RETURNED:
+                    evaluated = _RETURNED.value
+                    _RETURNED.value = None
+                elif type(evaluated) is Return:
+                    evaluated = evaluated.value
+
+        elif type(fn) is Builtin:
+            # Builtins take and return Objects.
+            evaluated = unbox(fn.fn(*[cast(Object, box(arg)) for arg in args]))
+
+        else:
+            evaluated = _new_error(_NOT_A_FUNCTION, [_type_name(fn)])
+
+        if type(evaluated) is not _TailCall:
+            break
+
+        fn, args, cache = evaluated.fn, evaluated.args, evaluated.cache
+        if not evaluated.returned:
+            unwraps += 1
+
+    while unwraps > 0 and type(evaluated) is Return:
+        evaluated = evaluated.value
+        unwraps -= 1
+
+    return evaluated
+
+def _evaluate_assignment_statement(node: ast.AssignmentStatement, env: Environment) -> Value:
+    # Like lpp.evaluator._evaluate_assignment_statement.
+    value = _evaluate(node.value, env)
+
+    name = node.name
+    assert name is not None
+    if name.slot >= 0:
+        frame: Optional[Environment] = env
+        depth = name.depth
+        while depth > 0:
+            assert frame is not None
+            frame = frame.outer
+            depth -= 1
+
+        assert frame is not None
+        if frame.slots[name.slot] is not UNSET:
+            frame.slots[name.slot] = value
+            return None
+
+    if not env.assign(name.value, value):
+        return _new_error(_UNKNOWN_IDENTIFIER, [name.value])
+
+    return None
+
+def _evaluate_block(block: ast.Block, env: Environment) -> Value:
+    result: Value = None
+
+    for statement in block.statements:
+        result = _evaluate(statement, env)
+
+        if type(result) in _EXITS:
+            return result
+
+    return result
+
+def _evaluate_boolean(node: ast.Boolean, env: Environment) -> bool:
+    assert node.value is not None
+    return node.value
+
+def _evaluate_call(node: ast.Call, env: Environment) -> Value:
+    function = _evaluate_callee(node, env)
+
+    assert node.arguments is not None
+    args = [_evaluate(argument, env) for argument in node.arguments]
+
+    return _apply_function(function, args, node.cache)
+
+def _evaluate_callee(node: ast.Call, env: Environment) -> Value:
+    cache = node.cache
+    if cache is None:
+        cache = node.cache = _InlineCache()
+
+    if type(node.function) is ast.Identifier:
+        return _evaluate_callee_identifier(cast(ast.Identifier, node.function), env, cache)
+
+    return _evaluate(node.function, env)
+
+def _evaluate_expression_statement(node: ast.ExpressionStatement, env: Environment) -> Value:
+    return _evaluate(node.expression, env)
+
+def _evaluate_function(node: ast.Function, env: Environment) -> Function:
+    assert node.body is not None
+    return Function(node.parameters, node.body, env, node.scope)
+
+def _evaluate_if(node: ast.If, env: Environment) -> Value:
+    condition = _evaluate(node.condition, env)
+
+    if condition is not False and condition is not NULL:
+        return _evaluate(node.consequence, env)
+    elif node.alternative is not None:
+        return _evaluate(node.alternative, env)
+
+    return NULL
+
+def _evaluate_infix(node: ast.Infix, env: Environment) -> Value:
+    left = _evaluate(node.left, env)
+    right = _evaluate(node.right, env)
+
+    if type(left) is int and type(right) is int:
+        operation = _INTEGER_OPERATIONS.get(node.operator)
+        if operation is not None:
+            return operation(left, right)
+
+    return _evaluate_infix_expression(node.operator, left, right)
+
+def _evaluate_infix_expression(operator: str, left: Value, right: Value) -> Value:
+    # The types are looked at in the same order as the evaluator does.
+    left_type = _type_name(left)
+
+    if left_type in _OPERATIONS and left_type == _type_name(right):
+        operation = _OPERATIONS[left_type].get(operator)
+        if operation is not None:
+            return operation(left, right)
+    elif operator == '==':
+        return left is right
+    elif operator == '!=':
+        return left is not right
+
+    right_type = _type_name(right)
+    if left_type != right_type:
+        return _new_error(_TYPE_MISMATCH, [left_type, operator, right_type])
+
+    return _new_error(_UNKNOWN_INFIX_OPERATOR, [left_type, operator, right_type])
+
+def _evaluate_integer(node: ast.Integer, env: Environment) -> int:
+    assert node.value is not None
+    return node.value
+
+def _evaluate_let_statement(node: ast.LetStatement, env: Environment) -> None:
+    value = _evaluate(node.value, env)
+
+    assert node.name is not None
+    if node.name.slot >= 0:
+        env.slots[node.name.slot] = value
+    else:
+        env[node.name.value] = value
+
+def _evaluate_prefix(node: ast.Prefix, env: Environment) -> Value:
+    right = _evaluate(node.right, env)
+
+    if node.operator == '!':
+        return right is False or right is NULL
+    elif node.operator == '-' and type(right) is int:
+        return -right
+
+    return _new_error(_UNKNOWN_PREFIX_OPERATOR, [node.operator, _type_name(right)])
+
+def _evaluate_program(program: ast.Program, env: Environment) -> Value:
+    result: Value = None
+
+    for statement in program.statements:
+        result = _evaluate(statement, env)
+
+        if type(result) is Return:
+            return result.value
+        elif type(result) is Error:
+            return result
+
+    return result
+
+def _evaluate_return_statement(node: ast.ReturnStatement, env: Environment) -> Return:
+    return Return(_evaluate(node.return_value, env))
+
+def _evaluate_string_literal(node: ast.StringLiteral, env: Environment) -> str:
+    return node.value
+
+def _evaluate_tail_block(block: ast.Block, env: Environment, tail: bool) -> Value:
+    # Like lpp.evaluator._evaluate_tail_block: calls in tail position are
+    # returned as a _TailCall, and `regresa` leaves through _RETURNED.
+    result: Value = None
+    last = len(block.statements) - 1
+
+    for index, statement in enumerate(block.statements):
+        if type(statement) is ast.ReturnStatement:
+            return_value = cast(ast.ReturnStatement, statement).return_value
+            if type(return_value) is ast.Call:
+                return _tail_call(cast(ast.Call, return_value), env, True)
+
+            _RETURNED.value = _evaluate(return_value, env)
+            return _RETURNED
+
+        elif type(statement) is ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statement).expression
+            if type(expression) is ast.If:
+                result = _evaluate_tail_if(cast(ast.If, expression), env, tail and index == last)
+            elif type(expression) is ast.Block:
+                # A si with a constant condition, replaced by its branch.
+                result = _evaluate_tail_block(cast(ast.Block, expression), env,
+                                              tail and index == last)
+            elif tail and index == last and type(expression) is ast.Call:
+                return _tail_call(cast(ast.Call, expression), env, False)
+            else:
+                result = _evaluate(expression, env)
+
+        else:
+            result = _evaluate(statement, env)
+
+        if type(result) in _TAIL_EXITS:
+            return result
+
+    return result
+
+def _evaluate_tail_if(node: ast.If, env: Environment, tail: bool) -> Value:
+    condition = _evaluate(node.condition, env)
+
+    if condition is not False and condition is not NULL:
+        assert node.consequence is not None
+        return _evaluate_tail_block(node.consequence, env, tail)
+    elif node.alternative is not None:
+        return _evaluate_tail_block(node.alternative, env, tail)
+
+    return NULL
+
+def _evaluate_while_statement(node: ast.While, env: Environment) -> Value:
+    condition = node.condition
+    assert node.body is not None
+    statements = node.body.statements
+
+    while True:
+        value = _evaluate(condition, env)
+        if value is False or value is NULL:
+            return None
+        elif type(value) is Error:
+            return value
+
+        for statement in statements:
+            result = _evaluate(statement, env)
+
+            if type(result) in _EXITS:
+                return result
+
+def _new_error(message: str, args: List[Any]) -> Error:
+    return Error(message.format(*args))
+
+def _tail_call(node: ast.Call, env: Environment, returned: bool) -> _TailCall:
+    function = _evaluate_callee(node, env)
+
+    assert node.arguments is not None
+    args = [_evaluate(argument, env) for argument in node.arguments]
+
+    return _TailCall(function, args, returned, node.cache)
+
+def _type_name(value: Value) -> str:
+    name = _TYPE_NAMES.get(type(value))
+    if name is None:
+        return cast(Object, value).type().name
+
+    return name
+
+
+_EVALUATORS: Dict[Type[Optional[ast.ASTNode]], Callable[[Any, Environment], Value]] = {
+    ast.AssignmentStatement: _evaluate_assignment_statement,
+    ast.Block: _evaluate_block,
+    ast.Boolean: _evaluate_boolean,
+    ast.Call: _evaluate_call,
+    ast.ExpressionStatement: _evaluate_expression_statement,
+    ast.Function: _evaluate_function,
+    ast.Identifier: _evaluate_identifier,
+    ast.If: _evaluate_if,
+    ast.Infix: _evaluate_infix,
+    ast.Integer: _evaluate_integer,
+    ast.LetStatement: _evaluate_let_statement,
+    ast.Prefix: _evaluate_prefix,
+    ast.Program: _evaluate_program,
+    ast.ReturnStatement: _evaluate_return_statement,
+    ast.StringLiteral: _evaluate_string_literal,
+    ast.While: _evaluate_while_statement,
+}
+
+
+def _evaluate_unknown(node: Optional[ast.ASTNode], env: Environment) -> None:
+    return None
+
+
+def _evaluate(node: Optional[ast.ASTNode], env: Environment) -> Value:
+    return _EVALUATORS.get(type(node), _evaluate_unknown)(node, env)
+
+
+def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+    """Evaluates `node` like lpp.evaluator.evaluate, with the integers,
+    strings and booleans of lpp as Python int, str and bool values instead
+    of Objects. Only the result is boxed; the variables bound in `env` keep
+    the unboxed values."""
+    return box(_evaluate(node, env))
@@ -0,0 +1,326 @@
+from array import array
+from typing import (
+    Any,
+    cast,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+from lpp.ast import (
+    Block,
+    DeferredBlock,
+    Identifier
+)
+from lpp.builtins import BUILTINS
+from lpp.compiler import (
+    Bytecode,
+    FunctionCode,
+    Opcode
+)
+# The VM shares the semantics of the evaluator, including its error messages
+# and its slow paths for operands that are not integers.
+from lpp.evaluator import (
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _extend_function_environment,
+    _MAX_DEPTH_EXCEEDED,
+    _new_error,
+    _NOT_A_FUNCTION,
+    _UNKNOWN_IDENTIFIER,
+    FALSE,
+    NULL,
+    TRUE
+)
+from lpp.object import (
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Integer,
+    new_integer,
+    Object,
+    Return
+)
+
+
+# Calls nested deeper than this stop the execution with an Error, like in
+# lpp.stackless. The frames live in a Python list, so the limit only guards
+# the memory used.
+MAX_FRAMES = 100_000
+
+_LOAD_NAME = Opcode.LOAD_NAME.value
+_LOAD_CONSTANT = Opcode.LOAD_CONSTANT.value
+_LOAD_NONE = Opcode.LOAD_NONE.value
+_STORE_NAME = Opcode.STORE_NAME.value
+_CALL = Opcode.CALL.value
+_TAIL_CALL = Opcode.TAIL_CALL.value
+_RETURN = Opcode.RETURN.value
+_MAKE_RETURN = Opcode.MAKE_RETURN.value
+_MAKE_FUNCTION = Opcode.MAKE_FUNCTION.value
+_JUMP = Opcode.JUMP.value
+_JUMP_IF_NOT_TRUTHY = Opcode.JUMP_IF_NOT_TRUTHY.value
+_EXIT_IF_SIGNAL = Opcode.EXIT_IF_SIGNAL.value
+_ADD = Opcode.ADD.value
+_SUBTRACT = Opcode.SUBTRACT.value
+_MULTIPLY = Opcode.MULTIPLY.value
+_DIVIDE = Opcode.DIVIDE.value
+_LESS = Opcode.LESS.value
+_LESS_OR_EQUAL = Opcode.LESS_OR_EQUAL.value
+_GREATER = Opcode.GREATER.value
+_GREATER_OR_EQUAL = Opcode.GREATER_OR_EQUAL.value
+_EQUAL = Opcode.EQUAL.value
+_NOT_EQUAL = Opcode.NOT_EQUAL.value
+_NEGATE = Opcode.NEGATE.value
+_NOT = Opcode.NOT.value
+_ASSIGN_NAME = Opcode.ASSIGN_NAME.value
+_END_LOOP_IF_NOT_TRUTHY = Opcode.END_LOOP_IF_NOT_TRUTHY.value
+
+_INFIX_OPERATORS = {
+    _ADD: '+',
+    _SUBTRACT: '-',
+    _MULTIPLY: '*',
+    _DIVIDE: '/',
+    _LESS: '<',
+    _LESS_OR_EQUAL: '<=',
+    _GREATER: '>',
+    _GREATER_OR_EQUAL: '>=',
+    _EQUAL: '==',
+    _NOT_EQUAL: '!=',
+}
+
+
+class BytecodeFunction(Function):
+    """A procedimiento built by the virtual machine."""
+
+    def __init__(self,
+                 parameters: List[Identifier],
+                 body: Union[Block, DeferredBlock],
+                 env: Environment,
+                 code: FunctionCode) -> None:
+        super().__init__(parameters, body, env, code.node.scope)
+        self.code = code
+
+
+def execute(bytecode: Bytecode, env: Environment) -> Optional[Object]:
+    """Runs compiled code in `env` like evaluate runs its AST. Calls to
+    procedimientos push frames instead of recursing in Python, and calls in
+    tail position reuse the frame of their caller."""
+    instructions: array = bytecode.instructions
+    constants: List[Any] = bytecode.constants
+    names: List[str] = bytecode.names
+    ip = 0
+
+    stack: List[Any] = []
+    push = stack.append
+    pop = stack.pop
+    frames: List[Tuple[array, List[Any], List[str], int, Environment, int]] = []
+    # The Returns the frame unwraps when it ends besides its own, one for
+    # every tail call that took it over from a body ending in the call.
+    unwraps = 0
+
+    while True:
+        opcode = instructions[ip]
+        operand = instructions[ip + 1]
+        ip += 2
+
+        if opcode == _LOAD_NAME:
+            name = names[operand]
+            try:
+                push(env[name])
+            except KeyError:
+                builtin = BUILTINS.get(name)
+                push(builtin if builtin is not None
+                     else _new_error(_UNKNOWN_IDENTIFIER, [name]))
+
+        elif opcode == _LOAD_CONSTANT:
+            push(constants[operand])
+
+        elif opcode == _CALL:
+            args = stack[len(stack) - operand:]
+            del stack[len(stack) - operand:]
+            fn = pop()
+
+            if type(fn) is BytecodeFunction:
+                code: FunctionCode = fn.code
+                body = code.bytecode
+                if body is None:
+                    compiled = code.compile_deferred()
+                    if type(compiled) is Error:
+                        push(compiled)
+                        continue
+
+                    body = cast(Bytecode, compiled)
+
+                if len(frames) >= MAX_FRAMES:
+                    return _new_error(_MAX_DEPTH_EXCEEDED, [MAX_FRAMES])
+
+                function_env = _extend_function_environment(fn, args)
+
+                frames.append((instructions, constants, names, ip, env, unwraps))
+                instructions, constants, names = body
+                ip = 0
+                env = function_env
+                unwraps = 0
+
+            elif type(fn) is Builtin:
+                push(fn.fn(*args))
+
+            else:
+                push(_new_error(_NOT_A_FUNCTION, [fn.type().name]))
+
+        elif opcode == _RETURN:
+            value = pop()
+            if type(value) is Return:
+                value = value.value
+                while unwraps > 0 and type(value) is Return:
+                    value = value.value
+                    unwraps -= 1
+
+            if not frames:
+                return value
+
+            instructions, constants, names, ip, env, unwraps = frames.pop()
+            push(value)
+
+        elif opcode == _TAIL_CALL:
+            count = operand >> 1
+            args = stack[len(stack) - count:]
+            del stack[len(stack) - count:]
+            fn = pop()
+
+            if type(fn) is BytecodeFunction:
+                code = fn.code
+                body = code.bytecode
+                if body is None:
+                    compiled = code.compile_deferred()
+                    if type(compiled) is Error:
+                        push(compiled)
+                        continue
+
+                    body = cast(Bytecode, compiled)
+
+                # Nothing is left of the frame on the stack, so the callee
+                # just takes it over.
+                env = _extend_function_environment(fn, args)
+                instructions, constants, names = body
+                ip = 0
+                if not operand & 1:
+                    unwraps += 1
+
+            elif type(fn) is Builtin:
+                push(fn.fn(*args))
+
+            else:
+                push(_new_error(_NOT_A_FUNCTION, [fn.type().name]))
+
+        elif opcode == _JUMP_IF_NOT_TRUTHY:
+            condition = pop()
+            if condition is NULL or condition is FALSE:
+                ip = operand
+
+        elif opcode == _JUMP:
+            ip = operand
+
+        elif opcode == _END_LOOP_IF_NOT_TRUTHY:
+            condition = stack[-1]
+            if condition is NULL or condition is FALSE:
+                stack[-1] = None
+                ip = operand
+            elif type(condition) is Error:
+                ip = operand
+            else:
+                pop()
+
+        elif opcode == _EXIT_IF_SIGNAL:
+            value = stack[-1]
+            if type(value) is Return or type(value) is Error:
+                ip = operand
+            else:
+                pop()
+
+        elif opcode == _ADD:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                stack[-1] = new_integer(left.value + right.value)
+            else:
+                stack[-1] = _evaluate_infix_expression('+', left, right)
+
+        elif opcode == _SUBTRACT:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                stack[-1] = new_integer(left.value - right.value)
+            else:
+                stack[-1] = _evaluate_infix_expression('-', left, right)
+
+        elif opcode == _LESS:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                stack[-1] = TRUE if left.value < right.value else FALSE
+            else:
+                stack[-1] = _evaluate_infix_expression('<', left, right)
+
+        elif opcode == _GREATER:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                stack[-1] = TRUE if left.value > right.value else FALSE
+            else:
+                stack[-1] = _evaluate_infix_expression('>', left, right)
+
+        elif opcode == _MULTIPLY:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                stack[-1] = new_integer(left.value * right.value)
+            else:
+                stack[-1] = _evaluate_infix_expression('*', left, right)
+
+        elif opcode == _EQUAL:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                stack[-1] = TRUE if left.value == right.value else FALSE
+            else:
+                stack[-1] = _evaluate_infix_expression('==', left, right)
+
+        elif opcode == _STORE_NAME:
+            env[names[operand]] = stack[-1]
+            stack[-1] = None
+
+        elif opcode == _ASSIGN_NAME:
+            name = names[operand]
+            if env.assign(name, stack[-1]):
+                stack[-1] = None
+            else:
+                stack[-1] = _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+        elif opcode == _MAKE_RETURN:
+            stack[-1] = Return(stack[-1])
+
+        elif opcode == _MAKE_FUNCTION:
+            code = constants[operand]
+            push(BytecodeFunction(code.node.parameters, code.body, env, code))
+
+        elif opcode == _LOAD_NONE:
+            push(None)
+
+        elif opcode == _NEGATE:
+            right = stack[-1]
+            if type(right) is Integer:
+                stack[-1] = new_integer(-right.value)
+            else:
+                stack[-1] = _evaluate_prefix_expression('-', right)
+
+        elif opcode == _NOT:
+            right = stack[-1]
+            stack[-1] = TRUE if right is FALSE or right is NULL else FALSE
+
+        else:
+            # The remaining infix operators.
+            right = pop()
+            stack[-1] = _evaluate_infix_expression(_INFIX_OPERATORS[opcode], stack[-1], right)
@@ -1,7 +1,82 @@
+from argparse import ArgumentParser
+
+import lpp.memoization as memoization
+import lpp.tiering as tiering
+from lpp.inference import TypeInference
+from lpp.optimizer import Optimizer
 from lpp.repl import start_repl
+from lpp.runner import (
+    ENGINES,
+    run_file
+)
 
 
 def main() -> None:
+    argument_parser = ArgumentParser(description='Lenguaje de programación lpp')
+    argument_parser.add_argument('archivo',
+                                 nargs='?',
+                                 help='programa .lpp a ejecutar')
+    argument_parser.add_argument('--no-cache',
+                                 action='store_true',
+                                 help='no usar el AST guardado en __lppcache__')
+    argument_parser.add_argument('--perezoso',
+                                 action='store_true',
+                                 help='parsear cada procedimiento hasta que se llama')
+    argument_parser.add_argument('--motor',
+                                 choices=list(ENGINES),
+                                 default='evaluador',
+                                 help='motor de ejecución del programa')
+    argument_parser.add_argument('--no-optimizar',
+                                 action='store_true',
+                                 help='ejecutar el programa sin optimizarlo')
+    argument_parser.add_argument('--optimizaciones',
+                                 action='store_true',
+                                 help='mostrar lo que simplificó el optimizador')
+    argument_parser.add_argument('--niveles',
+                                 action='store_true',
+                                 help='mostrar los procedimientos traducidos a Python')
+    argument_parser.add_argument('--memorizar',
+                                 action='store_true',
+                                 help='guardar los resultados de los procedimientos puros '
+                                      '(solo con el evaluador)')
+    argument_parser.add_argument('--memorizados',
+                                 action='store_true',
+                                 help='mostrar los aciertos de los resultados guardados')
+    argument_parser.add_argument('--no-inferir',
+                                 action='store_true',
+                                 help='no especializar los operadores por los tipos inferidos')
+    argument_parser.add_argument('--tipos',
+                                 action='store_true',
+                                 help='mostrar cuántos operadores se especializaron')
+    arguments = argument_parser.parse_args()
+
+    if arguments.archivo is not None:
+        optimizer = None if arguments.no_optimizar else Optimizer()
+        inference = None if arguments.no_inferir else TypeInference()
+        run_file(arguments.archivo,
+                 use_cache=not arguments.no_cache,
+                 lazy=arguments.perezoso,
+                 engine=arguments.motor,
+                 optimizer=optimizer,
+                 memoize=arguments.memorizar,
+                 inference=inference)
+
+        if arguments.optimizaciones and optimizer is not None:
+            print(optimizer.statistics)
+
+        if arguments.tipos and inference is not None:
+            print(inference.statistics)
+
+        if arguments.niveles:
+            for statistics in tiering.statistics():
+                print(statistics)
+
+        if arguments.memorizados:
+            for memo_statistics in memoization.statistics():
+                print(memo_statistics)
+
+        return
+
     print('LSV4000 (Lenguaje Super Vergón 4000)')
     print('Escribe una sentencia.')
 
@@ -0,0 +1,171 @@
+import os
+from tempfile import TemporaryDirectory
+from typing import (
+    cast,
+    List
+)
+from unittest import TestCase
+
+from lpp.ast import (
+    ExpressionStatement,
+    Identifier,
+    Prefix,
+    Program
+)
+from lpp.cache import (
+    CACHE_SUFFIX,
+    cache_path,
+    deserialize_program,
+    evict_stale_entries,
+    load_program,
+    serialize_program
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.token import lookup_symbol
+
+
+_SOURCE: str = '''
+    variable suma = procedimiento(x, y) {
+        si (x <= y) { regresa -x + y * 2; } sino { regresa !falso; }
+    };
+    suma(1, longitud("cadena"));
+'''
+
+
+class CacheTest(TestCase):
+
+    def test_serialization_round_trip(self) -> None:
+        program: Program = Parser(Lexer(_SOURCE)).parse_program()
+
+        loaded = deserialize_program(serialize_program(program))
+
+        self.assertIsInstance(loaded, Program)
+        self.assertEquals(str(loaded), str(program))
+        self.assertEquals(self._node_types(loaded), self._node_types(program))
+
+        call = loaded.statements[1]
+        assert isinstance(call, ExpressionStatement)
+        self.assertEquals(call.token_literal(), 'suma')
+        self.assertIs(call.token.literal, lookup_symbol('suma')[1])
+        self.assertEquals(call.offset, program.statements[1].offset)
+
+    def test_deeply_nested_program(self) -> None:
+        depth: int = 5000
+        parser: Parser = Parser(Lexer('-' * depth + 'x;'), iterative=True)
+
+        loaded = deserialize_program(serialize_program(parser.parse_program()))
+
+        expression = cast(ExpressionStatement, loaded.statements[0]).expression
+        for _ in range(depth):
+            self.assertIsInstance(expression, Prefix)
+            expression = cast(Prefix, expression).right
+
+        self.assertIsInstance(expression, Identifier)
+
+    def test_load_program_uses_cache(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = self._write_source(directory, 'programa.lpp', _SOURCE)
+
+            program, errors = load_program(path)
+            self.assertEquals(errors, [])
+            self.assertTrue(os.path.exists(cache_path(path)))
+
+            cached, errors = load_program(path)
+            self.assertEquals(errors, [])
+            self.assertEquals(str(cached), str(program))
+            self.assertEquals(os.listdir(os.path.dirname(cache_path(path))),
+                              [os.path.basename(cache_path(path))])
+
+    def test_changed_source_is_parsed_again(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = self._write_source(directory, 'programa.lpp', 'variable x = 1;')
+            load_program(path)
+
+            self._write_source(directory, 'programa.lpp', 'variable y = 2;')
+            program, _ = load_program(path)
+
+            self.assertEquals(str(program), 'variable y = 2;')
+
+    def test_corrupted_entry_is_ignored(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = self._write_source(directory, 'programa.lpp', 'variable x = 1;')
+            load_program(path)
+
+            with open(cache_path(path), 'wb') as file:
+                file.write(b'LPPC basura')
+
+            program, errors = load_program(path)
+            self.assertEquals(errors, [])
+            self.assertEquals(str(program), 'variable x = 1;')
+
+    def test_damaged_payload_is_ignored(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = self._write_source(directory, 'programa.lpp', 'variable f = 1;')
+            load_program(path)
+
+            with open(cache_path(path), 'rb') as file:
+                entry = file.read()
+
+            # Every single byte corruption, including the ones that would
+            # decode as another program, is a miss.
+            for index in range(len(entry)):
+                damaged = bytearray(entry)
+                damaged[index] ^= 0x01
+                with open(cache_path(path), 'wb') as file:
+                    file.write(damaged)
+
+                program, errors = load_program(path)
+                self.assertEquals(errors, [])
+                self.assertEquals(str(program), 'variable f = 1;')
+
+    def test_programs_with_errors_are_not_cached(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = self._write_source(directory, 'programa.lpp', 'variable x 5;')
+
+            _, errors = load_program(path)
+
+            self.assertEquals(len(errors), 1)
+            self.assertFalse(os.path.exists(cache_path(path)))
+
+    def test_stale_entries_are_evicted(self) -> None:
+        with TemporaryDirectory() as directory:
+            cache_directory = os.path.join(directory, 'cache')
+            first = self._write_source(directory, 'uno.lpp', '1;')
+            second = self._write_source(directory, 'dos.lpp', '2;')
+
+            load_program(first, cache_directory)
+            load_program(second, cache_directory)
+            self.assertEquals(len(os.listdir(cache_directory)), 2)
+
+            os.remove(first)
+            evict_stale_entries(cache_directory)
+
+            self.assertEquals(os.listdir(cache_directory),
+                              [os.path.basename(cache_path(second, cache_directory))])
+
+    def test_entries_of_other_interpreters_are_evicted(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = self._write_source(directory, 'programa.lpp', '1;')
+            load_program(path)
+
+            entry = cache_path(path)
+            cache_directory = os.path.dirname(entry)
+            other = os.path.join(cache_directory, f'programa.lpp.otro{CACHE_SUFFIX}')
+            with open(entry, 'rb') as source, open(other, 'wb') as target:
+                target.write(source.read())
+
+            evict_stale_entries(cache_directory)
+
+            self.assertEquals(os.listdir(cache_directory), [os.path.basename(entry)])
+
+    def _node_types(self, program: Program) -> List[str]:
+        return [type(statement).__name__ for statement in program.statements]
+
+    def _write_source(self, directory: str, name: str, source: str) -> str:
+        path = os.path.join(directory, name)
+
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+
+        return path
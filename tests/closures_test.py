@@ -0,0 +1,46 @@
+from typing import cast
+
+import tests.evaluator_test as evaluator_test
+from lpp.ast import Program
+from lpp.closures import (
+    compile_program,
+    CompiledFunction
+)
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Integer,
+    Object
+)
+from lpp.parser import Parser
+
+
+class ClosuresTest(evaluator_test.EvaluatorTest):
+    """Runs the evaluator tests on programs compiled to closures."""
+
+    def test_compiled_functions(self) -> None:
+        source: str = '''
+            variable fibonacci = procedimiento(n) {
+                si (n < 2) { regresa n; }
+                regresa fibonacci(n - 1) + fibonacci(n - 2);
+            };
+            fibonacci;
+        '''
+        env: Environment = Environment()
+        program: Program = Parser(Lexer(source)).parse_program()
+        run = compile_program(program)
+
+        fibonacci = run(env)
+        self.assertIsInstance(fibonacci, CompiledFunction)
+
+        # The compiled program runs again without being recompiled.
+        call = compile_program(Parser(Lexer('fibonacci(15);')).parse_program())
+        self.assertEquals(cast(Integer, call(env)).value, 610)
+        self.assertIs(cast(CompiledFunction, run(env)).code,
+                      cast(CompiledFunction, fibonacci).code)
+
+    def _evaluate_program(self, program: Program) -> Object:
+        evaluated = compile_program(program)(Environment())
+
+        assert evaluated is not None
+        return evaluated
@@ -0,0 +1,51 @@
+from typing import List
+from unittest import TestCase
+
+from lpp.compiler import (
+    compile_program,
+    disassemble
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+class CompilerTest(TestCase):
+
+    def test_constants_and_names_are_shared(self) -> None:
+        bytecode = compile_program(Parser(Lexer('variable a = 5; a + 5 + a;')).parse_program())
+
+        self.assertEquals([constant.inspect() for constant in bytecode.constants], ['5'])
+        self.assertEquals(bytecode.names, ['a'])
+
+    def test_if_else(self) -> None:
+        source: str = 'si (x < 1) { 10 } sino { regresa 20; };'
+        bytecode = compile_program(Parser(Lexer(source)).parse_program())
+
+        expected: List[str] = [
+            '0000 LOAD_NAME 0 (x)',
+            '0002 LOAD_CONSTANT 0 (1)',
+            '0004 LESS',
+            '0006 JUMP_IF_NOT_TRUTHY 12',
+            '0008 LOAD_CONSTANT 1 (10)',
+            '0010 JUMP 16',
+            '0012 LOAD_CONSTANT 2 (20)',
+            '0014 MAKE_RETURN',
+            '0016 RETURN',
+        ]
+        self.assertEquals(disassemble(bytecode), '\n'.join(expected))
+
+    def test_block_statements(self) -> None:
+        source: str = 'variable a = 1; regresa a; a;'
+        bytecode = compile_program(Parser(Lexer(source)).parse_program())
+
+        expected: List[str] = [
+            '0000 LOAD_CONSTANT 0 (1)',
+            '0002 STORE_NAME 0 (a)',
+            '0004 EXIT_IF_SIGNAL 14',
+            '0006 LOAD_NAME 0 (a)',
+            '0008 MAKE_RETURN',
+            '0010 EXIT_IF_SIGNAL 14',
+            '0012 LOAD_NAME 0 (a)',
+            '0014 RETURN',
+        ]
+        self.assertEquals(disassemble(bytecode), '\n'.join(expected))
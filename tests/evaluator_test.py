@@ -1,13 +1,22 @@
+import gc
 from typing import (
     Any,
     cast,
     List,
+    Optional,
     Tuple,
     Union
 )
 from unittest import TestCase
+from weakref import ref
 
-from lpp.ast import Program
+import lpp.tiering as tiering
+from lpp.ast import (
+    Call,
+    ExpressionStatement,
+    Program
+)
+from lpp.builtins import BUILTINS
 from lpp.evaluator import (
     evaluate,
     NULL
@@ -15,18 +24,44 @@ from lpp.evaluator import (
 from lpp.lexer import Lexer
 from lpp.object import (
     Boolean,
+    Builtin,
+    cache_small_integers,
     Environment,
     Error,
     Function,
     Integer,
+    new_integer,
     Object,
+    SMALL_INTEGERS_MAXIMUM,
+    SMALL_INTEGERS_MINIMUM,
     String
 )
 from lpp.parser import Parser
+from lpp.resolver import resolve
 
 
 class EvaluatorTest(TestCase):
 
+    def test_arguments_bind_in_order(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                variable resta = procedimiento(x, y) {
+                    regresa x - y;
+                };
+                resta(5, 2);
+            ''', 3),
+            ('''
+                variable f = procedimiento(x, y, z) {
+                    regresa x * 100 + y * 10 + z;
+                };
+                f(1, 2, 3);
+            ''', 123),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
     def test_assignment_evaluation(self) -> None:
         tests: List[Tuple[str, Any]] = [
             ('variable x = 5; x;', 5),
@@ -42,6 +77,49 @@ class EvaluatorTest(TestCase):
             elif type(expected) == bool:
                 self._test_boolean_object(evaluated, expected)
 
+    def test_reassignment(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('variable x = 5; x = x + 1; x;', 6),
+            ('variable x = 5; x = "cinco"; x;', 'cinco'),
+            ('''
+                variable x = 1;
+                variable f = procedimiento() { x = x * 10; x };
+                f(); f();
+                x;
+            ''', 100),
+            ('''
+                variable f = procedimiento(n) { n = n + 1; n };
+                variable n = 1;
+                f(n) + n;
+            ''', 3),
+            ('''
+                variable contador = procedimiento() {
+                    variable cuenta = 0;
+                    procedimiento() { cuenta = cuenta + 1; cuenta };
+                };
+                variable c = contador();
+                c(); c();
+                c();
+            ''', 3),
+            ('''
+                variable x = 1;
+                variable f = procedimiento() { x = 2; variable x = 3; x };
+                f() + x;
+            ''', 5),
+            ('variable f = procedimiento() { y = 1; 2 }; f();',
+             'Identificador no encontrado: y'),
+            ('longitud = 1;', 'Identificador no encontrado: longitud'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            if type(expected) == int:
+                self._test_integer_object(evaluated, expected)
+            elif expected.startswith('Identificador'):
+                self._test_error_object(evaluated, expected)
+            else:
+                self._test_string_object(evaluated, expected)
+
     def test_bang_operator(self) -> None:
         tests: List[Tuple[str, bool]] = [
             ('!verdadero', False),
@@ -118,6 +196,13 @@ class EvaluatorTest(TestCase):
             ('x = 4;', 'Identificador no encontrado: x'),
             ('"Foo" - "Bar";',
              'Operador desconocido: STRING - STRING'),
+            ('''
+                variable f = procedimiento() {
+                    regresa si (verdadero) { regresa 5; };
+                };
+                f() + 1;
+            ''',
+            'Discrepancia de tipos: RETURN + INTEGER'),
         ]
 
         for source, expected in tests:
@@ -154,13 +239,46 @@ class EvaluatorTest(TestCase):
                 };
                 a(5, a(2, 1));
             ''', 8),
-            ('procedimiento(x){x}(5)', 5)
+            ('procedimiento(x){x}(5)', 5),
+            ('procedimiento(x){x}(5, 6)', 5),
+            ('procedimiento(x, x){x}(5, 6)', 6),
+            ('''
+                variable a = procedimiento(x, x) {
+                    variable y = x * 2;
+                    procedimiento(z) { x + y + z }
+                };
+                a(1, 2)(3);
+            ''', 9),
         ]
 
         for source, expected in tests:
             evaluated = self._evaluate_tests(source)
             self._test_integer_object(evaluated, expected)
 
+    def test_lazy_function_calls(self) -> None:
+        source: str = '''
+            variable sin_usar = procedimiento(x) { regresa x + ; };
+            variable doble = procedimiento(x) {
+                variable suma = procedimiento(a, b) { a + b };
+                regresa suma(x, x);
+            };
+            doble(doble(3));
+        '''
+        parser: Parser = Parser(Lexer(source), lazy=True)
+        program: Program = parser.parse_program()
+
+        # Errors in bodies that are never called are not reported.
+        self.assertEquals(parser.errors, [])
+        self._test_integer_object(self._evaluate_program(program), 12)
+
+        parser = Parser(Lexer('procedimiento(x) { regresa x + ; }(1);'), lazy=True)
+        evaluated = self._evaluate_program(parser.parse_program())
+
+        self.assertIsInstance(evaluated, Error)
+        self.assertEquals(cast(Error, evaluated).message,
+                          'Error de sintaxis en el procedimiento: '
+                          'No se encontró una función para parsear ;')
+
     def test_function_evaluation(self) -> None:
         source: str = 'procedimiento(x) {x + 2;}'
         evaluated = self._evaluate_tests(source)
@@ -219,7 +337,27 @@ class EvaluatorTest(TestCase):
                     
                     regresa 2;
                 }
-            ''', 1)
+            ''', 1),
+            ('''
+                variable f = procedimiento(x) {
+                    si (x > 1) {
+                        si (x > 2) {
+                            regresa 3;
+                        }
+                        regresa 2;
+                    }
+                    1
+                };
+                f(3) * 100 + f(2) * 10 + f(1);
+            ''', 321),
+            ('''
+                variable f = procedimiento() {
+                    variable g = procedimiento() { regresa 1; };
+                    g();
+                    2
+                };
+                f();
+            ''', 2),
         ]
 
         for source, expected in tests:
@@ -269,6 +407,106 @@ class EvaluatorTest(TestCase):
             evaluated = self._evaluate_tests(source)
             self._test_boolean_object(evaluated, expected)
 
+    def test_tail_calls(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('''
+                variable loop = procedimiento(n, total) {
+                    si (n == 0) { regresa total; }
+                    regresa loop(n - 1, total + 1);
+                };
+                loop(20000, 0);
+            ''', 20000),
+            ('''
+                variable loop = procedimiento(n, total) {
+                    si (n == 0) { total } sino { loop(n - 1, total + 1) }
+                };
+                loop(20000, 0);
+            ''', 20000),
+            ('''
+                variable par = procedimiento(n) {
+                    si (n == 0) { regresa 1; }
+                    regresa impar(n - 1);
+                };
+                variable impar = procedimiento(n) {
+                    si (n == 0) { regresa 0; }
+                    par(n - 1)
+                };
+                par(30001);
+            ''', 0),
+            ('''
+                variable identidad = procedimiento(x) { regresa x; };
+                variable f = procedimiento() { identidad(si (verdadero) { regresa 3; }) };
+                f() + 1;
+            ''', 4),
+            ('''
+                variable identidad = procedimiento(x) { regresa x; };
+                variable f = procedimiento() { regresa identidad(si (verdadero) { regresa 3; }); };
+                variable g = procedimiento() { f() };
+                g();
+            ''', 3),
+            ('variable f = procedimiento(s) { longitud(s) }; f("abc");', 3),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_while_loop(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('''
+                variable i = 0;
+                variable suma = 0;
+                mientras (i < 10) {
+                    i = i + 1;
+                    suma = suma + i;
+                }
+                suma;
+            ''', 55),
+            ('''
+                variable factorial = procedimiento(n) {
+                    variable resultado = 1;
+                    mientras (n > 1) {
+                        resultado = resultado * n;
+                        n = n - 1;
+                    }
+                    resultado
+                };
+                factorial(10);
+            ''', 3628800),
+            ('''
+                variable busca = procedimiento(limite) {
+                    variable i = 0;
+                    mientras (verdadero) {
+                        si (i * i > limite) { regresa i; }
+                        i = i + 1;
+                    }
+                };
+                busca(50);
+            ''', 8),
+            ('''
+                variable i = 0;
+                variable j = 0;
+                mientras (i < 3) {
+                    variable k = 0;
+                    mientras (k < 4) { k = k + 1; j = j + 1; }
+                    i = i + 1;
+                }
+                j;
+            ''', 12),
+            ('variable x = 3; mientras (falso) { x = 4; } x;', 3),
+            ('mientras (1 < 2) { regresa 7; } 8;', 7),
+            ('mientras (1 < verdadero) { 1 }; 8;', 'Discrepancia de tipos: INTEGER < BOOLEAN'),
+            ('variable i = 0; mientras (i < 5) { i = i + 1; i + falso; } i;',
+             'Discrepancia de tipos: INTEGER + BOOLEAN'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            if type(expected) == int:
+                self._test_integer_object(evaluated, expected)
+            else:
+                self._test_error_object(evaluated, expected)
+
     def _test_string_object(self, evaluated: Object, expected: str) -> None:
         self.assertIsInstance(evaluated, String)
 
@@ -279,6 +517,10 @@ class EvaluatorTest(TestCase):
         lexer: Lexer = Lexer(source)
         parser: Parser = Parser(lexer)
         program: Program = parser.parse_program()
+
+        return self._evaluate_program(program)
+
+    def _evaluate_program(self, program: Program) -> Object:
         env: Environment = Environment()
 
         evaluated = evaluate(program, env)
@@ -300,3 +542,206 @@ class EvaluatorTest(TestCase):
     
     def _test_null_object(self, evaluated: Object) -> None:
         self.assertEquals(evaluated, NULL)
+
+
+class TailCallTest(TestCase):
+    """Tail calls of the evaluator, with and without tiering."""
+
+    def test_tail_recursion_runs_in_constant_stack(self) -> None:
+        tests: List[str] = [
+            '''
+                variable cuenta = procedimiento(n, total) {
+                    si (n == 0) { regresa total; }
+                    regresa cuenta(n - 1, total + 1);
+                };
+                cuenta(20000, 0);
+            ''',
+            '''
+                variable cuenta = procedimiento(n, total) {
+                    si (n == 0) { total } sino { cuenta(n - 1, total + 1) }
+                };
+                cuenta(20000, 0);
+            ''',
+        ]
+
+        for source in tests:
+            for threshold in [0, tiering.THRESHOLD]:
+                self._test_integer_object(self._evaluate(source, threshold), 20000)
+
+    def test_mutual_tail_recursion(self) -> None:
+        source: str = '''
+            variable par = procedimiento(n) {
+                si (n == 0) { regresa verdadero; }
+                regresa impar(n - 1);
+            };
+            variable impar = procedimiento(n) {
+                si (n == 0) { regresa falso; }
+                par(n - 1)
+            };
+            par(30001);
+        '''
+
+        for threshold in [0, tiering.THRESHOLD]:
+            evaluated = self._evaluate(source, threshold)
+
+            self.assertIsInstance(evaluated, Boolean)
+            self.assertEquals(cast(Boolean, evaluated).value, False)
+
+    def test_tail_call_unwraps_like_a_call(self) -> None:
+        # The body of f ends in a call that returns a Return value, which f
+        # unwraps like it would without the tail call.
+        source: str = '''
+            variable identidad = procedimiento(x) { regresa x; };
+            variable f = procedimiento() { identidad(si (verdadero) { regresa 3; }) };
+            f() + 1;
+        '''
+
+        for threshold in [0, 1]:
+            self._test_integer_object(self._evaluate(source, threshold), 4)
+
+    def test_non_tail_calls(self) -> None:
+        source: str = '''
+            variable doble = procedimiento(x) { x * 2 };
+            variable f = procedimiento(x) {
+                si (doble(x) > 4) { doble(x); 1 } sino { 2 }
+            };
+            f(3) + f(1);
+        '''
+
+        self._test_integer_object(self._evaluate(source, 0), 3)
+
+    def _evaluate(self, source: str, threshold: int) -> Object:
+        previous = tiering.THRESHOLD
+        tiering.THRESHOLD = threshold
+        try:
+            evaluated = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        finally:
+            tiering.THRESHOLD = previous
+
+        assert evaluated is not None
+        return evaluated
+
+    def _test_integer_object(self, evaluated: Object, expected: int) -> None:
+        self.assertIsInstance(evaluated, Integer)
+
+        evaluated = cast(Integer, evaluated)
+        self.assertEquals(evaluated.value, expected)
+
+
+class SharedValuesTest(TestCase):
+
+    def test_small_integers_are_shared(self) -> None:
+        self.assertIs(new_integer(-5), new_integer(-5))
+        self.assertIs(new_integer(1024), new_integer(1024))
+        self.assertIsNot(new_integer(1025), new_integer(1025))
+
+        program: Program = Parser(Lexer('512 * 2; 600 + 600;')).parse_program()
+        first, second = [evaluate(statement, Environment()) for statement in program.statements]
+        again, _ = [evaluate(statement, Environment()) for statement in program.statements]
+
+        self.assertIs(first, again)
+        self.assertEquals(cast(Integer, second).value, 1200)
+
+    def test_cached_range(self) -> None:
+        minimum, maximum = SMALL_INTEGERS_MINIMUM, SMALL_INTEGERS_MAXIMUM
+        cache_small_integers(0, 10)
+        try:
+            self.assertIs(new_integer(10), new_integer(10))
+            self.assertIsNot(new_integer(-1), new_integer(-1))
+            self.assertIsNot(new_integer(11), new_integer(11))
+        finally:
+            cache_small_integers(minimum, maximum)
+
+    def test_literals_are_shared(self) -> None:
+        program: Program = Parser(Lexer('"lpp"; 1025;')).parse_program()
+
+        for statement in program.statements:
+            evaluated = evaluate(statement, Environment())
+            self.assertIs(evaluate(statement, Environment()), evaluated)
+
+
+class InlineCacheTest(TestCase):
+    """Call sites remember their callee while the program environment keeps
+    its bindings, and how to bind arguments to the procedimiento seen."""
+
+    def test_callee_is_cached(self) -> None:
+        program = self._parse('longitud("abc");')
+        env = Environment()
+
+        self._test_integer_object(evaluate(program, env), 3)
+        cache = self._call(program).cache
+        self.assertEquals(cache.version, env.version)
+        self.assertIs(cache.callee(), BUILTINS['longitud'])
+
+    def test_callee_is_not_kept_alive(self) -> None:
+        program = self._parse('variable f = procedimiento(x) { x }; f(1);')
+        env = Environment()
+
+        self._test_integer_object(evaluate(program, env), 1)
+        function = ref(env['f'])
+        del env
+        gc.collect()
+        self.assertIsNone(function())
+
+    def test_rebinding_invalidates_the_callee(self) -> None:
+        program = self._parse('''
+            variable f = procedimiento(x) { x };
+            variable g = procedimiento(x) { f(x) + longitud("ab") };
+            variable a = g(1);
+            variable f = procedimiento(x) { x * 10 };
+            variable b = g(1);
+            variable longitud = procedimiento(s) { 0 };
+            variable c = g(1);
+            a + b * 100 + c * 10000;
+        ''')
+
+        self._test_integer_object(evaluate(program, Environment()), 3 + 1200 + 100000)
+
+    def test_environments_do_not_share_callees(self) -> None:
+        program = self._parse('f(0);')
+
+        for expected in [1, 2, 1]:
+            env = Environment()
+            env['f'] = Builtin(fn=lambda *args, value=expected: new_integer(value))
+            self._test_integer_object(evaluate(program, env), expected)
+
+    def test_binding_plan_follows_the_callee(self) -> None:
+        program = self._parse('''
+            variable aplica = procedimiento(f, x) { f(x) };
+            variable doble = procedimiento(a) { variable b = a * 2; b };
+            variable siguiente = procedimiento(a) { a + 1 };
+            variable suma = procedimiento(a, b) { a + b };
+            aplica(doble, 3) + aplica(siguiente, 3) + aplica(doble, 5) + aplica(suma, 1);
+        ''')
+
+        with self.assertRaises(IndexError):
+            evaluate(program, Environment())
+
+        program = self._parse('''
+            variable aplica = procedimiento(f, x) { f(x) };
+            variable doble = procedimiento(a) { variable b = a * 2; b };
+            variable siguiente = procedimiento(a) { a + 1 };
+            variable primero = procedimiento(a) { a };
+            aplica(doble, 3) + aplica(siguiente, 3) + aplica(doble, 5) + aplica(primero, 7, 8);
+        ''')
+
+        self._test_integer_object(evaluate(program, Environment()), 6 + 4 + 10 + 7)
+
+    def _call(self, program: Program) -> Call:
+        statement = program.statements[-1]
+        assert type(statement) is ExpressionStatement
+
+        return cast(Call, statement.expression)
+
+    def _parse(self, source: str) -> Program:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        self.assertEquals(parser.errors, [])
+
+        return resolve(program)
+
+    def _test_integer_object(self, evaluated: Optional[Object], expected: int) -> None:
+        self.assertIsInstance(evaluated, Integer)
+
+        evaluated = cast(Integer, evaluated)
+        self.assertEquals(evaluated.value, expected)
@@ -0,0 +1,174 @@
+from typing import (
+    cast,
+    List,
+    Optional
+)
+from unittest import TestCase
+
+from lpp.ast import (
+    ASTNode,
+    Infix,
+    Prefix,
+    Program
+)
+from lpp.evaluator import evaluate
+from lpp.inference import (
+    InferenceStatistics,
+    TypeInference
+)
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.resolver import (
+    children,
+    resolve
+)
+
+
+class InferenceTest(TestCase):
+
+    def test_literals_and_results_of_operations(self) -> None:
+        statistics = self._statistics('''
+            1 + 2 * 3;
+            "a" + "b" < "c";
+            -1 < 2 == verdadero;
+            !verdadero != falso;
+        ''')
+
+        self.assertEquals(statistics, InferenceStatistics(integer=4, string=2, boolean=3, dynamic=0))
+
+    def test_variables(self) -> None:
+        specialized = self._specialized('''
+            variable a = 1;
+            variable b = "b";
+            variable c = a * 2;
+            a + c;
+            b + "c";
+            a + longitud(b);
+            a + otro;
+        ''')
+
+        self.assertEquals(specialized, [
+            ('(a * 2)', True),
+            ('(a + c)', True),
+            ('(b + c)', True),
+            ('(a + longitud(b))', False),
+            ('(a + otro)', False),
+        ])
+
+    def test_parameters_used_arithmetically(self) -> None:
+        specialized = self._specialized('''
+            variable fibonacci = procedimiento(n) {
+                si (n < 2) { regresa n; }
+                fibonacci(n - 1) + fibonacci(n - 2)
+            };
+            variable saluda = procedimiento(nombre) { "hola " + nombre };
+            variable igual = procedimiento(x, y) { x == y };
+        ''')
+
+        self.assertEquals(specialized, [
+            ('(n < 2)', True),
+            ('(fibonacci((n - 1)) + fibonacci((n - 2)))', False),
+            ('(n - 1)', True),
+            ('(n - 2)', True),
+            ('(hola  + nombre)', True),
+            ('(x == y)', False),
+        ])
+
+    def test_parameters_take_the_kinds_of_arguments(self) -> None:
+        specialized = self._specialized('''
+            variable suma = procedimiento(n, total) {
+                si (n == 0) { regresa total; }
+                suma(n - 1, total + n)
+            };
+            suma(10, 0);
+        ''')
+
+        self.assertEquals(specialized, [('(n == 0)', True),
+                                        ('(n - 1)', True),
+                                        ('(total + n)', True)])
+
+    def test_conflicting_uses_are_dynamic(self) -> None:
+        specialized = self._specialized('''
+            variable a = 1;
+            variable a = "a";
+            a + a;
+            variable f = procedimiento(x) { x - 1; x + "uno" };
+        ''')
+
+        self.assertEquals(specialized, [('(a + a)', False),
+                                        ('(x - 1)', False),
+                                        ('(x + uno)', False)])
+
+    def test_scopes(self) -> None:
+        specialized = self._specialized('''
+            variable x = "x";
+            variable f = procedimiento(x) { x * 2 };
+            variable g = procedimiento() { x + "y" };
+        ''')
+
+        self.assertEquals(specialized, [('(x * 2)', True), ('(x + y)', True)])
+
+    def test_specialized_operations_fall_back(self) -> None:
+        tests = [
+            ('variable f = procedimiento(n) { n - 1 }; f("a")',
+             'Error: Discrepancia de tipos: STRING - INTEGER'),
+            ('variable f = procedimiento(n) { n - 1 }; f(verdadero)',
+             'Error: Discrepancia de tipos: BOOLEAN - INTEGER'),
+            ('variable f = procedimiento(n) { -n }; f("a")',
+             'Error: Operador desconocido: -STRING'),
+            ('variable f = procedimiento(s) { s + "b" }; f(1)',
+             'Error: Discrepancia de tipos: INTEGER + STRING'),
+            ('variable f = procedimiento(b) { b == verdadero }; f(1)', 'falso'),
+            ('variable f = procedimiento(n) { n < 2 }; f(1)', 'verdadero'),
+            ('variable f = procedimiento(s) { s + "b" }; f("a")', 'ab'),
+            ('variable f = procedimiento(b) { !b == falso }; f(si (falso) { 1 })',
+             'falso'),
+        ]
+
+        for source, expected in tests:
+            program = self._parse(source)
+            TypeInference().specialize(program)
+
+            evaluated = evaluate(program, Environment())
+
+            assert evaluated is not None
+            self.assertEquals(evaluated.inspect(), expected)
+
+    def test_statistics_add_up(self) -> None:
+        inference = TypeInference()
+        inference.specialize(self._parse('1 + 2; a + b;'))
+        inference.specialize(self._parse('"a" == "b";'))
+
+        self.assertEquals(inference.statistics,
+                          InferenceStatistics(integer=1, string=1, boolean=0, dynamic=1))
+
+    def _operations(self, node: Optional[ASTNode], operations: List[ASTNode]) -> None:
+        if type(node) is Infix or type(node) is Prefix:
+            operations.append(cast(ASTNode, node))
+
+        for child in children(node):
+            self._operations(child, operations)
+
+    def _parse(self, source: str) -> Program:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        self.assertEquals(parser.errors, [])
+
+        return resolve(program)
+
+    def _specialized(self, source: str) -> List[tuple]:
+        program = self._parse(source)
+        TypeInference().specialize(program)
+
+        operations: List[ASTNode] = []
+        self._operations(program, operations)
+
+        return [(str(node), node.specialization is not None)  # type: ignore
+                for node in operations]
+
+    def _statistics(self, source: str) -> InferenceStatistics:
+        inference = TypeInference()
+        inference.specialize(self._parse(source))
+
+        return inference.statistics
@@ -1,8 +1,12 @@
+import os
+from io import StringIO
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from typing import List
 
 from lpp.token import (
     Token,
+    TokenBuffer,
     TokenType
 )
 from lpp.lexer import Lexer
@@ -190,6 +194,33 @@ class LexerTest(TestCase):
 
         return self.assertEquals(tokens, expected_tokens)
 
+    def test_loop_statement(self) -> None:
+        source: str = 'mientras (x > 0) { x = x - 1; }'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for i in range(14):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.WHILE, 'mientras'),
+            Token(TokenType.LPAREN, '('),
+            Token(TokenType.IDENT, 'x'),
+            Token(TokenType.GT, '>'),
+            Token(TokenType.INT, '0'),
+            Token(TokenType.RPAREN, ')'),
+            Token(TokenType.LBRACE, '{'),
+            Token(TokenType.IDENT, 'x'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.IDENT, 'x'),
+            Token(TokenType.MINUS, '-'),
+            Token(TokenType.INT, '1'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.RBRACE, '}'),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
     def test_two_character_operator(self) -> None:
         source: str = '''
             10 == 10;
@@ -243,3 +274,101 @@ class LexerTest(TestCase):
         ]
         
 
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_identifiers_and_numbers(self) -> None:
+        source: str = 'año_2 ÁRBOL\t\n  _x9 42abc'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for _ in range(6):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.IDENT, 'año_2'),
+            Token(TokenType.IDENT, 'ÁRBOL'),
+            Token(TokenType.IDENT, '_x9'),
+            Token(TokenType.INT, '42'),
+            Token(TokenType.IDENT, 'abc'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_unterminated_string(self) -> None:
+        source: str = '\'uno "dos\' "tres'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for _ in range(4):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.STRING, 'uno "dos'),
+            Token(TokenType.STRING, 'tres'),
+            Token(TokenType.EOF, ''),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_stream_chunk_boundaries(self) -> None:
+        source: str = '''
+            variable número = procedimiento(x) {
+                si (x <= 10 != falso) { regresa "cadena larga"; }
+            };
+            número(5) >= 'fin'
+        '''
+        expected_tokens = self._tokenize(Lexer(source))
+
+        for chunk_size in [1, 2, 3, 7]:
+            lexer = Lexer.from_stream(StringIO(source), chunk_size=chunk_size)
+            self.assertEquals(self._tokenize(lexer), expected_tokens)
+
+    def test_memory_mapped_file(self) -> None:
+        source: str = 'variable año = "ñandú €"; año != ÁÉ;'
+        expected_tokens = self._tokenize(Lexer(source))
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'programa.lpp')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(source)
+
+            for chunk_size in [1, 2, 5, 4096]:
+                lexer = Lexer.from_file(path, chunk_size=chunk_size)
+                self.assertEquals(self._tokenize(lexer), expected_tokens)
+
+    def test_empty_file(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vacío.lpp')
+            open(path, 'w').close()
+
+            lexer = Lexer.from_file(path)
+            self.assertEquals(lexer.next_token(), Token(TokenType.EOF, ''))
+
+    def _tokenize(self, lexer: Lexer) -> List[Token]:
+        tokens: List[Token] = []
+
+        while (token := lexer.next_token()).token_type is not TokenType.EOF:
+            tokens.append(token)
+
+        tokens.append(token)
+        return tokens
+
+    def test_tokenize(self) -> None:
+        source: str = '''
+            variable x = procedimiento(a, b) { regresa a >= b; };
+            x(1, "dos") != 'tres' ¡
+        '''
+        expected_tokens = self._tokenize(Lexer(source))
+
+        buffer: TokenBuffer = Lexer(source).tokenize()
+
+        self.assertEquals(len(buffer), len(expected_tokens))
+        self.assertEquals([buffer[i] for i in range(len(buffer))], expected_tokens)
+        self.assertEquals(buffer.literal(1), 'x')
+        self.assertEquals(buffer.token_type(2), TokenType.ASSIGN)
+
+        tokens = buffer.tokens()
+        self.assertEquals([next(tokens) for _ in expected_tokens], expected_tokens)
+        self.assertEquals(next(tokens), Token(TokenType.EOF, ''))
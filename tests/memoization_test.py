@@ -0,0 +1,224 @@
+import gc
+from typing import (
+    cast,
+    Dict,
+    Optional,
+    Tuple
+)
+from unittest import TestCase
+
+import lpp.builtins as builtins
+import lpp.memoization as memoization
+from lpp.ast import (
+    Function as FunctionNode,
+    LetStatement,
+    Program
+)
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.memoization import mark_pure
+from lpp.object import (
+    Boolean,
+    Builtin,
+    Environment,
+    Function,
+    Integer
+)
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+class MemoizationTest(TestCase):
+
+    def setUp(self) -> None:
+        self._size = memoization.SIZE
+
+    def tearDown(self) -> None:
+        memoization.SIZE = self._size
+
+    def test_pure_procedimientos(self) -> None:
+        dependencies = self._dependencies('''
+            variable limite = 10 * 10;
+            variable fibonacci = procedimiento(n) {
+                si (n < 2) { regresa n; }
+                fibonacci(n - 1) + fibonacci(n - 2)
+            };
+            variable acotado = procedimiento(n) {
+                variable m = fibonacci(n);
+                si (m > limite) { limite } sino { m }
+            };
+            variable texto = procedimiento(s) { longitud(s) + otro };
+            variable doble = procedimiento(x) { procedimiento(y) { x * y } };
+        ''')
+
+        self.assertEquals(dependencies, {
+            'fibonacci': ('fibonacci',),
+            'acotado': ('fibonacci', 'limite'),
+            'texto': (),
+            'doble': (),
+        })
+
+    def test_impure_procedimientos(self) -> None:
+        source = '''
+            variable contador = crear();
+            variable leer = procedimiento() { contador };
+            variable usar = procedimiento(x) { leer() + x };
+            variable f = procedimiento(x) { x };
+            variable f = g(1);
+            variable usa_f = procedimiento(x) { f(x) };
+            variable escribir = procedimiento(x) { imprime(x) };
+        '''
+
+        builtins.BUILTINS['imprime'] = Builtin(fn=lambda *args: args[0])
+        try:
+            dependencies = self._dependencies(source)
+        finally:
+            del builtins.BUILTINS['imprime']
+
+        self.assertEquals(dependencies, {
+            'leer': None,
+            'usar': None,
+            'f': (),
+            'usa_f': None,
+            'escribir': None,
+        })
+
+    def test_procedimientos_that_assign(self) -> None:
+        dependencies = self._dependencies('''
+            variable total = 0;
+            variable suma = procedimiento(n) {
+                variable resultado = 0;
+                mientras (n > 0) {
+                    resultado = resultado + n;
+                    n = n - 1;
+                }
+                resultado
+            };
+            variable acumula = procedimiento(n) { total = total + n; total };
+            variable antes = procedimiento(n) { m = n; variable m = 0; m };
+        ''')
+
+        self.assertEquals(dependencies, {
+            'suma': (),
+            'acumula': None,
+            'antes': None,
+        })
+
+    def test_deferred_bodies_are_not_marked(self) -> None:
+        parser = Parser(Lexer('variable f = procedimiento(x) { x };'), lazy=True)
+        program = parser.parse_program()
+
+        self.assertEquals(mark_pure(program), 0)
+
+    def test_calls_are_cached(self) -> None:
+        env = self._run('''
+            variable fibonacci = procedimiento(n) {
+                si (n < 2) { regresa n; }
+                fibonacci(n - 1) + fibonacci(n - 2)
+            };
+            variable resultado = fibonacci(60);
+        ''')
+
+        self.assertEquals(cast(Integer, env['resultado']).value, 1548008755920)
+
+        memo = cast(Function, env['fibonacci']).memo
+        self.assertEquals((memo.hits, memo.misses, memo.evictions), (58, 61, 0))
+        self.assertEquals(len(memo.results), 61)
+
+    def test_least_recently_used_results_are_evicted(self) -> None:
+        memoization.SIZE = 2
+        env = self._run('''
+            variable doble = procedimiento(x) { x * 2 };
+            doble(1); doble(2); doble(1); doble(3); doble(2);
+        ''')
+
+        memo = cast(Function, env['doble']).memo
+        self.assertEquals((memo.hits, memo.misses, memo.evictions), (1, 4, 2))
+        self.assertEquals(list(memo.results), [(Integer, 3), (Integer, 2)])
+
+    def test_arguments_are_compared_by_value(self) -> None:
+        env = self._run('''
+            variable igual = procedimiento(x) { x == 1 };
+            variable a = igual(1);
+            variable b = igual(verdadero);
+            variable c = igual("1");
+            variable d = igual(1);
+        ''')
+
+        self.assertEquals([cast(Boolean, env[name]).value for name in 'abcd'],
+                          [True, False, False, True])
+        self.assertEquals(cast(Function, env['igual']).memo.hits, 1)
+
+    def test_results_depend_on_top_level_names(self) -> None:
+        env = self._run('''
+            variable suma = procedimiento(x) { x + base };
+            variable a = suma(1);
+            variable base = 1;
+            variable b = suma(1);
+            variable c = suma(1);
+            variable base = 10;
+            variable d = suma(1);
+        ''')
+
+        self.assertEquals(env['a'].inspect(),
+                          'Error: Discrepancia de tipos: INTEGER + ERROR')
+        self.assertEquals([cast(Integer, env[name]).value for name in 'bcd'], [2, 2, 11])
+
+        memo = cast(Function, env['suma']).memo
+        self.assertEquals((memo.hits, memo.misses, memo.invalidations), (1, 3, 1))
+
+    def test_errors_and_procedimientos_are_not_cached(self) -> None:
+        env = self._run('''
+            variable falla = procedimiento(x) { x + verdadero };
+            variable crea = procedimiento(x) { procedimiento() { x } };
+            variable errores = falla(1) == falla(1);
+            variable procedimientos = crea(1) == crea(1);
+        ''')
+
+        self.assertEquals(cast(Boolean, env['errores']).value, False)
+        self.assertEquals(cast(Boolean, env['procedimientos']).value, False)
+        self.assertEquals(len(cast(Function, env['falla']).memo.results), 0)
+
+    def test_statistics(self) -> None:
+        gc.collect()
+        env = self._run('''
+            variable doble = procedimiento(x) { x * 2 };
+            doble(1); doble(1); doble(2);
+        ''')
+
+        statistics = [statistics for statistics in memoization.statistics()
+                      if statistics.procedimiento.startswith('procedimiento(x)')]
+        self.assertEquals(len(statistics), 1)
+        self.assertEquals(statistics[0].hits, 1)
+        self.assertEquals(statistics[0].misses, 2)
+        self.assertEquals(statistics[0].size, 2)
+        self.assertIsNotNone(env['doble'])
+
+    def _dependencies(self, source: str) -> Dict[str, Optional[Tuple[str, ...]]]:
+        program = self._parse(source)
+        mark_pure(program)
+
+        dependencies: Dict[str, Optional[Tuple[str, ...]]] = {}
+        for statement in program.statements:
+            statement = cast(LetStatement, statement)
+            if type(statement.value) is FunctionNode:
+                assert statement.name is not None
+                dependencies[statement.name.value] = statement.value.dependencies
+
+        return dependencies
+
+    def _parse(self, source: str) -> Program:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        self.assertEquals(parser.errors, [])
+
+        return resolve(program)
+
+    def _run(self, source: str) -> Environment:
+        program = self._parse(source)
+        mark_pure(program)
+
+        env = Environment()
+        evaluate(program, env)
+
+        return env
@@ -0,0 +1,168 @@
+from typing import (
+    cast,
+    List,
+    Tuple
+)
+from unittest import TestCase
+
+from lpp.ast import (
+    Block,
+    ExpressionStatement,
+    If,
+    Program
+)
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Error,
+    Integer
+)
+from lpp.optimizer import (
+    Optimizer,
+    OptimizerStatistics
+)
+from lpp.parser import Parser
+
+
+class OptimizerTest(TestCase):
+
+    def test_constant_folding(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('2 * 60 * 60;', '7200'),
+            ('-(-5);', '5'),
+            ('7 / 2 - 1;', '2'),
+            ('(1 + 2) < 4;', 'verdadero'),
+            ('!5;', 'falso'),
+            ('verdadero == falso;', 'falso'),
+            ('1 == verdadero;', 'falso'),
+            ('"a" + "b";', 'ab'),
+            ('"a" < "b";', 'verdadero'),
+            ('x + 2 * 3;', '(x + 6)'),
+        ]
+
+        for source, expected in tests:
+            program, statistics = self._optimize(source)
+
+            self.assertEquals(str(program), expected)
+            self.assertGreater(statistics.folded, 0)
+
+    def test_errors_are_not_folded(self) -> None:
+        tests: List[str] = [
+            '(1 / 0)',
+            '(5 + verdadero)',
+            '(-verdadero)',
+            '("a" - "b")',
+            '(verdadero < falso)',
+        ]
+
+        for source in tests:
+            unoptimized = str(Parser(Lexer(f'{source};')).parse_program())
+            program, statistics = self._optimize(f'{source};')
+
+            self.assertEquals(str(program), unoptimized)
+            self.assertEquals(statistics.folded, 0)
+
+    def test_algebraic_simplification(self) -> None:
+        tests: List[Tuple[str, str, int]] = [
+            ('(1 / 0) * 1;', '(1 / 0)', 1),
+            ('0 + (1 / 0);', '(1 / 0)', 1),
+            ('-(-(1 / 0));', '(1 / 0)', 1),
+            ('!(!(2 < (1 / 0)));', '(2 < (1 / 0))', 1),
+            # Unless x is an integer, these evaluate to an error.
+            ('x * 1;', '(x * 1)', 0),
+            ('-(-x);', '(-(-x))', 0),
+            ('!(!x);', '(!(!x))', 0),
+        ]
+
+        for source, expected, simplified in tests:
+            program, statistics = self._optimize(source)
+
+            self.assertEquals(str(program), expected)
+            self.assertEquals(statistics.simplified, simplified)
+
+    def test_branch_pruning(self) -> None:
+        program, statistics = self._optimize('si (1 < 2) { x } sino { y };')
+
+        expression = cast(ExpressionStatement, program.statements[0]).expression
+        self.assertIsInstance(expression, Block)
+        self.assertEquals(str(expression), 'x')
+        self.assertEquals(statistics.pruned, 1)
+
+        program, statistics = self._optimize('si (falso) { x } sino { y };')
+        self.assertEquals(str(program), 'y')
+
+        program, statistics = self._optimize('si (falso) { x };')
+        expression = cast(ExpressionStatement, program.statements[0]).expression
+        self.assertIsInstance(expression, If)
+        self.assertEquals(cast(If, expression).consequence.statements, [])  # type: ignore
+        self.assertEquals(statistics.pruned, 1)
+
+        program, statistics = self._optimize('mientras (1 > 2) { x = x + 1; } x;')
+        self.assertEquals(str(program), 'mientras falso x')
+        self.assertEquals(statistics.pruned, 1)
+
+        program, statistics = self._optimize('si (x) { 1 } sino { 2 };')
+        self.assertIsInstance(cast(ExpressionStatement, program.statements[0]).expression, If)
+        self.assertEquals(statistics.pruned, 0)
+
+    def test_unreachable_statements(self) -> None:
+        program, statistics = self._optimize('''
+            procedimiento(x) {
+                si (x) { regresa 1; 2; 3; }
+                regresa x;
+                x + 1;
+            };
+        ''')
+
+        self.assertEquals(str(program), 'procedimiento(x) si x regresa 1;regresa x;')
+        self.assertEquals(statistics.unreachable, 3)
+
+    def test_switches(self) -> None:
+        source: str = 'si (verdadero) { regresa (1 / 0) * (2 + 3); 4; };'
+        tests: List[Tuple[Optimizer, OptimizerStatistics]] = [
+            (Optimizer(), OptimizerStatistics(1, 0, 1, 1)),
+            (Optimizer(fold_constants=False), OptimizerStatistics(0, 0, 1, 1)),
+            (Optimizer(prune_branches=False), OptimizerStatistics(1, 0, 0, 1)),
+            (Optimizer(remove_unreachable=False), OptimizerStatistics(1, 0, 1, 0)),
+            (Optimizer(False, False, False, False), OptimizerStatistics(0, 0, 0, 0)),
+        ]
+
+        for optimizer, expected in tests:
+            optimizer.optimize(Parser(Lexer(source)).parse_program())
+
+            self.assertEquals(optimizer.statistics, expected)
+
+    def test_optimized_programs_evaluate_alike(self) -> None:
+        source: str = '''
+            variable horas = procedimiento(h) { h * 60 * 60 };
+            variable f = procedimiento(x) {
+                si (verdadero) { regresa horas(x) + -(-1); } sino { regresa x / 0; }
+                x / 0;
+            };
+            f(2);
+        '''
+        program, _ = self._optimize(source)
+        evaluated = evaluate(program, Environment())
+
+        self.assertEquals(cast(Integer, evaluated).value, 7201)
+
+        program, _ = self._optimize('variable x = 1 / 0 + 0; x;')
+        with self.assertRaises(ZeroDivisionError):
+            evaluate(program, Environment())
+
+        source = 'variable b = verdadero; -(-b) + b * 1;'
+        program, _ = self._optimize(source)
+        unoptimized = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        evaluated = evaluate(program, Environment())
+        self.assertEquals(cast(Error, evaluated).message, cast(Error, unoptimized).message)
+
+    def _optimize(self, source: str) -> Tuple[Program, OptimizerStatistics]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+        self.assertEquals(parser.errors, [])
+
+        optimizer = Optimizer()
+        optimizer.optimize(program)
+
+        return program, optimizer.statistics
@@ -1,16 +1,20 @@
+import io
 from typing import (
     cast,
     List,
     Any,
     Tuple,
-    Type
+    Type,
+    Union
 )
 
 from unittest import TestCase
 from lpp.ast import (
+    AssignmentStatement,
     Block,
     Boolean,
     Call,
+    DeferredBlock,
     Expression,
     ExpressionStatement,
     Function,
@@ -22,13 +26,46 @@ from lpp.ast import (
     ReturnStatement,
     StringLiteral,
     LetStatement,
-    Program
+    Program,
+    While
 )
 from lpp.lexer import Lexer
-from lpp.parser import Parser
+from lpp.parser import (
+    parse_deferred_block,
+    Parser
+)
+from lpp.token import TokenBuffer
 
 class ParserTest(TestCase):
 
+    def test_assignment_statements(self) -> None:
+        source: str = '''
+            x = 5;
+            y = x
+            variable z = 1;
+        '''
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(parser.errors, [])
+        self.assertEquals(len(program.statements), 3)
+
+        for statement, (expected_identifier, expected_value) in zip(
+            program.statements, [('x', 5), ('y', 'x')]):
+            self.assertIsInstance(statement, AssignmentStatement)
+
+            assignment = cast(AssignmentStatement, statement)
+
+            assert assignment.name is not None
+            self._test_identifier(assignment.name, expected_identifier)
+
+            assert assignment.value is not None
+            self._test_literal_expression(assignment.value, expected_value)
+
+        self.assertIsInstance(program.statements[2], LetStatement)
+
     def test_boolean_expression(self) -> None:
         source: str = 'verdadero; falso;'
         lexer: Lexer = Lexer(source)
@@ -79,10 +116,11 @@ class ParserTest(TestCase):
         self._test_literal_expression(function_literal.parameters[0], 'x')
         self._test_literal_expression(function_literal.parameters[1], 'y')
 
-        assert function_literal.body is not None
-        self.assertEquals(len(function_literal.body.statements), 1)
+        self.assertIsInstance(function_literal.body, Block)
+        function_body = cast(Block, function_literal.body)
+        self.assertEquals(len(function_body.statements), 1)
 
-        body = cast(ExpressionStatement, function_literal.body.statements[0])
+        body = cast(ExpressionStatement, function_body.statements[0])
         assert body.expression is not None
         self._test_infix_expression(body.expression, 'x', '+', 'y')
     
@@ -264,13 +302,137 @@ class ParserTest(TestCase):
         ]
 
         for source, expected_result, expected_statement_count in test_sources:
-            lexer: Lexer = Lexer(source)
-            parser: Parser = Parser(lexer)
+            for iterative in [False, True]:
+                lexer: Lexer = Lexer(source)
+                parser: Parser = Parser(lexer, iterative=iterative)
+
+                program: Program = parser.parse_program()
+
+                self._test_program_statements(parser, program, expected_statement_count)
+                self.assertEquals(str(program), expected_result)
+
+    def test_iterative_parser_errors(self) -> None:
+        sources: List[str] = [
+            '(1 + 2;',
+            '5 + ;',
+            '-(1) + + 2;',
+        ]
+
+        for source in sources:
+            recursive_parser: Parser = Parser(Lexer(source))
+            iterative_parser: Parser = Parser(Lexer(source), iterative=True)
+
+            self.assertEquals(str(iterative_parser.parse_program()),
+                              str(recursive_parser.parse_program()))
+            self.assertEquals(iterative_parser.errors, recursive_parser.errors)
+
+    def test_iterative_parser_deep_nesting(self) -> None:
+        depth: int = 10000
+        sources: List[str] = [
+            '(' * depth + '1' + ')' * depth,
+            '-' * depth + '1',
+            '1 + (' * depth + '1' + ')' * depth,
+            'f(' * depth + '1' + ')' * depth,
+        ]
 
+        for source in sources:
+            parser: Parser = Parser(Lexer(source), iterative=True)
             program: Program = parser.parse_program()
 
-            self._test_program_statements(parser, program, expected_statement_count)
-            self.assertEquals(str(program), expected_result)
+            self.assertEquals(len(parser.errors), 0)
+
+            expression = cast(ExpressionStatement, program.statements[0]).expression
+            while not isinstance(expression, Integer):
+                if isinstance(expression, Prefix) or isinstance(expression, Infix):
+                    expression = expression.right
+                else:
+                    assert isinstance(expression, Call) and expression.arguments is not None
+                    expression = expression.arguments[0]
+
+            self._test_integer(expression, 1)
+
+    def test_token_buffer_parsing(self) -> None:
+        source: str = '''
+            variable suma = procedimiento(x, y) { regresa x + y * -2; };
+            si (suma(1, 2) <= 3) { "menor" } sino { verdadero != falso };
+        '''
+        expected_program: Program = Parser(Lexer(source)).parse_program()
+
+        parser: Parser = Parser(Lexer(source).tokenize())
+        program: Program = parser.parse_program()
+
+        self.assertEquals(len(parser.errors), 0)
+        self.assertEquals(str(program), str(expected_program))
+
+    def test_identifiers_are_interned(self) -> None:
+        source: str = 'variable suma = procedimiento(suma) { suma; };'
+
+        sources: List[Union[Lexer, TokenBuffer]] = [Lexer(source), Lexer(source).tokenize()]
+        for tokens in sources:
+            program: Program = Parser(tokens).parse_program()
+
+            let_statement = cast(LetStatement, program.statements[0])
+            function = cast(Function, let_statement.value)
+            assert let_statement.name is not None
+            body = cast(ExpressionStatement, cast(Block, function.body).statements[0])
+            identifier = cast(Identifier, body.expression)
+
+            self.assertIs(let_statement.name.value, function.parameters[0].value)
+            self.assertIs(let_statement.name.value, identifier.value)
+
+    def test_lazy_function_bodies(self) -> None:
+        source: str = '''
+            variable a = procedimiento(x, y) { si (x) { regresa y; } sino { x * y } };
+            a(1, 2);
+            procedimiento() {
+'''
+        parser: Parser = Parser(Lexer(source), lazy=True)
+        program: Program = parser.parse_program()
+
+        # The unclosed body is parsed eagerly, like the rest of the program.
+        eager_program: Program = Parser(Lexer(source)).parse_program()
+        self.assertEquals(parser.errors, [])
+        self.assertEquals(len(program.statements), 3)
+
+        function = cast(Function, cast(LetStatement, program.statements[0]).value)
+        deferred = function.body
+        assert isinstance(deferred, DeferredBlock)
+        self.assertEquals(deferred.offset, source.index('{'))
+        self.assertEquals(str(deferred), 'si (x) { regresa y; } sino { x * y }')
+
+        block = parse_deferred_block(deferred)
+        self.assertIs(parse_deferred_block(deferred), block)
+        self.assertEquals(deferred.errors, [])
+        self.assertEquals(str(program), str(eager_program))
+        self.assertEquals(block.offset, deferred.offset)
+
+    def test_node_offsets(self) -> None:
+        source: str = 'variable x = -5;\nsuma(x, "hola");'
+
+        for parser in [Parser(Lexer(source)),
+                       Parser(Lexer(source).tokenize(), iterative=True),
+                       Parser(Lexer.from_stream(io.StringIO(source), chunk_size=3))]:
+            program: Program = parser.parse_program()
+
+            let_statement = cast(LetStatement, program.statements[0])
+            prefix = cast(Prefix, let_statement.value)
+            call = cast(Call, cast(ExpressionStatement, program.statements[1]).expression)
+            assert prefix.right is not None and call.arguments is not None
+
+            self.assertEquals(let_statement.offset, 0)
+            self.assertEquals(cast(Identifier, let_statement.name).offset, 9)
+            self.assertEquals(prefix.offset, 13)
+            self.assertEquals(prefix.right.offset, 14)
+            self.assertEquals(call.function.offset, 17)
+            self.assertEquals(call.offset, 21)
+            self.assertEquals([argument.offset for argument in call.arguments], [22, 26])
+
+    def test_nodes_have_no_instance_dict(self) -> None:
+        program: Program = Parser(Lexer('variable x = 5; x + 1;')).parse_program()
+
+        self.assertFalse(hasattr(program, '__dict__'))
+        for statement in program.statements:
+            self.assertFalse(hasattr(statement, '__dict__'))
 
     def test_parse_errors(self) -> None:
         source: str = 'variable x 5;'
@@ -325,6 +487,31 @@ class ParserTest(TestCase):
             self._test_literal_expression(return_statement.return_value,
                                           expected_return_value)
     
+    def test_while_statement(self) -> None:
+        source: str = 'mientras (x < y) { x = x + 1; } z;'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(parser.errors, [])
+        self.assertEquals(len(program.statements), 2)
+
+        while_statement = cast(While, program.statements[0])
+        self.assertIsInstance(while_statement, While)
+        self.assertEquals(while_statement.token_literal(), 'mientras')
+
+        assert while_statement.condition is not None
+        self._test_infix_expression(while_statement.condition, 'x', '<', 'y')
+
+        assert while_statement.body is not None
+        self.assertIsInstance(while_statement.body, Block)
+        self.assertEquals(len(while_statement.body.statements), 1)
+        self.assertIsInstance(while_statement.body.statements[0], AssignmentStatement)
+        self.assertEquals(str(while_statement), 'mientras (x < y) x = (x + 1);')
+
+        self.assertIsInstance(program.statements[1], ExpressionStatement)
+
     def _test_boolean(self,
                       expression: Expression,
                       expected_value: bool) -> None:
@@ -0,0 +1,48 @@
+from typing import List
+from unittest import TestCase
+
+from lpp.repl import ReplSession
+
+
+class ReplTest(TestCase):
+
+    def test_session_keeps_environment(self) -> None:
+        session = ReplSession()
+
+        self.assertEquals(session.feed('variable a = 5;'), [])
+        self.assertEquals(session.feed('variable b = a * 2;'), [])
+        self.assertEquals(session.feed('a + b;'), ['15'])
+        self.assertEquals(session.feed('"hola"'), ['hola'])
+
+    def test_statements_run_once(self) -> None:
+        session = ReplSession()
+        session.feed('variable a = 1;')
+        session.feed('variable a = a + 1;')
+
+        self.assertEquals(session.feed('a'), ['2'])
+        self.assertEquals(session.feed('a'), ['2'])
+
+    def test_parse_errors_do_not_break_the_session(self) -> None:
+        session = ReplSession()
+
+        self.assertEquals(session.feed('variable 5;'),
+                          ['Se esperaba TokenType.IDENT, pero se obtiene TokenType.INT'])
+        self.assertEquals(session.feed('variable a = 3; a'), ['3'])
+
+    def test_multi_line_input(self) -> None:
+        session = ReplSession()
+        lines: List[str] = [
+            'variable mayor = procedimiento(x, y) {',
+            '    si (x > y) {',
+            '        regresa x;',
+            '    } sino { regresa y; }',
+            '};',
+        ]
+
+        for line in lines:
+            self.assertEquals(session.feed(line), [])
+            self.assertEquals(session.continuing, line != lines[-1])
+
+        self.assertEquals(session.feed('mayor(3, 7)'), ['7'])
+        self.assertEquals(session.feed('"{" + "}"'), ['{}'])
+        self.assertFalse(session.continuing)
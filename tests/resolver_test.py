@@ -0,0 +1,172 @@
+from typing import (
+    cast,
+    List,
+    Tuple
+)
+from unittest import TestCase
+
+import tests.evaluator_test as evaluator_test
+from lpp.ast import (
+    ExpressionStatement,
+    Function,
+    Identifier,
+    Infix,
+    LetStatement,
+    Program
+)
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Integer,
+    Object,
+    UNSET
+)
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+class ResolverTest(TestCase):
+
+    def test_scopes(self) -> None:
+        program = self._resolve('''
+            variable a = 1;
+            procedimiento(x, y) {
+                variable z = x;
+                procedimiento(w) { w + z + a }
+            };
+        ''')
+
+        outer = cast(Function, cast(ExpressionStatement, program.statements[1]).expression)
+        self.assertEquals(outer.scope, {'x': 0, 'y': 1, 'z': 2})
+
+        body = outer.body.statements  # type: ignore
+        declaration = cast(LetStatement, body[0])
+        self._test_address(cast(Identifier, declaration.name), 0, 2)
+        self._test_address(cast(Identifier, declaration.value), 0, 0)
+
+        inner = cast(Function, cast(ExpressionStatement, body[1]).expression)
+        self.assertEquals(inner.scope, {'w': 0})
+
+        infix = cast(Infix, cast(ExpressionStatement, inner.body.statements[0]).expression)  # type: ignore
+        left = cast(Infix, infix.left)
+        self._test_address(cast(Identifier, left.left), 0, 0)
+        self._test_address(cast(Identifier, left.right), 1, 2)
+        self._test_address(cast(Identifier, infix.right), 2, -1)
+
+    def test_variables_in_branches_get_slots(self) -> None:
+        program = self._resolve('''
+            procedimiento(x) {
+                si (x) { variable y = 1; } sino { variable z = si (x) { variable w = 2; } };
+                variable x = 3;
+                procedimiento() { variable v = 4; }
+            };
+        ''')
+
+        function = cast(Function, cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertEquals(function.scope, {'x': 0, 'y': 1, 'z': 2, 'w': 3})
+
+    def test_deferred_bodies_are_not_resolved(self) -> None:
+        parser: Parser = Parser(Lexer('procedimiento(x) { x };'), lazy=True)
+        program = resolve(parser.parse_program())
+
+        function = cast(Function, cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsNone(function.scope)
+
+    def test_repeated_parameters_are_not_resolved(self) -> None:
+        program = self._resolve('procedimiento(x, x) { procedimiento(y) { x + y } };')
+
+        function = cast(Function, cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsNone(function.scope)
+
+        inner = cast(Function, cast(ExpressionStatement, function.body.statements[0]).expression)  # type: ignore
+        self.assertEquals(inner.scope, {'y': 0})
+
+        infix = cast(Infix, cast(ExpressionStatement, inner.body.statements[0]).expression)  # type: ignore
+        self._test_address(cast(Identifier, infix.left), -1, -1)
+        self._test_address(cast(Identifier, infix.right), 0, 0)
+
+    def test_frames(self) -> None:
+        env: Environment = Environment()
+        evaluate(self._resolve('''
+            variable f = procedimiento(x) {
+                variable y = x * 2;
+                procedimiento() { y }
+            };
+            variable g = f(3);
+        '''), env)
+
+        frame = cast(Environment, env['g'].env)  # type: ignore
+        self.assertEquals(frame.scope, {'x': 0, 'y': 1})
+        self.assertEquals([value.inspect() for value in frame.slots], ['3', '6'])
+        self.assertEquals(frame['y'].inspect(), '6')
+        self.assertIs(frame.outer, env)
+
+    def test_names_used_before_their_declaration(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                variable x = 1;
+                variable f = procedimiento() { variable y = x; variable x = 2; y + x };
+                f();
+            ''', 3),
+            ('''
+                variable x = 1;
+                variable f = procedimiento(c) {
+                    si (c) { variable x = 10; }
+                    procedimiento() { x }
+                };
+                f(falso)() + f(verdadero)();
+            ''', 11),
+        ]
+
+        for source, expected in tests:
+            evaluated = evaluate(self._resolve(source), Environment())
+            self.assertEquals(evaluated.inspect(), str(expected))  # type: ignore
+
+    def test_mapping_interface(self) -> None:
+        outer: Environment = Environment()
+        outer['a'] = Integer(1)
+        frame: Environment = Environment(outer=outer, scope={'x': 0, 'y': 1})
+        frame['x'] = Integer(2)
+        frame['z'] = Integer(3)
+
+        self.assertEquals(frame.slots, [frame['x'], UNSET])
+        self.assertEquals(list(frame), ['x', 'z'])
+        self.assertEquals(len(frame), 2)
+        self.assertEquals(frame['a'].inspect(), '1')  # type: ignore
+        self.assertIn('a', frame)
+        self.assertNotIn('y', frame)
+        self.assertIsNone(frame.get('y'))
+
+        del frame['x']
+        del frame['z']
+        self.assertEquals(list(frame), [])
+        with self.assertRaises(KeyError):
+            del frame['a']
+
+    def test_unset_slots_are_missing(self) -> None:
+        frame: Environment = Environment(scope={'x': 0})
+
+        self.assertIs(frame.slots[0], UNSET)
+        with self.assertRaises(KeyError):
+            frame['x']
+
+    def _resolve(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        self.assertEquals(parser.errors, [])
+
+        return resolve(program)
+
+    def _test_address(self, identifier: Identifier, depth: int, slot: int) -> None:
+        self.assertEquals((identifier.depth, identifier.slot), (depth, slot))
+
+
+class ResolvedEvaluatorTest(evaluator_test.EvaluatorTest):
+    """Runs the evaluator tests on resolved programs."""
+
+    def _evaluate_program(self, program: Program) -> Object:
+        evaluated = evaluate(resolve(program), Environment())
+
+        assert evaluated is not None
+        return evaluated
@@ -0,0 +1,94 @@
+from typing import cast
+
+import tests.evaluator_test as evaluator_test
+from lpp.ast import Program
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Error,
+    Object
+)
+from lpp.parser import Parser
+from lpp.stackless import evaluate
+
+
+class StacklessTest(evaluator_test.EvaluatorTest):
+    """Runs the evaluator tests on the stackless evaluator."""
+
+    def test_deep_recursion(self) -> None:
+        source: str = '''
+            variable cuenta = procedimiento(n) {
+                si (n == 0) { regresa 0; }
+                regresa 1 + cuenta(n - 1);
+            };
+            cuenta(20000);
+        '''
+        evaluated = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 20000)
+
+    def test_deep_nested_recursion(self) -> None:
+        source: str = '''
+            variable ackermann = procedimiento(m, n) {
+                si (m == 0) { regresa n + 1; }
+                si (n == 0) { regresa ackermann(m - 1, 1); }
+                ackermann(m - 1, ackermann(m, n - 1))
+            };
+            ackermann(1, 5000);
+        '''
+        evaluated = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 5002)
+
+    def test_max_depth(self) -> None:
+        source: str = '''
+            variable cuenta = procedimiento(n) {
+                si (n == 0) { regresa 0; }
+                regresa 1 + cuenta(n - 1);
+            };
+            cuenta(100);
+        '''
+        program: Program = Parser(Lexer(source)).parse_program()
+
+        evaluated = evaluate(program, Environment(), max_depth=101)
+        assert evaluated is not None
+        self._test_integer_object(evaluated, 100)
+
+        evaluated = evaluate(program, Environment(), max_depth=100)
+        self.assertIsInstance(evaluated, Error)
+        self.assertEquals(cast(Error, evaluated).message,
+                          'Profundidad máxima de llamadas excedida: 100')
+
+    def test_tail_calls_reuse_frames(self) -> None:
+        source: str = '''
+            variable par = procedimiento(n) {
+                si (n == 0) { regresa verdadero; }
+                regresa impar(n - 1);
+            };
+            variable impar = procedimiento(n) {
+                si (n == 0) { regresa falso; }
+                par(n - 1)
+            };
+            par(1001);
+        '''
+        program: Program = Parser(Lexer(source)).parse_program()
+
+        evaluated = evaluate(program, Environment(), max_depth=10)
+        assert evaluated is not None
+        self._test_boolean_object(evaluated, False)
+
+    def test_tail_call_unwraps_like_a_call(self) -> None:
+        source: str = '''
+            variable identidad = procedimiento(x) { regresa x; };
+            variable f = procedimiento() { identidad(si (verdadero) { regresa 3; }) };
+            f() + 1;
+        '''
+        evaluated = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 4)
+
+    def _evaluate_program(self, program: Program) -> Object:
+        evaluated = evaluate(program, Environment())
+
+        assert evaluated is not None
+        return evaluated
@@ -0,0 +1,160 @@
+import gc
+from typing import (
+    cast,
+    List
+)
+from unittest import TestCase
+
+import lpp.tiering as tiering
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Error,
+    Function,
+    Integer,
+    Object,
+    String
+)
+from lpp.parser import Parser
+
+
+class TieringTest(TestCase):
+
+    def setUp(self) -> None:
+        self._threshold = tiering.THRESHOLD
+        tiering.THRESHOLD = 3
+
+    def tearDown(self) -> None:
+        tiering.THRESHOLD = self._threshold
+
+    def test_hot_function_is_promoted(self) -> None:
+        env = self._run('''
+            variable fibonacci = procedimiento(n) {
+                si (n < 2) { regresa n; }
+                regresa fibonacci(n - 1) + fibonacci(n - 2);
+            };
+            variable resultado = fibonacci(15);
+        ''')
+
+        self.assertEquals(cast(Integer, env['resultado']).value, 610)
+
+        fn = cast(Function, env['fibonacci'])
+        tier = fn.tier
+        self.assertIsNotNone(tier.run)
+        self.assertIn('def tiered(args, env):', tier.source)
+        self.assertEquals(tier.guards, ('n: INTEGER',))
+        self.assertEquals(tier.optimized_calls, fn.calls - tiering.THRESHOLD)
+        self.assertEquals(tier.deoptimizations, 0)
+
+    def test_cold_function_is_not_promoted(self) -> None:
+        env = self._run('''
+            variable doble = procedimiento(x) { x * 2 };
+            doble(1);
+            doble(2);
+        ''')
+
+        self.assertIsNone(cast(Function, env['doble']).tier)
+
+    def test_guards_fall_back_to_the_evaluator(self) -> None:
+        env = self._run('''
+            variable suma = procedimiento(a, b) { a + b };
+            suma(1, 2);
+            suma(3, 4);
+            suma(5, 6);
+            variable entero = suma(7, 8);
+            variable cadena = suma("a", "b");
+        ''')
+
+        self.assertEquals(cast(Integer, env['entero']).value, 15)
+        self.assertEquals(cast(String, env['cadena']).value, 'ab')
+
+        tier = cast(Function, env['suma']).tier
+        self.assertEquals(tier.optimized_calls, 1)
+        self.assertEquals(tier.deoptimizations, 1)
+
+    def test_promoted_code_keeps_errors(self) -> None:
+        env = self._run('''
+            variable f = procedimiento(x) { x + verdadero; 5 };
+            variable a = f(1);
+            variable b = f(2);
+            variable c = f(3);
+            variable resultado = f(4);
+        ''')
+
+        self.assertIsNotNone(cast(Function, env['f']).tier.run)
+        self.assertIsInstance(env['resultado'], Error)
+        self.assertEquals(cast(Error, env['resultado']).message,
+                          'Discrepancia de tipos: INTEGER + BOOLEAN')
+
+    def test_loops_are_promoted(self) -> None:
+        env = self._run('''
+            variable total = 0;
+            variable suma = procedimiento(n) {
+                variable resultado = 0;
+                mientras (n > 0) {
+                    resultado = resultado + n;
+                    n = n - 1;
+                }
+                total = total + resultado;
+                resultado
+            };
+            suma(1);
+            suma(2);
+            suma(3);
+            variable resultado = suma(100);
+        ''')
+
+        self.assertEquals(cast(Integer, env['resultado']).value, 5050)
+        self.assertEquals(cast(Integer, env['total']).value, 5060)
+
+        tier = cast(Function, env['suma']).tier
+        self.assertIsNotNone(tier.run)
+        self.assertIn('while ', tier.source)
+        self.assertEquals(tier.optimized_calls, 1)
+
+    def test_unsupported_function(self) -> None:
+        env = self._run('''
+            variable f = procedimiento(x) { procedimiento(y) { x + y } };
+            f(1);
+            f(2);
+            f(3);
+        ''')
+
+        tier = cast(Function, env['f']).tier
+        self.assertIsNone(tier.run)
+        self.assertEquals(tier.reason, 'Function')
+
+    def test_statistics(self) -> None:
+        # Drops the procedimientos of other tests, which live in cycles.
+        gc.collect()
+        env = self._run('''
+            variable resta = procedimiento(a, b) { a - b };
+            resta(1, 2);
+            resta(3, 4);
+            resta(5, 6);
+            resta(7, 8);
+        ''')
+
+        statistics: List[tiering.TierStatistics] = [
+            entry for entry in tiering.statistics()
+            if entry.procedimiento.startswith('procedimiento(a, b)')
+        ]
+
+        self.assertEquals(len(statistics), 1)
+        self.assertEquals(statistics[0].calls, 4)
+        self.assertTrue(statistics[0].promoted)
+        self.assertEquals(statistics[0].guards, ('a: INTEGER', 'b: INTEGER'))
+        self.assertEquals(statistics[0].optimized_calls, 1)
+        self.assertEquals(statistics[0].reason, '')
+        self.assertIsNotNone(env['resta'])
+
+    def _run(self, source: str) -> Environment:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        self.assertEquals(parser.errors, [])
+
+        env = Environment()
+        evaluate(program, env)
+
+        return env
@@ -0,0 +1,87 @@
+from typing import cast
+
+import tests.evaluator_test as evaluator_test
+from lpp.ast import Program
+from lpp.builtins import BUILTINS
+from lpp.lexer import Lexer
+from lpp.object import (
+    Boolean,
+    Builtin,
+    Environment,
+    Integer,
+    new_integer,
+    Object,
+    Return,
+    String
+)
+from lpp.parser import Parser
+from lpp.resolver import resolve
+from lpp.unboxed import (
+    box,
+    evaluate,
+    unbox
+)
+
+
+class UnboxedTest(evaluator_test.EvaluatorTest):
+    """Runs the evaluator tests on the evaluator of unboxed values."""
+
+    def test_variables_hold_python_values(self) -> None:
+        env = Environment()
+        program = Parser(Lexer('''
+            variable n = 2 * 3;
+            variable s = "a" + "b";
+            variable b = n > 5;
+        ''')).parse_program()
+        evaluate(program, env)
+
+        self.assertEquals([(type(env[name]), env[name]) for name in 'nsb'],
+                          [(int, 6), (str, 'ab'), (bool, True)])
+
+    def test_box_and_unbox(self) -> None:
+        for value in [0, -7, 5000, '', 'lpp', True, False]:
+            boxed = box(value)
+            self.assertIs(type(unbox(boxed)), type(value))
+            self.assertEquals(unbox(boxed), value)
+
+        self.assertIs(type(box(1)), Integer)
+        self.assertIs(type(box('1')), String)
+        self.assertIs(type(box(True)), Boolean)
+        boxed = box(Return(Return(new_integer(3))))
+        assert boxed is not None
+        self.assertEquals(boxed.inspect(), '3')
+        self.assertIsNone(box(None))
+
+    def test_builtins_get_objects(self) -> None:
+        def siguiente(*args: Object) -> Object:
+            self.assertIs(type(args[0]), Integer)
+            return new_integer(cast(Integer, args[0]).value + 1)
+
+        BUILTINS['siguiente'] = Builtin(fn=siguiente)
+        try:
+            evaluated = self._evaluate_tests('siguiente(longitud("abc")) * 2;')
+        finally:
+            del BUILTINS['siguiente']
+
+        self._test_integer_object(evaluated, 8)
+
+    def test_tail_recursion_runs_in_constant_stack(self) -> None:
+        source: str = '''
+            variable cuenta = procedimiento(n, total) {
+                si (n == 0) { regresa total; }
+                cuenta(n - 1, total + 2)
+            };
+            cuenta(20000, 0);
+        '''
+
+        for program in [self._parse(source), resolve(self._parse(source))]:
+            self._test_integer_object(self._evaluate_program(program), 40000)
+
+    def _parse(self, source: str) -> Program:
+        return Parser(Lexer(source)).parse_program()
+
+    def _evaluate_program(self, program: Program) -> Object:
+        evaluated = evaluate(program, Environment())
+
+        assert evaluated is not None
+        return evaluated
@@ -0,0 +1,54 @@
+from typing import cast
+
+import tests.evaluator_test as evaluator_test
+from lpp.ast import Program
+from lpp.compiler import compile_program
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Object
+)
+from lpp.parser import Parser
+from lpp.vm import (
+    BytecodeFunction,
+    execute
+)
+
+
+class VMTest(evaluator_test.EvaluatorTest):
+    """Runs the evaluator tests on the bytecode virtual machine."""
+
+    def test_deep_recursion(self) -> None:
+        source: str = '''
+            variable cuenta = procedimiento(n) {
+                si (n == 0) { regresa 0; }
+                regresa 1 + cuenta(n - 1);
+            };
+            cuenta(5000);
+        '''
+        evaluated = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 5000)
+
+    def test_call_depth_limit(self) -> None:
+        source: str = 'variable f = procedimiento(n) { 1 + f(n + 1) }; f(0);'
+        evaluated = self._evaluate_tests(source)
+
+        self._test_error_object(evaluated, 'Profundidad máxima de llamadas excedida: 100000')
+
+    def test_functions_share_code(self) -> None:
+        env: Environment = Environment()
+        bytecode = compile_program(Parser(Lexer('procedimiento(x) { x * 2 }')).parse_program())
+
+        first = cast(BytecodeFunction, execute(bytecode, env))
+        second = cast(BytecodeFunction, execute(bytecode, env))
+
+        self.assertIsNot(first, second)
+        self.assertIs(first.code, second.code)
+        self.assertEquals(str(first.body), '(x * 2)')
+
+    def _evaluate_program(self, program: Program) -> Object:
+        evaluated = execute(compile_program(program), Environment())
+
+        assert evaluated is not None
+        return evaluated